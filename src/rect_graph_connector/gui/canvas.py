@@ -2,19 +2,28 @@
 This module contains the Canvas widget for graph visualization.
 """
 
-from PyQt5.QtCore import QMimeData, QPointF, QRect, QRectF, Qt, pyqtSignal
-from PyQt5.QtGui import QColor, QCursor, QPainter, QPen
+from itertools import chain
+
+from PyQt5.QtCore import QMimeData, QPointF, QRect, QRectF, Qt, QTimer, pyqtSignal
+from PyQt5.QtGui import QColor, QCursor, QPainter, QPen, QSurfaceFormat
 from PyQt5.QtWidgets import (
     QAction,
     QApplication,
     QInputDialog,
     QMainWindow,
     QMenu,
+    QOpenGLWidget,
     QWidget,
 )
 
 from ..config import config
-from ..models.connectivity import delete_edge_at_position, find_intersecting_edges
+from ..models.connectivity import (
+    build_edge_index,
+    delete_edge_at_position,
+    find_intersecting_edges,
+    get_edge_segments,
+    point_to_line_distance_sq,
+)
 from ..models.graph import Graph
 from ..models.rect_node import RectNode
 from ..utils.file_handler import FileHandler
@@ -24,8 +33,12 @@ from .context_menus.normal_menu import NormalContextMenu
 from .import_dialog import ImportModeDialog
 from .rendering import CompositeRenderer
 
+# When enabled, the canvas is an OpenGL widget so QPainter dispatches through
+# Qt's OpenGL paint engine instead of the raster engine
+USE_OPENGL = config.get_constant("rendering.opengl.enabled", False)
 
-class Canvas(QWidget):
+
+class Canvas(QOpenGLWidget if USE_OPENGL else QWidget):
     """
     A custom widget for visualizing and interacting with the graph.
 
@@ -96,6 +109,9 @@ class Canvas(QWidget):
         self.pan_start = None
         self.pan_offset_start = QPointF(0, 0)
 
+        # Area being repainted during a paint event, or None for the whole canvas
+        self.paint_rect = None
+
         # Interaction state
         self.dragging = False
         self.drag_start = None
@@ -126,6 +142,18 @@ class Canvas(QWidget):
         self.knife_path = []  # List of points forming the knife path
         self.highlighted_edges = []  # List of edges intersecting with knife path
         self.is_cutting = False  # Flag to indicate active cutting operation
+        # Edge segments of the target groups and their spatial index,
+        # computed once per cut
+        self.knife_edge_segments = None
+        self.knife_edge_index = None
+        # Coalesces the intersection tests of rapid knife moves into one update
+        # per interval instead of one per mouse move event
+        self._knife_highlight_timer = QTimer(self)
+        self._knife_highlight_timer.setSingleShot(True)
+        self._knife_highlight_timer.setInterval(
+            config.get_constant("knife.highlight_interval", 16)
+        )
+        self._knife_highlight_timer.timeout.connect(self._update_knife_highlight)
 
         # All-For-One connection mode state
         self.all_for_one_selected_nodes = (
@@ -156,8 +184,9 @@ class Canvas(QWidget):
         self.edit_context_menu = EditContextMenu(self)
         self.normal_context_menu = NormalContextMenu(self)
 
-        # Enable mouse tracking for hover effects
-        self.setMouseTracking(True)
+        # Mouse tracking stays off: every move handler needs a pressed button
+        # (dragging, panning, selecting, cutting, or edge previews), so
+        # button-less hover moves would only run mouseMoveEvent for nothing
 
         # Enable drag and drop
         self.setAcceptDrops(True)
@@ -168,6 +197,14 @@ class Canvas(QWidget):
         # Enable keyboard focus
         self.setFocusPolicy(Qt.StrongFocus)
 
+        if USE_OPENGL:
+            # Multisampling replaces the raster engine's antialiasing
+            surface_format = QSurfaceFormat()
+            surface_format.setSamples(
+                config.get_constant("rendering.opengl.samples", 4)
+            )
+            self.setFormat(surface_format)
+
         # Initialize flags for deselection methods
         # Get default values from config or use default (all enabled)
         self.enabled_deselect_methods = {
@@ -269,6 +306,9 @@ class Canvas(QWidget):
             self.knife_path = []
             self.highlighted_edges = []
             self.is_cutting = False
+            self.knife_edge_segments = None
+            self.knife_edge_index = None
+            self._knife_highlight_timer.stop()
 
         # Reset All-For-One connection mode state when exiting All-For-One connection mode
         if (
@@ -310,6 +350,27 @@ class Canvas(QWidget):
         Args:
             event: Paint event
         """
+        if USE_OPENGL:
+            # QOpenGLWidget binds its framebuffer and then calls paintGL()
+            super().paintEvent(event)
+        else:
+            # Let renderers skip work outside the area being repainted
+            self.paint_rect = event.rect()
+            try:
+                self._paint_graph()
+            finally:
+                self.paint_rect = None
+
+    def paintGL(self):
+        """
+        Render the graph into the OpenGL framebuffer when OpenGL is enabled.
+        """
+        self._paint_graph()
+
+    def _paint_graph(self):
+        """
+        Render the graph onto the canvas with a new painter.
+        """
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
 
@@ -385,52 +446,41 @@ class Canvas(QWidget):
         # Convert tolerance to graph coordinates
         scaled_tolerance = tolerance / self.zoom
 
-        for edge in self.graph.edges:
-            try:
-                # Get the actual node objects
-                source_node = next(n for n in self.graph.nodes if n.id == edge[0])
-                target_node = next(n for n in self.graph.nodes if n.id == edge[1])
-
-                # Calculate actual edge endpoints considering node sizes
-                start_pos, end_pos = (
-                    self.renderer.edge_renderer.calculate_edge_endpoints(
-                        source_node, target_node
-                    )
-                )
-
-                # Calculate distance from point to line segment
-                line_vec = end_pos - start_pos
-                point_vec = QPointF(point) - start_pos
-                line_length = (line_vec.x() ** 2 + line_vec.y() ** 2) ** 0.5
-
-                if line_length == 0:
-                    continue
+        px = point.x()
+        py = point.y()
+        tolerance_sq = scaled_tolerance * scaled_tolerance
 
-                # Calculate projection
-                t = max(
-                    0,
-                    min(
-                        1,
-                        (point_vec.x() * line_vec.x() + point_vec.y() * line_vec.y())
-                        / (line_length**2),
-                    ),
-                )
-                projection = start_pos + t * line_vec
-
-                # Calculate distance from point to projection
-                distance = (
-                    (point.x() - projection.x()) ** 2
-                    + (point.y() - projection.y()) ** 2
-                ) ** 0.5
-
-                # Check if the point is within tolerance and the projection is on the visible part of the edge
-                if distance <= scaled_tolerance:
-                    return (source_node, target_node)
-
-            except StopIteration:
+        # The graph caches the visible segments of all edges, so clicks only
+        # measure distances instead of recomputing every edge's endpoints
+        for (source_id, target_id), segment in self.graph.edge_segments:
+            start_x, start_y, end_x, end_y = segment
+            if start_x == end_x and start_y == end_y:
                 continue
+
+            # Check if the point is within tolerance of the visible part of the edge
+            if point_to_line_distance_sq(px, py, *segment) <= tolerance_sq:
+                nodes_by_id = self.graph.nodes_by_id
+                return (nodes_by_id[source_id], nodes_by_id[target_id])
         return None
 
+    def _get_edit_target_node_ids(self) -> set:
+        """
+        Get the IDs of nodes whose group is one of the edit target groups.
+
+        Like get_group_for_node(), a node belongs to the first group in the
+        group list that contains it. Building the set once lets edge loops test
+        membership by ID instead of searching groups for every endpoint.
+
+        Returns:
+            set: IDs of the nodes in the edit target groups
+        """
+        target_groups = set(self.edit_target_groups)
+        return {
+            node_id
+            for node_id, group in self.graph.groups_by_node_id.items()
+            if group in target_groups
+        }
+
     def find_group_at_position(self, point):
         """
         Find a node group that contains the given point in graph coordinates.
@@ -444,33 +494,25 @@ class Canvas(QWidget):
         """
         # Get groups sorted by z-index (highest to lowest)
         # This ensures we select the visually frontmost group when groups overlap
-        sorted_groups = sorted(
-            self.graph.node_groups, key=lambda g: g.z_index, reverse=True
-        )
+        sorted_groups = reversed(self.graph.groups_by_z)
 
         # First detect all overlapping groups
         overlapping_groups = []
+        group_bounds = self.graph.group_bounds
 
         for group in sorted_groups:
-            group_nodes = group.get_nodes(self.graph.nodes)
-            if not group_nodes:
+            bounds = group_bounds.get(group.id)
+            if bounds is None:
                 continue
 
             # Calculate group boundary with margin
             border_margin = config.get_dimension("group.border_margin", 5)
             effective_margin = border_margin / self.zoom
-            min_x = (
-                min(node.x - node.size / 2 for node in group_nodes) - effective_margin
-            )
-            min_y = (
-                min(node.y - node.size / 2 for node in group_nodes) - effective_margin
-            )
-            max_x = (
-                max(node.x + node.size / 2 for node in group_nodes) + effective_margin
-            )
-            max_y = (
-                max(node.y + node.size / 2 for node in group_nodes) + effective_margin
-            )
+            min_x, min_y, max_x, max_y = bounds
+            min_x -= effective_margin
+            min_y -= effective_margin
+            max_x += effective_margin
+            max_y += effective_margin
 
             # Record the group containing points
             if min_x <= point.x() <= max_x and min_y <= point.y() <= max_y:
@@ -607,25 +649,17 @@ class Canvas(QWidget):
                 else:
                     # Default behavior in other edit submodes: Select all edges
                     self.selected_edges = []
+                    nodes_by_id = self.graph.nodes_by_id
+                    target_node_ids = self._get_edit_target_node_ids()
                     for edge in self.graph.edges:
                         try:
                             # Get actual node objects
-                            source_node = next(
-                                n for n in self.graph.nodes if n.id == edge[0]
-                            )
-                            target_node = next(
-                                n for n in self.graph.nodes if n.id == edge[1]
-                            )
-
-                            source_group = self.graph.get_group_for_node(source_node)
-                            target_group = self.graph.get_group_for_node(target_node)
+                            source_node = nodes_by_id[edge[0]]
+                            target_node = nodes_by_id[edge[1]]
 
-                            if (
-                                source_group in self.edit_target_groups
-                                or target_group in self.edit_target_groups
-                            ):
+                            if edge[0] in target_node_ids or edge[1] in target_node_ids:
                                 self.selected_edges.append((source_node, target_node))
-                        except StopIteration:
+                        except KeyError:
                             continue
                     self.update()
         elif event.key() == Qt.Key_C and event.modifiers() & Qt.ControlModifier:
@@ -671,14 +705,10 @@ class Canvas(QWidget):
             elif self.current_mode == self.EDIT_MODE:
                 # Delete key in edit mode: Delete selected edges
                 if self.selected_edges:
-                    for source_node, target_node in self.selected_edges:
-                        edge_to_remove = None
-                        for edge in self.graph.edges:
-                            if edge[0] == source_node.id and edge[1] == target_node.id:
-                                edge_to_remove = edge
-                                break
-                        if edge_to_remove:
-                            self.graph.edges.remove(edge_to_remove)
+                    self.graph.remove_edges(
+                        (source_node.id, target_node.id)
+                        for source_node, target_node in self.selected_edges
+                    )
                     self.selected_edges = []
                     self.update()
 
@@ -822,12 +852,12 @@ class Canvas(QWidget):
                     shift_pressed = event.modifiers() & Qt.ShiftModifier
 
                     if edge:
-                        # Check if at least one endpoint of the edge belongs to target groups
-                        source_group = self.graph.get_group_for_node(edge[0])
-                        target_group = self.graph.get_group_for_node(edge[1])
+                        # Check if at least one endpoint of the edge belongs to
+                        # target groups, resolving both with one walk over the groups
+                        target_node_ids = self._get_edit_target_node_ids()
                         if (
-                            source_group in self.edit_target_groups
-                            or target_group in self.edit_target_groups
+                            edge[0].id in target_node_ids
+                            or edge[1].id in target_node_ids
                         ):
                             # Handle edge selection with proper toggling
                             if edge in self.selected_edges and not shift_pressed:
@@ -854,7 +884,7 @@ class Canvas(QWidget):
                         # First check edit_target_groups for multi-selection
                         if self.edit_target_groups and node_group:
                             for group in self.edit_target_groups:
-                                if node in group.get_nodes(self.graph.nodes):
+                                if node.id in group.node_ids:
                                     node_belongs_to_target = True
                                     break
 
@@ -900,7 +930,7 @@ class Canvas(QWidget):
 
                         if self.edit_target_groups and node_group:
                             for group in self.edit_target_groups:
-                                if node in group.get_nodes(self.graph.nodes):
+                                if node.id in group.node_ids:
                                     node_belongs_to_target = True
                                     break
 
@@ -935,6 +965,13 @@ class Canvas(QWidget):
                     self.is_cutting = True
                     self.knife_path = [(graph_point.x(), graph_point.y())]
                     self.highlighted_edges = []
+                    # Nodes, edges and target groups cannot change while the
+                    # knife is dragged, so the edge segments are reused for
+                    # every mouse move of this cut
+                    self.knife_edge_segments = get_edge_segments(
+                        self.graph, self.edit_target_groups
+                    )
+                    self.knife_edge_index = build_edge_index(self.knife_edge_segments)
                     self.update()
 
             elif event.button() == Qt.RightButton:
@@ -951,7 +988,7 @@ class Canvas(QWidget):
 
                         if self.edit_target_groups and node_group:
                             for group in self.edit_target_groups:
-                                if node in group.get_nodes(self.graph.nodes):
+                                if node.id in group.node_ids:
                                     node_belongs_to_target = True
                                     break
 
@@ -1036,14 +1073,15 @@ class Canvas(QWidget):
                     total_dx = graph_point.x() - self.drag_start.x()
                     total_dy = graph_point.y() - self.drag_start.y()
 
-                    # Find center point of selected nodes
-                    if self.graph.selected_nodes:
-                        center_x = sum(
-                            node.x for node in self.graph.selected_nodes
-                        ) / len(self.graph.selected_nodes)
-                        center_y = sum(
-                            node.y for node in self.graph.selected_nodes
-                        ) / len(self.graph.selected_nodes)
+                    # Find center point of selected nodes in a single pass
+                    selected_nodes = self.graph.selected_nodes
+                    if selected_nodes:
+                        sum_x = sum_y = 0.0
+                        for node in selected_nodes:
+                            sum_x += node.x
+                            sum_y += node.y
+                        center_x = sum_x / len(selected_nodes)
+                        center_y = sum_y / len(selected_nodes)
 
                         # Calculate target center position
                         target_center_x = center_x + total_dx
@@ -1059,9 +1097,8 @@ class Canvas(QWidget):
                         adjusted_dy = snapped_center_y - center_y
 
                         # Move all nodes by the adjusted displacement
-                        for node in self.graph.selected_nodes:
-                            node.x += adjusted_dx
-                            node.y += adjusted_dy
+                        for node in selected_nodes:
+                            node.move(adjusted_dx, adjusted_dy)
 
                     # Update drag start for next movement calculation
                     self.drag_start = QPointF(
@@ -1082,10 +1119,10 @@ class Canvas(QWidget):
                 # Add point to knife path
                 self.knife_path.append((graph_point.x(), graph_point.y()))
 
-                # Find intersecting edges that belong to the target groups
-                self.highlighted_edges = find_intersecting_edges(
-                    self.graph, self.knife_path, self.edit_target_groups
-                )
+                # Intersecting edges are looked up when the timer fires, so a
+                # burst of moves only tests the path once
+                if not self._knife_highlight_timer.isActive():
+                    self._knife_highlight_timer.start()
                 self.update()
             else:
                 # Other edit modes - ignore drag operations
@@ -1101,25 +1138,32 @@ class Canvas(QWidget):
                 and self.current_edge_start in self.parallel_selected_nodes
             ):
                 # Calculate direction and distance for the drag
-                start_pos = QPointF(
-                    self.current_edge_start.x, self.current_edge_start.y
-                )
-                delta_vector = graph_point - start_pos
-
-                # Update endpoints for all selected nodes
-                self.parallel_edge_endpoints = []
-                for node in self.parallel_selected_nodes:
-                    if node:
-                        node_pos = QPointF(node.x, node.y)
-                        # Calculate the end point by adding the same delta vector
-                        end_point = (
-                            node_pos.x() + delta_vector.x(),
-                            node_pos.y() + delta_vector.y(),
-                        )
-                        self.parallel_edge_endpoints.append(end_point)
+                delta_x = graph_point.x() - self.current_edge_start.x
+                delta_y = graph_point.y() - self.current_edge_start.y
+
+                # Update endpoints for all selected nodes by adding the same
+                # delta vector to each of them
+                self.parallel_edge_endpoints = [
+                    (node.x + delta_x, node.y + delta_y)
+                    for node in self.parallel_selected_nodes
+                    if node
+                ]
 
             self.update()
 
+    def _update_knife_highlight(self):
+        """Highlight the edges of the target groups that the knife path crosses."""
+        if not self.is_cutting:
+            return
+        self.highlighted_edges = find_intersecting_edges(
+            self.graph,
+            self.knife_path,
+            self.edit_target_groups,
+            edge_segments=self.knife_edge_segments,
+            edge_index=self.knife_edge_index,
+        )
+        self.update()
+
     def mouseReleaseEvent(self, event):
         """
         Handle mouse release events to complete dragging or edge creation.
@@ -1195,17 +1239,23 @@ class Canvas(QWidget):
                 event.button() == Qt.LeftButton
                 and self.edit_submode == self.EDIT_SUBMODE_KNIFE
             ):
+                # Apply a pending highlight update so the cut covers the
+                # whole path
+                if self._knife_highlight_timer.isActive():
+                    self._knife_highlight_timer.stop()
+                    self._update_knife_highlight()
+
                 # Complete cutting operation
                 if self.is_cutting and self.highlighted_edges:
                     # Remove all highlighted edges
-                    for edge in self.highlighted_edges:
-                        if edge in self.graph.edges:
-                            self.graph.edges.remove(edge)
+                    self.graph.remove_edges(self.highlighted_edges)
 
                 # Reset knife mode state
                 self.is_cutting = False
                 self.knife_path = []
                 self.highlighted_edges = []
+                self.knife_edge_segments = None
+                self.knife_edge_index = None
                 self.update()
 
             # Handle rectangle selection in edit mode (left button)
@@ -1289,10 +1339,6 @@ class Canvas(QWidget):
         """
         target_node = self.graph.find_node_at_position(point)
         if target_node and target_node != self.current_edge_start:
-            # Get groups for both nodes
-            source_group = self.graph.get_group_for_node(self.current_edge_start)
-            target_group = self.graph.get_group_for_node(target_node)
-
             # Edit mode specific processing
             if self.current_mode == self.EDIT_MODE:
                 # Check if the source node belongs to any of the target groups
@@ -1300,7 +1346,7 @@ class Canvas(QWidget):
 
                 # Check if the source node belongs to any of the edit target groups
                 for group in self.edit_target_groups:
-                    if self.current_edge_start in group.get_nodes(self.graph.nodes):
+                    if self.current_edge_start.id in group.node_ids:
                         source_belongs = True
                         break
 
@@ -1310,6 +1356,9 @@ class Canvas(QWidget):
             elif self.current_mode == self.NORMAL_MODE:
                 # Normal mode - allow connections between any nodes
                 self.graph.add_edge(self.current_edge_start, target_node)
+                # Get groups for both nodes, which only normal mode needs
+                source_group = self.graph.get_group_for_node(self.current_edge_start)
+                target_group = self.graph.get_group_for_node(target_node)
                 # Update selection with both groups if they exist
                 if source_group and target_group:
                     self.graph.selected_groups = [source_group, target_group]
@@ -1350,10 +1399,12 @@ class Canvas(QWidget):
             return
 
         # Create edges from all selected nodes to the target node
-        # regardless of whether the target belongs to a selected group or not
-        for source_node in self.all_for_one_selected_nodes:
-            if source_node != target_node:  # Avoid self-loops
-                self.graph.add_edge(source_node, target_node)
+        # regardless of whether the target belongs to a selected group or not.
+        # add_edges() skips the self-loop if the target is also selected
+        self.graph.add_edges(
+            (source_node, target_node)
+            for source_node in self.all_for_one_selected_nodes
+        )
 
         # Reset
         self.current_edge_start = None
@@ -1375,50 +1426,51 @@ class Canvas(QWidget):
             return
 
         # Calculate the displacement vector from the drag start node
-        start_pos = QPointF(self.current_edge_start.x, self.current_edge_start.y)
-        delta_vector = point - start_pos
+        delta_x = point.x() - self.current_edge_start.x
+        delta_y = point.y() - self.current_edge_start.y
 
-        # Create edges for each selected node if a target node exists at the endpoint
+        # Only nodes in the edit target groups may be edge sources; collect
+        # their IDs once instead of rebuilding every group's node list per source
+        eligible_ids = set().union(
+            *(group.node_ids for group in self.edit_target_groups)
+        )
+
+        # Create edges for each selected node if a target node exists at the
+        # endpoint, adding them to the graph in one batch
+        node_pairs = []
         for source_node in self.parallel_selected_nodes:
-            if not source_node:
+            if not source_node or source_node.id not in eligible_ids:
                 continue
 
             # Calculate the expected endpoint position for this source node
-            source_pos = QPointF(source_node.x, source_node.y)
-            expected_endpoint = QPointF(
-                source_pos.x() + delta_vector.x(), source_pos.y() + delta_vector.y()
-            )
-
-            # Find if there's a node at the expected endpoint
-            # Using a small tolerance to make it easier to connect
-            node_size = source_node.size  # Use node size as a reference for tolerance
+            end_x = source_node.x + delta_x
+            end_y = source_node.y + delta_y
+
+            # Find if there's a node within half a node size of the expected
+            # endpoint, using the node size as a tolerance to make it easier to
+            # connect. Only nodes overlapping the tolerance square around the
+            # endpoint can qualify, so the spatial index narrows the search
+            # before squared distances are compared.
+            max_distance = source_node.size / 2
+            max_distance_sq = max_distance**2
             target_node = None
 
-            for node in self.graph.nodes:
-                node_pos = QPointF(node.x, node.y)
-                distance = (
-                    (node_pos.x() - expected_endpoint.x()) ** 2
-                    + (node_pos.y() - expected_endpoint.y()) ** 2
-                ) ** 0.5
-
-                # If there's a node within half a node size, consider it the target
-                if distance <= node_size / 2:
+            for node in self.graph.find_nodes_in_area(
+                end_x - max_distance,
+                end_y - max_distance,
+                end_x + max_distance,
+                end_y + max_distance,
+            ):
+                dx = node.x - end_x
+                dy = node.y - end_y
+                if dx * dx + dy * dy <= max_distance_sq:
                     target_node = node
                     break
 
             # If a target node was found and it's not the same as the source node
             if target_node and target_node != source_node:
-                # Check if source node belongs to target groups
-                source_belongs = False
-
-                for group in self.edit_target_groups:
-                    if source_node in group.get_nodes(self.graph.nodes):
-                        source_belongs = True
-                        break
-
-                # Add edge if source node belongs to the edit target groups
-                if source_belongs:
-                    self.graph.add_edge(source_node, target_node)
+                node_pairs.append((source_node, target_node))
+        self.graph.add_edges(node_pairs)
 
         # Reset
         self.current_edge_start = None
@@ -1447,6 +1499,11 @@ class Canvas(QWidget):
         width = abs(x2 - x1)
         height = abs(y2 - y1)
         rect = QRectF(min_x, min_y, width, height)
+        max_x = min_x + width
+        max_y = min_y + height
+        # Like QRectF.contains() and QRectF.intersects(), a rectangle without
+        # area selects nothing
+        has_area = width > 0 and height > 0
 
         # Determine selection direction
         left_to_right = x1 < x2
@@ -1456,41 +1513,28 @@ class Canvas(QWidget):
         if self.current_mode == self.NORMAL_MODE:
             # In normal mode, select NodeGroups
             selected_groups = []
+            group_bounds = self.graph.group_bounds
 
             for group in self.graph.node_groups:
-                group_nodes = group.get_nodes(self.graph.nodes)
-                if not group_nodes:
+                bounds = group_bounds.get(group.id)
+                if bounds is None:
                     continue
 
-                # Calculate group bounds
-                group_min_x = min(node.x - node.size / 2 for node in group_nodes)
-                group_min_y = min(node.y - node.size / 2 for node in group_nodes)
-                group_max_x = max(node.x + node.size / 2 for node in group_nodes)
-                group_max_y = max(node.y + node.size / 2 for node in group_nodes)
-                group_rect = QRectF(
-                    group_min_x,
-                    group_min_y,
-                    group_max_x - group_min_x,
-                    group_max_y - group_min_y,
-                )
-
-                if left_to_right:
-                    # Strict containment for left-to-right selection
-                    if rect.contains(group_rect):
-                        selected_groups.append(group)
-                else:
-                    # Intersection for right-to-left selection
-                    if rect.intersects(group_rect):
-                        selected_groups.append(group)
+                if has_area and self._rect_selects(
+                    min_x, min_y, max_x, max_y, *bounds, left_to_right
+                ):
+                    selected_groups.append(group)
 
             # Apply the selection
             if not shift_pressed:
                 self.graph.selected_groups = selected_groups
             else:
                 # Additive selection with shift key
+                existing_groups = set(self.graph.selected_groups)
                 for group in selected_groups:
-                    if group not in self.graph.selected_groups:
+                    if group not in existing_groups:
                         self.graph.selected_groups.append(group)
+                        existing_groups.add(group)
 
             # Emit signal for each selected group
             for group in selected_groups:
@@ -1509,23 +1553,22 @@ class Canvas(QWidget):
                 # Handle node selection for both All-For-One and Parallel modes
                 selected_nodes = []
 
-                for group in self.edit_target_groups:
+                for group in self.edit_target_groups if has_area else ():
                     for node in group.get_nodes(self.graph.nodes):
-                        node_rect = QRectF(
-                            node.x - node.size / 2,
-                            node.y - node.size / 2,
-                            node.size,
-                            node.size,
-                        )
-
-                        if left_to_right:
-                            # Strict containment for left-to-right
-                            if rect.contains(node_rect):
-                                selected_nodes.append(node)
-                        else:
-                            # Intersection for right-to-left
-                            if rect.intersects(node_rect):
-                                selected_nodes.append(node)
+                        node_left = node.x - node.size / 2
+                        node_top = node.y - node.size / 2
+                        if self._rect_selects(
+                            min_x,
+                            min_y,
+                            max_x,
+                            max_y,
+                            node_left,
+                            node_top,
+                            node_left + node.size,
+                            node_top + node.size,
+                            left_to_right,
+                        ):
+                            selected_nodes.append(node)
 
                 # Apply the selection based on mode
                 if self.edit_submode == self.EDIT_SUBMODE_ALL_FOR_ONE:
@@ -1533,38 +1576,38 @@ class Canvas(QWidget):
                         self.all_for_one_selected_nodes = selected_nodes
                     else:
                         # Additive selection with shift key
+                        existing_ids = {
+                            node.id for node in self.all_for_one_selected_nodes
+                        }
                         for node in selected_nodes:
-                            if node not in self.all_for_one_selected_nodes:
+                            if node.id not in existing_ids:
                                 self.all_for_one_selected_nodes.append(node)
+                                existing_ids.add(node.id)
                 else:  # EDIT_SUBMODE_PARALLEL
                     if not shift_pressed:
                         self.parallel_selected_nodes = selected_nodes
                     else:
                         # Additive selection with shift key
+                        existing_ids = {
+                            node.id for node in self.parallel_selected_nodes
+                        }
                         for node in selected_nodes:
-                            if node not in self.parallel_selected_nodes:
+                            if node.id not in existing_ids:
                                 self.parallel_selected_nodes.append(node)
+                                existing_ids.add(node.id)
 
             else:  # Default edit mode - select edges
                 selected_edges = []
+                nodes_by_id = self.graph.nodes_by_id
+                target_node_ids = self._get_edit_target_node_ids()
 
                 for edge in self.graph.edges:
                     try:
-                        source_node = next(
-                            n for n in self.graph.nodes if n.id == edge[0]
-                        )
-                        target_node = next(
-                            n for n in self.graph.nodes if n.id == edge[1]
-                        )
+                        source_node = nodes_by_id[edge[0]]
+                        target_node = nodes_by_id[edge[1]]
 
                         # Only consider edges within edit target groups
-                        source_group = self.graph.get_group_for_node(source_node)
-                        target_group = self.graph.get_group_for_node(target_node)
-
-                        if (
-                            source_group in self.edit_target_groups
-                            or target_group in self.edit_target_groups
-                        ):
+                        if edge[0] in target_node_ids or edge[1] in target_node_ids:
 
                             # Get edge endpoints
                             start_point, end_point = (
@@ -1598,7 +1641,7 @@ class Canvas(QWidget):
                                 ):
                                     selected_edges.append((source_node, target_node))
 
-                    except StopIteration:
+                    except KeyError:
                         continue
 
                 # Apply the selection
@@ -1606,9 +1649,53 @@ class Canvas(QWidget):
                     self.selected_edges = selected_edges
                 else:
                     # Additive selection with shift key
+                    existing_edges = set(self.selected_edges)
                     for edge in selected_edges:
-                        if edge not in self.selected_edges:
+                        if edge not in existing_edges:
                             self.selected_edges.append(edge)
+                            existing_edges.add(edge)
+
+    @staticmethod
+    def _rect_selects(
+        min_x,
+        min_y,
+        max_x,
+        max_y,
+        item_min_x,
+        item_min_y,
+        item_max_x,
+        item_max_y,
+        strict,
+    ):
+        """
+        Check whether a selection rectangle selects an item's bounding box.
+
+        Compares the bounds as plain floats, which avoids building a QRectF and
+        calling into Qt for every node or group tested during a rectangle
+        selection. Both rectangles must have a non-zero area.
+
+        Args:
+            min_x, min_y, max_x, max_y (float): Bounds of the selection rectangle
+            item_min_x, item_min_y, item_max_x, item_max_y (float): Bounds of the item
+            strict (bool): Require the item to be fully contained (left-to-right
+                selection) instead of merely intersecting (right-to-left selection)
+
+        Returns:
+            bool: True if the item is selected
+        """
+        if strict:
+            return (
+                min_x <= item_min_x
+                and item_max_x <= max_x
+                and min_y <= item_min_y
+                and item_max_y <= max_y
+            )
+        return (
+            min_x < item_max_x
+            and item_min_x < max_x
+            and min_y < item_max_y
+            and item_min_y < max_y
+        )
 
     def dragEnterEvent(self, event):
         """
@@ -1651,26 +1738,36 @@ class Canvas(QWidget):
                     event.acceptProposedAction()
                     break
 
-    def _snap_to_grid_point(self, x, y):
+    def _snap_to_grid_point(self, x, y, grid_spacing=None):
         """
         Snap a point to the nearest grid point.
 
         Args:
             x (float): X coordinate
             y (float): Y coordinate
+            grid_spacing (float, optional): Snap spacing from
+                _get_snap_spacing(), for callers snapping many points
 
         Returns:
             tuple: (snapped_x, snapped_y) coordinates
         """
-        standard_spacing = config.get_dimension("grid.spacing", 40.0)
-        grid_spacing = (
-            standard_spacing / 2
-        )  # Half the standard spacing to match the finer grid
+        if grid_spacing is None:
+            grid_spacing = self._get_snap_spacing()
 
         snapped_x = round(x / grid_spacing) * grid_spacing
         snapped_y = round(y / grid_spacing) * grid_spacing
         return snapped_x, snapped_y
 
+    @staticmethod
+    def _get_snap_spacing():
+        """
+        Get the spacing of the grid points that nodes snap to.
+
+        Returns:
+            float: Half the standard grid spacing, to match the finer grid
+        """
+        return config.get_dimension("grid.spacing", 40.0) / 2
+
     def _snap_all_nodes_to_grid(self):
         """
         Snap all nodes to the nearest grid points.
@@ -1679,14 +1776,19 @@ class Canvas(QWidget):
         if not self.grid_visible or not self.snap_to_grid:
             return
 
-        # First, snap all selected nodes
-        for node in self.graph.selected_nodes:
-            node.x, node.y = self._snap_to_grid_point(node.x, node.y)
+        # Look up the grid spacing once rather than once per node
+        grid_spacing = self._get_snap_spacing()
 
-        # Then snap all other nodes
-        for node in self.graph.nodes:
-            if node not in self.graph.selected_nodes:
-                node.x, node.y = self._snap_to_grid_point(node.x, node.y)
+        # Snap the selected nodes first, then all others. Snapping is
+        # idempotent, so visiting selected nodes twice is harmless, and nodes
+        # already on the grid are left untouched so that cached geometry
+        # stays valid.
+        for node in chain(self.graph.selected_nodes, self.graph.nodes):
+            snapped_x, snapped_y = self._snap_to_grid_point(
+                node.x, node.y, grid_spacing
+            )
+            if snapped_x != node.x or snapped_y != node.y:
+                node.x, node.y = snapped_x, snapped_y
 
         self.update()
 
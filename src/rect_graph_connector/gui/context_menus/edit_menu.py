@@ -238,17 +238,10 @@ class EditContextMenu(QMenu):
         Delete all currently selected edges.
         """
         if self.canvas and self.canvas.selected_edges:
-            # Create a copy of the selected edges to avoid modifying the list during iteration
-            edges_to_delete = self.canvas.selected_edges.copy()
-
-            for source_node, target_node in edges_to_delete:
-                edge_to_remove = None
-                for edge in self.canvas.graph.edges:
-                    if edge[0] == source_node.id and edge[1] == target_node.id:
-                        edge_to_remove = edge
-                        break
-                if edge_to_remove:
-                    self.canvas.graph.edges.remove(edge_to_remove)
+            self.canvas.graph.remove_edges(
+                (source_node.id, target_node.id)
+                for source_node, target_node in self.canvas.selected_edges
+            )
 
             # Clear the selection after deletion
             self.canvas.selected_edges = []
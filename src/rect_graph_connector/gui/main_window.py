@@ -2,7 +2,7 @@
 This module contains the main window implementation for the graph editor application.
 """
 
-from PyQt5.QtCore import QSize, Qt, pyqtSignal
+from PyQt5.QtCore import QSize, Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QColor, QKeyEvent
 from PyQt5.QtWidgets import (
     QAbstractItemView,
@@ -58,6 +58,10 @@ class MainWindow(QMainWindow):
     def __init__(self):
         """Initialize the main window and set up the user interface."""
         super().__init__()
+
+        # Whether a side panel selection sync is already scheduled
+        self._side_panel_sync_pending = False
+
         self._setup_window()
         self._create_widgets()
         self._setup_layout()
@@ -654,6 +658,9 @@ class MainWindow(QMainWindow):
         """
         Update the mode display window.
 
+        The label text and style sheet are only applied when they change, since
+        setting a style sheet makes Qt re-polish the widget.
+
         Args:
             mode (str): Current mode ("normal" or "edit")
         """
@@ -665,13 +672,11 @@ class MainWindow(QMainWindow):
                 mode_text = config.get_string(
                     "main_window.mode.edit_all_for_one", "Mode: Edit - All-For-One"
                 )
-                self.mode_label.setText(mode_text)
             elif self.canvas.edit_submode == self.canvas.EDIT_SUBMODE_PARALLEL:
                 # Parallel connection mode display
                 mode_text = config.get_string(
                     "main_window.mode.edit_parallel", "Mode: Edit - Parallel"
                 )
-                self.mode_label.setText(mode_text)
             else:
                 # Normal edit mode display
                 edit_target = ""
@@ -683,24 +688,25 @@ class MainWindow(QMainWindow):
                 edit_mode_text = config.get_string(
                     "main_window.mode.edit", "Mode: Edit"
                 )
-                self.mode_label.setText(f"{edit_mode_text}{edit_target}")
+                mode_text = f"{edit_mode_text}{edit_target}"
 
             # Visual feedback - set reddish color (no border)
-            edit_bg_color = config.get_color(
+            bg_color = config.get_color(
                 "mode_indicator.edit", "rgba(255, 220, 220, 180)"
             )
-            self.mode_indicator.setStyleSheet(f"background-color: {edit_bg_color};")
         else:
-            normal_mode_text = config.get_string(
-                "main_window.mode.normal", "Mode: Normal"
-            )
             # Normal mode display
-            self.mode_label.setText(normal_mode_text)
+            mode_text = config.get_string("main_window.mode.normal", "Mode: Normal")
             # Visual feedback - return to normal color (no border)
-            normal_bg_color = config.get_color(
+            bg_color = config.get_color(
                 "mode_indicator.normal", "rgba(240, 240, 240, 180)"
             )
-            self.mode_indicator.setStyleSheet(f"background-color: {normal_bg_color};")
+
+        if self.mode_label.text() != mode_text:
+            self.mode_label.setText(mode_text)
+        style_sheet = f"background-color: {bg_color};"
+        if self.mode_indicator.styleSheet() != style_sheet:
+            self.mode_indicator.setStyleSheet(style_sheet)
 
     def keyPressEvent(self, event):
         """
@@ -794,9 +800,21 @@ class MainWindow(QMainWindow):
         Handle the group_selected signal from the canvas.
         Updates the side panel selection to match the canvas selection.
 
+        The canvas emits the signal once per group when selecting several
+        groups at once, so the sync is deferred to the event loop and runs
+        only once for the whole batch.
+
         Args:
             group (NodeGroup): The group that was selected in the canvas
         """
+        if self._side_panel_sync_pending:
+            return
+        self._side_panel_sync_pending = True
+        QTimer.singleShot(0, self._run_pending_side_panel_sync)
+
+    def _run_pending_side_panel_sync(self):
+        """Run the side panel selection sync scheduled by the canvas."""
+        self._side_panel_sync_pending = False
         # Update the side panel to reflect all selected groups in the canvas
         self._sync_side_panel_selection()
 
@@ -810,24 +828,46 @@ class MainWindow(QMainWindow):
 
         # Get all selected groups from the canvas
         selected_groups = self.canvas.graph.selected_groups
+        group_indices = {
+            id(group): index
+            for index, group in enumerate(self.canvas.graph.node_groups)
+        }
 
         # Select each corresponding item in the side panel
         for group in selected_groups:
-            try:
-                index = self.canvas.graph.node_groups.index(group)
-                # Select the item without clearing other selections
-                item = self.group_list.item(index)
-                if item:
-                    item.setSelected(True)
-            except ValueError:
+            index = group_indices.get(id(group))
+            if index is None:
                 # Group not found in the list
                 logger.warning(
                     f"Selected group not found in node_groups list: {group.name}"
                 )
+                continue
+            # Select the item without clearing other selections
+            item = self.group_list.item(index)
+            if item:
+                item.setSelected(True)
 
     def _update_group_list(self):
-        """Update the group list to reflect the current state of node groups."""
-        self.group_list.clear()
-        for group in self.canvas.graph.node_groups:
-            item = QListWidgetItem(group.name)
-            self.group_list.addItem(item)
+        """
+        Update the group list to reflect the current state of node groups.
+
+        Existing items are relabelled in place and only the surplus or missing
+        rows are removed or added, with widget updates suspended so the whole
+        refresh results in a single repaint. As with a full rebuild, the
+        selection is cleared.
+        """
+        groups = self.canvas.graph.node_groups
+        group_list = self.group_list
+        group_list.setUpdatesEnabled(False)
+        try:
+            group_list.clearSelection()
+            while group_list.count() > len(groups):
+                group_list.takeItem(group_list.count() - 1)
+            for index, group in enumerate(groups):
+                item = group_list.item(index)
+                if item is None:
+                    group_list.addItem(QListWidgetItem(group.name))
+                elif item.text() != group.name:
+                    item.setText(group.name)
+        finally:
+            group_list.setUpdatesEnabled(True)
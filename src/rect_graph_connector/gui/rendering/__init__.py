@@ -3,7 +3,7 @@ Rendering package for the rect_graph_connector GUI.
 Provides a collection of renderers for drawing various graph elements.
 """
 
-from .base_renderer import BaseRenderer, parse_rgba
+from .base_renderer import BaseRenderer, cached_color, parse_rgba
 from .border_renderer import BorderRenderer
 from .grid_renderer import GridRenderer
 from .edge_renderer import EdgeRenderer
@@ -21,5 +21,6 @@ __all__ = [
     "SelectionRenderer",
     "KnifeRenderer",
     "CompositeRenderer",
+    "cached_color",
     "parse_rgba",
 ]
@@ -3,30 +3,38 @@ Base renderer class and common utilities for rendering operations.
 """
 
 from abc import ABC, abstractmethod
+from functools import lru_cache
 import re
 from PyQt5.QtWidgets import QWidget
 from PyQt5.QtGui import QPainter, QColor
-from PyQt5.QtCore import QPointF
+from PyQt5.QtCore import QPointF, QRectF
 
+from ...models.connectivity import calculate_edge_segment
 from ...models.graph import Graph
 from ...config import config
 
 
-def parse_rgba(rgba_str):
+@lru_cache(maxsize=128)
+def cached_color(color_str):
     """
-    Parse rgba string and return QColor object.
-    Supports both hex and rgba() format.
+    Parse a color string once and return a shared QColor for it.
+
+    Color strings come from the configuration and repeat on every frame, so
+    parsing them once avoids redundant string and regex work in draw loops.
+    The returned object is shared between callers and must not be modified;
+    use parse_rgba() to get a private copy.
 
     Args:
-        rgba_str (str): Color string in format 'rgba(r,g,b,a)' or hex format
-        where a can be integer (0-255) or float (0-1)
+        color_str (str): Color string in 'rgba(r,g,b,a)', hex, or named format
 
     Returns:
-        QColor: QColor object with the specified color
+        QColor: Shared QColor object for the color
     """
-    if rgba_str.startswith("rgba"):
+    if color_str.startswith("rgba"):
         # Parse rgba(r,g,b,a) format
-        match = re.match(r"rgba\((\d+),\s*(\d+),\s*(\d+),\s*(\d+|\d*\.\d+)\)", rgba_str)
+        match = re.match(
+            r"rgba\((\d+),\s*(\d+),\s*(\d+),\s*(\d+|\d*\.\d+)\)", color_str
+        )
         if match:
             r, g, b, a = match.groups()
             r, g, b = map(int, [r, g, b])
@@ -36,7 +44,22 @@ def parse_rgba(rgba_str):
             color.setRgb(r, g, b, a)
             return color
     # Default to direct QColor creation for hex format
-    return QColor(rgba_str)
+    return QColor(color_str)
+
+
+def parse_rgba(rgba_str):
+    """
+    Parse rgba string and return QColor object.
+    Supports both hex and rgba() format.
+
+    Args:
+        rgba_str (str): Color string in format 'rgba(r,g,b,a)' or hex format
+        where a can be integer (0-255) or float (0-1)
+
+    Returns:
+        QColor: QColor object with the specified color
+    """
+    return QColor(cached_color(rgba_str))
 
 
 class BaseRenderer(ABC):
@@ -79,30 +102,34 @@ class BaseRenderer(ABC):
         Returns:
             tuple: (start_point, end_point) as QPointF objects
         """
-        # Get node centers
-        start_center = QPointF(source_node.x, source_node.y)
-        end_center = QPointF(target_node.x, target_node.y)
-
-        # Calculate direction vector
-        direction = end_center - start_center
-        if direction.manhattanLength() == 0:
-            return start_center, end_center
-
-        # Normalize direction vector
-        length = (direction.x() ** 2 + direction.y() ** 2) ** 0.5
-        normalized_dir = QPointF(direction.x() / length, direction.y() / length)
-
-        # Calculate actual endpoints considering node sizes
-        start_point = QPointF(
-            start_center.x() + normalized_dir.x() * source_node.size / 2,
-            start_center.y() + normalized_dir.y() * source_node.size / 2,
+        start_x, start_y, end_x, end_y = self._edge_endpoint_coords(
+            source_node, target_node
         )
-        end_point = QPointF(
-            end_center.x() - normalized_dir.x() * target_node.size / 2,
-            end_center.y() - normalized_dir.y() * target_node.size / 2,
+        return QPointF(start_x, start_y), QPointF(end_x, end_y)
+
+    def calculate_edge_line(self, source_node, target_node):
+        """
+        Calculate an edge's visual endpoints as integer line coordinates.
+
+        This is the form the edge passes draw with, so it skips creating
+        QPointF objects only to convert their coordinates back to ints.
+
+        Args:
+            source_node: The source node
+            target_node: The target node
+
+        Returns:
+            tuple: (x1, y1, x2, y2) truncated to ints
+        """
+        start_x, start_y, end_x, end_y = self._edge_endpoint_coords(
+            source_node, target_node
         )
+        return int(start_x), int(start_y), int(end_x), int(end_y)
 
-        return start_point, end_point
+    # Calculate an edge's visual endpoints on plain floats, as
+    # (start_x, start_y, end_x, end_y). The edge tools use the same function,
+    # so drawn edges and hit tests always agree.
+    _edge_endpoint_coords = staticmethod(calculate_edge_segment)
 
     def apply_transform(self, painter: QPainter):
         """
@@ -115,3 +142,44 @@ class BaseRenderer(ABC):
             painter.translate(self.canvas.pan_offset)
         if hasattr(self.canvas, "zoom"):
             painter.scale(self.canvas.zoom, self.canvas.zoom)
+
+    def get_paint_rect(self):
+        """
+        Get the part of the canvas being repainted, in widget coordinates.
+
+        Returns:
+            QRectF: The canvas's current paint rectangle if it exposes one,
+            otherwise the whole canvas rectangle
+        """
+        paint_rect = getattr(self.canvas, "paint_rect", None)
+        if paint_rect is not None:
+            return QRectF(paint_rect)
+        return QRectF(self.canvas.rect())
+
+    def get_visible_world_rect(self, margin: float = 0.0):
+        """
+        Get the canvas area currently visible, in graph (world) coordinates.
+
+        Args:
+            margin (float): Extra space in world units added on every side
+
+        Returns:
+            QRectF: The visible world rectangle, or None if the canvas does not
+            expose its geometry
+        """
+        if not hasattr(self.canvas, "rect"):
+            return None
+
+        zoom = getattr(self.canvas, "zoom", 1.0) or 1.0
+        pan_offset = getattr(self.canvas, "pan_offset", QPointF(0, 0))
+        widget_rect = QRectF(self.canvas.rect())
+
+        # Map widget coordinates back to graph coordinates: (p - pan) / zoom
+        left = (widget_rect.left() - pan_offset.x()) / zoom
+        top = (widget_rect.top() - pan_offset.y()) / zoom
+        return QRectF(
+            left - margin,
+            top - margin,
+            widget_rect.width() / zoom + margin * 2,
+            widget_rect.height() / zoom + margin * 2,
+        )
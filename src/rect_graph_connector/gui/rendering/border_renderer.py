@@ -14,6 +14,20 @@ class BorderRenderer(BaseRenderer):
     The border style changes based on the current mode.
     """
 
+    def __init__(self, canvas, graph):
+        """
+        Initialize the border renderer.
+
+        Args:
+            canvas: The canvas widget to draw on
+            graph: The graph model to render
+        """
+        super().__init__(canvas, graph)
+
+        # Border pens keyed by mode, rebuilt on theme change
+        self._pens = {}
+        self._pens_key = None
+
     def draw(self, painter: QPainter, mode: str = "normal", **kwargs):
         """
         Draw the canvas border with mode-specific color.
@@ -23,19 +37,44 @@ class BorderRenderer(BaseRenderer):
             mode (str): The current mode ("normal" or "edit")
             **kwargs: Additional drawing parameters
         """
-        # Set border color according to the mode from config
-        if mode == "edit":
-            border_color = config.get_color(
-                "canvas.border.edit", "#FF6464"
-            )  # Edit mode border
-        else:
-            border_color = config.get_color(
-                "canvas.border.normal", "#000000"
-            )  # Normal mode border
-
-        pen = QPen(QColor(border_color))
-        pen.setWidth(config.get_dimension("canvas.border_width", 2))
-        painter.setPen(pen)
-
-        # Draw border rectangle without scaling
+        painter.setPen(self._get_pen(mode))
+
+        # Draw border rectangle without scaling. The rectangle is axis-aligned
+        # on whole pixels, so antialiasing is skipped for it.
+        antialiasing = painter.testRenderHint(QPainter.Antialiasing)
+        if antialiasing:
+            painter.setRenderHint(QPainter.Antialiasing, False)
         painter.drawRect(0, 0, self.canvas.width() - 1, self.canvas.height() - 1)
+        if antialiasing:
+            painter.setRenderHint(QPainter.Antialiasing, True)
+
+    def _get_pen(self, mode: str) -> QPen:
+        """
+        Get the border pen for a mode, building it from the configuration if needed.
+
+        Args:
+            mode (str): The current mode ("normal" or "edit")
+
+        Returns:
+            QPen: The border pen; shared, must not be modified
+        """
+        if config.theme_mode != self._pens_key:
+            self._pens = {}
+            self._pens_key = config.theme_mode
+
+        pen = self._pens.get(mode)
+        if pen is None:
+            # Set border color according to the mode from config
+            if mode == "edit":
+                border_color = config.get_color(
+                    "canvas.border.edit", "#FF6464"
+                )  # Edit mode border
+            else:
+                border_color = config.get_color(
+                    "canvas.border.normal", "#000000"
+                )  # Normal mode border
+
+            pen = QPen(QColor(border_color))
+            pen.setWidth(config.get_dimension("canvas.border_width", 2))
+            self._pens[mode] = pen
+        return pen
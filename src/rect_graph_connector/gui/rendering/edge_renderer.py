@@ -2,11 +2,22 @@
 Edge renderer for drawing various types of edges in the graph.
 """
 
-from PyQt5.QtGui import QPainter, QColor, QPen
-from PyQt5.QtCore import Qt, QPointF
+from typing import NamedTuple
 
-from .base_renderer import BaseRenderer
+from PyQt5.QtGui import QPainter, QPen
+from PyQt5.QtCore import QLine, Qt
+
+from .base_renderer import BaseRenderer, cached_color
 from ...config import config
+from ...models.rect_node import RectNode
+
+
+class EdgePens(NamedTuple):
+    """Pens for each kind of edge, built from the configuration."""
+
+    normal: QPen
+    virtual: QPen
+    highlighted: QPen
 
 
 class EdgeRenderer(BaseRenderer):
@@ -15,6 +26,25 @@ class EdgeRenderer(BaseRenderer):
     Handles normal edges, temporary edges, selected edges, and highlighted edges.
     """
 
+    def __init__(self, canvas, graph):
+        """
+        Initialize the edge renderer.
+
+        Args:
+            canvas: The canvas widget to draw on
+            graph: The graph model to render
+        """
+        super().__init__(canvas, graph)
+
+        # Edge lines keyed by (source_id, target_id), valid while no node
+        # has been moved, resized, or renumbered
+        self._edge_lines = {}
+        self._edge_lines_version = None
+
+        # Edge pens, rebuilt on theme change
+        self._pens = None
+        self._pens_key = None
+
     def draw(
         self,
         painter: QPainter,
@@ -37,11 +67,29 @@ class EdgeRenderer(BaseRenderer):
             parallel_data (dict, optional): Data for parallel connection mode
             **kwargs: Additional drawing parameters
         """
+        # Build the selected edge ID pairs once instead of once per edge
+        selected_edge_ids = (
+            {(edge[0].id, edge[1].id) for edge in selected_edges}
+            if selected_edges
+            else None
+        )
+
+        # Edges entirely outside the visible area are skipped on large graphs
+        cull_bounds = self._get_cull_bounds()
+
+        # Look up edge endpoints and their groups by node ID instead of
+        # scanning the node and group lists for every edge
+        nodes_by_id, groups_by_node_id = self._build_node_lookup()
+
         # Draw standalone edges first (backmost)
-        self._draw_standalone_edges(painter, selected_edges)
+        self._draw_standalone_edges(
+            painter, nodes_by_id, groups_by_node_id, selected_edge_ids, cull_bounds
+        )
 
         # Draw edges within groups
-        self._draw_group_edges(painter, selected_edges)
+        self._draw_group_edges(
+            painter, nodes_by_id, groups_by_node_id, selected_edge_ids, cull_bounds
+        )
 
         # Draw selected edges
         if selected_edges:
@@ -49,7 +97,9 @@ class EdgeRenderer(BaseRenderer):
 
         # Draw knife tool highlighted edges
         if knife_data and knife_data.get("highlighted_edges"):
-            self._draw_highlighted_edges(painter, knife_data["highlighted_edges"])
+            self._draw_highlighted_edges(
+                painter, knife_data["highlighted_edges"], nodes_by_id
+            )
 
         # Draw temporary edge during edge creation
         if temp_edge_data:
@@ -69,92 +119,193 @@ class EdgeRenderer(BaseRenderer):
         ):
             self._draw_parallel_edges(painter, parallel_data)
 
-    def _draw_standalone_edges(self, painter: QPainter, selected_edges=None):
-        """Draw edges between nodes that don't belong to any NodeGroup."""
-        # Set up pen for normal edges
-        edge_color = config.get_color("edge.normal", "#000000")
-        pen = QPen(QColor(edge_color))
-        pen.setWidth(config.get_dimension("edge.width.normal", 1))
-        painter.setPen(pen)
+    def _build_node_lookup(self):
+        """
+        Build maps from node ID to node and from node ID to its group.
+
+        Returns:
+            tuple: (nodes_by_id, groups_by_node_id) dictionaries. A node in
+            several groups maps to the first one in the group list.
+        """
+        return self.graph.nodes_by_id, self.graph.groups_by_node_id
 
-        # Collect all node IDs that belong to any group
-        group_node_ids = set()
-        for group in self.graph.node_groups:
-            group_node_ids.update(group.node_ids)
+    def _get_pens(self) -> EdgePens:
+        """
+        Get the edge pens, building them from the configuration if needed.
 
+        Returns:
+            EdgePens: The pens for normal, virtual, and highlighted edges
+        """
+        if config.theme_mode != self._pens_key:
+            normal = QPen(cached_color(config.get_color("edge.normal", "#000000")))
+            normal.setWidth(config.get_dimension("edge.width.normal", 1))
+            virtual = QPen(normal)
+            virtual.setStyle(Qt.DashLine)
+            highlighted = QPen(
+                cached_color(config.get_color("edge.highlighted", "#FF0000")),
+                config.get_dimension("edge.width.highlighted", 2),
+            )
+            self._pens = EdgePens(normal, virtual, highlighted)
+            self._pens_key = config.theme_mode
+        return self._pens
+
+    def _get_edge_line(self, source_node, target_node) -> QLine:
+        """
+        Get an edge's integer line, computing it if needed.
+
+        Args:
+            source_node: The source node
+            target_node: The target node
+
+        Returns:
+            QLine: The line from calculate_edge_line(); shared, must not be modified
+        """
+        # Drop cached edge lines once any node has changed
+        if self._edge_lines_version != RectNode.version:
+            self._edge_lines = {}
+            self._edge_lines_version = RectNode.version
+
+        key = (source_node.id, target_node.id)
+        line = self._edge_lines.get(key)
+        if line is None:
+            line = QLine(*self.calculate_edge_line(source_node, target_node))
+            self._edge_lines[key] = line
+        return line
+
+    def _get_cull_bounds(self):
+        """
+        Get the visible world area used to skip off-screen edges.
+
+        Like node culling, this is only enabled for large graphs, where the
+        per-edge test costs less than the draw calls it saves.
+
+        Returns:
+            tuple: (min_x, min_y, max_x, max_y) of the visible area inflated by
+            the culling margin, or None if culling is disabled
+        """
+        if len(self.graph.nodes) <= config.get_dimension(
+            "canvas.culling.min_nodes", 500
+        ):
+            return None
+        rect = self.get_visible_world_rect(
+            config.get_dimension("canvas.culling.margin", 50)
+        )
+        if rect is None:
+            return None
+        return rect.left(), rect.top(), rect.right(), rect.bottom()
+
+    @staticmethod
+    def _is_edge_culled(source_node, target_node, cull_bounds) -> bool:
+        """
+        Check whether an edge lies entirely outside the visible area.
+
+        Args:
+            source_node: The source node
+            target_node: The target node
+            cull_bounds (tuple): The visible area from _get_cull_bounds(), or None
+
+        Returns:
+            bool: True if the edge's bounding box misses the visible area
+        """
+        if cull_bounds is None:
+            return False
+        min_x, min_y, max_x, max_y = cull_bounds
+        return (
+            max(source_node.x, target_node.x) < min_x
+            or min(source_node.x, target_node.x) > max_x
+            or max(source_node.y, target_node.y) < min_y
+            or min(source_node.y, target_node.y) > max_y
+        )
+
+    def _draw_standalone_edges(
+        self,
+        painter: QPainter,
+        nodes_by_id,
+        groups_by_node_id,
+        selected_edge_ids=None,
+        cull_bounds=None,
+    ):
+        """
+        Draw edges between nodes that don't belong to any NodeGroup.
+
+        Args:
+            painter (QPainter): The painter to use for drawing
+            nodes_by_id (dict): Nodes keyed by node ID
+            groups_by_node_id (dict): Groups keyed by the IDs of their nodes
+            selected_edge_ids (set, optional): (source_id, target_id) pairs of
+                selected edges, which are skipped here
+            cull_bounds (tuple, optional): Visible area; edges outside it are skipped
+        """
         # Draw edges that connect nodes not in the same group
+        lines = []
         for source_id, target_id in self.graph.edges:
             # Skip if edge is selected
-            if selected_edges and (source_id, target_id) in [
-                (e[0].id, e[1].id) for e in selected_edges
-            ]:
+            if selected_edge_ids and (source_id, target_id) in selected_edge_ids:
                 continue
 
-            # Find which groups the nodes belong to
-            source_group = next(
-                (g for g in self.graph.node_groups if source_id in g.node_ids), None
-            )
-            target_group = next(
-                (g for g in self.graph.node_groups if target_id in g.node_ids), None
-            )
-
             # Only draw if nodes are in different groups or at least one is not in any group
-            if source_group != target_group:
-                try:
-                    source_node = next(n for n in self.graph.nodes if n.id == source_id)
-                    target_node = next(n for n in self.graph.nodes if n.id == target_id)
-
-                    # Calculate and draw edge
-                    start_point, end_point = self.calculate_edge_endpoints(
-                        source_node, target_node
-                    )
-                    painter.drawLine(
-                        int(start_point.x()),
-                        int(start_point.y()),
-                        int(end_point.x()),
-                        int(end_point.y()),
-                    )
-                except StopIteration:
+            if groups_by_node_id.get(source_id) != groups_by_node_id.get(target_id):
+                source_node = nodes_by_id.get(source_id)
+                target_node = nodes_by_id.get(target_id)
+                if source_node is None or target_node is None:
+                    continue
+                if self._is_edge_culled(source_node, target_node, cull_bounds):
                     continue
 
-    def _draw_group_edges(self, painter: QPainter, selected_edges=None):
-        """Draw edges between nodes within the same group."""
-        edge_color = config.get_color("edge.normal", "#000000")
-        pen = QPen(QColor(edge_color))
-        pen.setWidth(config.get_dimension("edge.width.normal", 1))
-        painter.setPen(pen)
-
-        # Draw edges for each group in z-index order
-        for group in sorted(self.graph.node_groups, key=lambda g: g.z_index):
-            for source_id, target_id in self.graph.edges:
-                # Skip if edge is selected
-                if selected_edges and (source_id, target_id) in [
-                    (e[0].id, e[1].id) for e in selected_edges
-                ]:
+                lines.append(self._get_edge_line(source_node, target_node))
+
+        # Draw all of them in one call with the normal edge pen
+        if lines:
+            painter.setPen(self._get_pens().normal)
+            painter.drawLines(lines)
+
+    def _draw_group_edges(
+        self,
+        painter: QPainter,
+        nodes_by_id,
+        groups_by_node_id,
+        selected_edge_ids=None,
+        cull_bounds=None,
+    ):
+        """
+        Draw edges between nodes within the same group.
+
+        Args:
+            painter (QPainter): The painter to use for drawing
+            nodes_by_id (dict): Nodes keyed by node ID
+            groups_by_node_id (dict): Groups keyed by the IDs of their nodes
+            selected_edge_ids (set, optional): (source_id, target_id) pairs of
+                selected edges, which are skipped here
+            cull_bounds (tuple, optional): Visible area; edges outside it are skipped
+        """
+        # Bucket edges by the group containing both nodes, in edge order
+        edges_by_group = {}
+        for source_id, target_id in self.graph.edges:
+            # Skip if edge is selected
+            if selected_edge_ids and (source_id, target_id) in selected_edge_ids:
+                continue
+
+            group = groups_by_node_id.get(source_id)
+            if group is not None and groups_by_node_id.get(target_id) is group:
+                edges_by_group.setdefault(group.id, []).append((source_id, target_id))
+
+        # Collect edges for each group in z-index order
+        lines = []
+        for group in self.graph.groups_by_z:
+            for source_id, target_id in edges_by_group.get(group.id, ()):
+                source_node = nodes_by_id.get(source_id)
+                target_node = nodes_by_id.get(target_id)
+                if source_node is None or target_node is None:
+                    continue
+                if self._is_edge_culled(source_node, target_node, cull_bounds):
                     continue
 
-                # Only draw edges where both nodes belong to this group
-                if source_id in group.node_ids and target_id in group.node_ids:
-                    try:
-                        source_node = next(
-                            n for n in self.graph.nodes if n.id == source_id
-                        )
-                        target_node = next(
-                            n for n in self.graph.nodes if n.id == target_id
-                        )
-
-                        # Calculate and draw edge
-                        start_point, end_point = self.calculate_edge_endpoints(
-                            source_node, target_node
-                        )
-                        painter.drawLine(
-                            int(start_point.x()),
-                            int(start_point.y()),
-                            int(end_point.x()),
-                            int(end_point.y()),
-                        )
-                    except StopIteration:
-                        continue
+                lines.append(self._get_edge_line(source_node, target_node))
+
+        # Draw all of them in one call with the normal edge pen
+        if lines:
+            painter.setPen(self._get_pens().normal)
+            painter.drawLines(lines)
 
     def _draw_selected_edges(self, painter: QPainter, selected_edges):
         """Draw selected edges with a highlighted style."""
@@ -162,54 +313,66 @@ class EdgeRenderer(BaseRenderer):
             return
 
         # Set up pen for selected edges
-        edge_color = config.get_color("edge.highlighted", "#FF0000")
-        edge_width = config.get_dimension("edge.width.highlighted", 2)
-        painter.setPen(QPen(QColor(edge_color), edge_width))
+        painter.setPen(self._get_pens().highlighted)
 
         # Draw each selected edge
         for edge in selected_edges:
             try:
                 source_node, target_node = edge[0], edge[1]
-                start_point, end_point = self.calculate_edge_endpoints(
-                    source_node, target_node
-                )
-                painter.drawLine(
-                    int(start_point.x()),
-                    int(start_point.y()),
-                    int(end_point.x()),
-                    int(end_point.y()),
-                )
+                painter.drawLine(*self.calculate_edge_line(source_node, target_node))
             except (IndexError, AttributeError):
                 continue
 
-    def _draw_highlighted_edges(self, painter: QPainter, highlighted_edges):
+    def _draw_highlighted_edges(
+        self, painter: QPainter, highlighted_edges, nodes_by_id=None
+    ):
         """Draw highlighted edges for knife tool."""
         if not highlighted_edges:
             return
 
         # Set up pen for highlighted edges
-        edge_color = config.get_color("edge.highlighted", "#FF0000")
-        edge_width = config.get_dimension("edge.width.highlighted", 2)
-        painter.setPen(QPen(QColor(edge_color), edge_width))
+        painter.setPen(self._get_pens().highlighted)
 
-        # Draw each highlighted edge
+        if nodes_by_id is None:
+            nodes_by_id = self.graph.nodes_by_id
+
+        # Draw the highlighted edges in one call
+        lines = []
         for edge in highlighted_edges:
-            try:
-                source_node = next(n for n in self.graph.nodes if n.id == edge[0])
-                target_node = next(n for n in self.graph.nodes if n.id == edge[1])
-
-                start_point, end_point = self.calculate_edge_endpoints(
-                    source_node, target_node
-                )
-                painter.drawLine(
-                    int(start_point.x()),
-                    int(start_point.y()),
-                    int(end_point.x()),
-                    int(end_point.y()),
-                )
-            except StopIteration:
+            source_node = nodes_by_id.get(edge[0])
+            target_node = nodes_by_id.get(edge[1])
+            if source_node is None or target_node is None:
                 continue
 
+            lines.append(self._get_edge_line(source_node, target_node))
+        if lines:
+            painter.drawLines(lines)
+
+    @staticmethod
+    def _preview_line(node, end_x: float, end_y: float):
+        """
+        Get the line of a preview edge from a node's boundary to a free point.
+
+        Args:
+            node: The node the edge starts from
+            end_x (float): X-coordinate of the end point
+            end_y (float): Y-coordinate of the end point
+
+        Returns:
+            QLine: The integer line, or None if the end point is the node center
+        """
+        dx = end_x - node.x
+        dy = end_y - node.y
+        if dx == 0 and dy == 0:
+            return None
+        length = (dx * dx + dy * dy) ** 0.5
+        return QLine(
+            int(node.x + dx / length * node.size / 2),
+            int(node.y + dy / length * node.size / 2),
+            int(end_x),
+            int(end_y),
+        )
+
     def _draw_temp_edge(self, painter: QPainter, temp_edge_data):
         """Draw temporary edge during edge creation."""
         start_node, end_point = temp_edge_data
@@ -217,28 +380,12 @@ class EdgeRenderer(BaseRenderer):
             return
 
         # Set up pen for temporary edge
-        edge_color = config.get_color("edge.normal", "#000000")
-        pen = QPen(QColor(edge_color))
-        pen.setWidth(config.get_dimension("edge.width.normal", 1))
-        painter.setPen(pen)
-
-        # Calculate start point from node boundary
-        start_center = QPointF(start_node.x, start_node.y)
-        direction = QPointF(end_point) - start_center
-        if direction.manhattanLength() > 0:
-            # Calculate and draw edge
-            length = (direction.x() ** 2 + direction.y() ** 2) ** 0.5
-            normalized_dir = QPointF(direction.x() / length, direction.y() / length)
-            start_point = QPointF(
-                start_center.x() + normalized_dir.x() * start_node.size / 2,
-                start_center.y() + normalized_dir.y() * start_node.size / 2,
-            )
-            painter.drawLine(
-                int(start_point.x()),
-                int(start_point.y()),
-                int(end_point.x()),
-                int(end_point.y()),
-            )
+        painter.setPen(self._get_pens().normal)
+
+        # Draw from the node boundary towards the cursor
+        line = self._preview_line(start_node, end_point.x(), end_point.y())
+        if line is not None:
+            painter.drawLine(line)
 
     def _draw_all_for_one_edges(
         self, painter: QPainter, temp_edge_data, all_for_one_selected_nodes
@@ -248,36 +395,20 @@ class EdgeRenderer(BaseRenderer):
             return
 
         start_node, end_point = temp_edge_data
+        end_x, end_y = end_point.x(), end_point.y()
 
-        # Set up pen for virtual edges
-        edge_color = config.get_color("edge.normal", "#000000")
-        pen = QPen(QColor(edge_color))
-        pen.setWidth(config.get_dimension("edge.width.normal", 1))
-        pen.setStyle(Qt.DashLine)
-        painter.setPen(pen)
-
-        # Draw virtual edges from all selected nodes except the start node
+        # Collect virtual edges from all selected nodes except the start node
+        lines = []
         for node in all_for_one_selected_nodes:
             if node != start_node:
-                start_center = QPointF(node.x, node.y)
-                direction = QPointF(end_point) - start_center
-
-                if direction.manhattanLength() > 0:
-                    # Calculate and draw edge
-                    length = (direction.x() ** 2 + direction.y() ** 2) ** 0.5
-                    normalized_dir = QPointF(
-                        direction.x() / length, direction.y() / length
-                    )
-                    start_point = QPointF(
-                        start_center.x() + normalized_dir.x() * node.size / 2,
-                        start_center.y() + normalized_dir.y() * node.size / 2,
-                    )
-                    painter.drawLine(
-                        int(start_point.x()),
-                        int(start_point.y()),
-                        int(end_point.x()),
-                        int(end_point.y()),
-                    )
+                line = self._preview_line(node, end_x, end_y)
+                if line is not None:
+                    lines.append(line)
+
+        # Draw all of them in one call with the virtual edge pen
+        if lines:
+            painter.setPen(self._get_pens().virtual)
+            painter.drawLines(lines)
 
     def _draw_parallel_edges(self, painter: QPainter, parallel_data):
         """Draw temporary virtual edges for parallel connection mode."""
@@ -287,33 +418,15 @@ class EdgeRenderer(BaseRenderer):
         selected_nodes = parallel_data.get("selected_nodes", [])
         edge_endpoints = parallel_data["edge_endpoints"]
 
-        # Set up pen for virtual edges
-        edge_color = config.get_color("edge.normal", "#000000")
-        pen = QPen(QColor(edge_color))
-        pen.setWidth(config.get_dimension("edge.width.normal", 1))
-        pen.setStyle(Qt.DashLine)
-        painter.setPen(pen)
-
-        # Draw each virtual edge
+        # Collect each virtual edge
+        lines = []
         for node, endpoint in zip(selected_nodes, edge_endpoints):
             if node and endpoint:
-                start_center = QPointF(node.x, node.y)
-                end_point = QPointF(endpoint[0], endpoint[1])
-                direction = end_point - start_center
-
-                if direction.manhattanLength() > 0:
-                    # Calculate and draw edge
-                    length = (direction.x() ** 2 + direction.y() ** 2) ** 0.5
-                    normalized_dir = QPointF(
-                        direction.x() / length, direction.y() / length
-                    )
-                    start_point = QPointF(
-                        start_center.x() + normalized_dir.x() * node.size / 2,
-                        start_center.y() + normalized_dir.y() * node.size / 2,
-                    )
-                    painter.drawLine(
-                        int(start_point.x()),
-                        int(start_point.y()),
-                        int(end_point.x()),
-                        int(end_point.y()),
-                    )
+                line = self._preview_line(node, endpoint[0], endpoint[1])
+                if line is not None:
+                    lines.append(line)
+
+        # Draw all of them in one call with the virtual edge pen
+        if lines:
+            painter.setPen(self._get_pens().virtual)
+            painter.drawLines(lines)
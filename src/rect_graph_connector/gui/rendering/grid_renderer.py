@@ -2,6 +2,8 @@
 Grid renderer for drawing the canvas grid.
 """
 
+import math
+
 from PyQt5.QtGui import QPainter, QColor, QPen
 
 from .base_renderer import BaseRenderer
@@ -14,6 +16,20 @@ class GridRenderer(BaseRenderer):
     Grid spacing is controlled by the grid.spacing configuration value.
     """
 
+    def __init__(self, canvas, graph):
+        """
+        Initialize the grid renderer.
+
+        Args:
+            canvas: The canvas widget to draw on
+            graph: The graph model to render
+        """
+        super().__init__(canvas, graph)
+
+        # Grid line pen, rebuilt on theme change
+        self._pen = None
+        self._pen_key = None
+
     def draw(self, painter: QPainter, **kwargs):
         """
         Draw grid lines across the canvas when grid visibility is enabled.
@@ -26,70 +42,65 @@ class GridRenderer(BaseRenderer):
         if not hasattr(self.canvas, "grid_visible") or not self.canvas.grid_visible:
             return
 
-        # Set grid line color and style
-        grid_color = config.get_color("grid.line", "#DDDDDD")
-        pen = QPen(QColor(grid_color))
-        pen.setWidth(1)
-        painter.setPen(pen)
+        # Grid lines are axis-aligned and drawn on whole pixels, where
+        # antialiasing only smears each line across two pixel rows
+        antialiasing = painter.testRenderHint(QPainter.Antialiasing)
+        if antialiasing:
+            painter.setRenderHint(QPainter.Antialiasing, False)
 
-        # Apply pan offset but not zoom for grid (grid should move with pan)
-        painter.save()
-        if hasattr(self.canvas, "pan_offset"):
-            painter.translate(self.canvas.pan_offset)
+        painter.setPen(self._get_pen())
+
+        # Apply pan offset but not zoom for grid (grid should move with pan).
+        # Only the translation changes, so it is undone directly instead of
+        # saving and restoring the whole painter state.
+        pan_offset = getattr(self.canvas, "pan_offset", None)
+        if pan_offset is not None:
+            painter.translate(pan_offset)
 
         # Get grid spacing from config (using half the standard spacing as per requirements)
         standard_spacing = config.get_dimension("grid.spacing", 40.0)
         grid_spacing = standard_spacing / 2  # Half the node spacing for finer grid
-
-        # Calculate visible area in graph coordinates
-        visible_rect = self.canvas.rect()
-
-        # Get the maximum canvas dimensions for determining grid coverage
-        max_width = config.get_dimension("main_window.initial.width", 800)
-        max_height = config.get_dimension("main_window.initial.height", 600)
-
-        # Apply a safety margin to ensure grid covers viewport when panned or zoomed
-        margin_factor = 10  # Increase this for larger grid coverage
-
-        left = (
-            -self.canvas.pan_offset.x() / self.canvas.zoom - max_width * margin_factor
-        )
-        top = (
-            -self.canvas.pan_offset.y() / self.canvas.zoom - max_height * margin_factor
-        )
-        right = (
-            visible_rect.width() - self.canvas.pan_offset.x()
-        ) / self.canvas.zoom + max_width * margin_factor
-        bottom = (
-            visible_rect.height() - self.canvas.pan_offset.y()
-        ) / self.canvas.zoom + max_height * margin_factor
-
-        # Calculate grid line positions
-        start_x = int(left / grid_spacing) * grid_spacing
-        start_y = int(top / grid_spacing) * grid_spacing
-
-        # Calculate grid coverage
-        grid_width = int(
-            visible_rect.width() + 2 * max_width * margin_factor * self.canvas.zoom
-        )
-        grid_height = int(
-            visible_rect.height() + 2 * max_height * margin_factor * self.canvas.zoom
-        )
+        zoom = self.canvas.zoom
+        step = grid_spacing * zoom
+
+        # Only lines crossing the area being painted are drawn. The area is
+        # expressed in the pan-translated coordinates used below and padded so
+        # that antialiased line ends stay outside it.
+        paint_rect = self.get_paint_rect()
+        pan_x = pan_offset.x() if pan_offset is not None else 0.0
+        pan_y = pan_offset.y() if pan_offset is not None else 0.0
+        left = math.floor(paint_rect.left() - pan_x) - 2
+        top = math.floor(paint_rect.top() - pan_y) - 2
+        right = math.ceil(paint_rect.right() - pan_x) + 2
+        bottom = math.ceil(paint_rect.bottom() - pan_y) + 2
 
         # Draw vertical grid lines
-        x = start_x
-        while x <= right:
-            scaled_x = x * self.canvas.zoom
-            painter.drawLine(
-                int(scaled_x), -grid_height, int(scaled_x), grid_height * 2
-            )
-            x += grid_spacing
+        for index in range(math.floor(left / step), math.ceil(right / step) + 1):
+            scaled_x = int(index * grid_spacing * zoom)
+            painter.drawLine(scaled_x, top, scaled_x, bottom)
 
         # Draw horizontal grid lines
-        y = start_y
-        while y <= bottom:
-            scaled_y = y * self.canvas.zoom
-            painter.drawLine(-grid_width, int(scaled_y), grid_width * 2, int(scaled_y))
-            y += grid_spacing
+        for index in range(math.floor(top / step), math.ceil(bottom / step) + 1):
+            scaled_y = int(index * grid_spacing * zoom)
+            painter.drawLine(left, scaled_y, right, scaled_y)
+
+        if pan_offset is not None:
+            painter.translate(-pan_offset)
+
+        if antialiasing:
+            painter.setRenderHint(QPainter.Antialiasing, True)
 
-        painter.restore()
+    def _get_pen(self) -> QPen:
+        """
+        Get the grid line pen, building it from the configuration if needed.
+
+        Returns:
+            QPen: The grid line pen; shared, must not be modified
+        """
+        if config.theme_mode != self._pen_key:
+            # Set grid line color and style
+            grid_color = config.get_color("grid.line", "#DDDDDD")
+            self._pen = QPen(QColor(grid_color))
+            self._pen.setWidth(1)
+            self._pen_key = config.theme_mode
+        return self._pen
@@ -2,7 +2,8 @@
 Knife tool renderer for drawing the knife path and related visuals.
 """
 
-from PyQt5.QtGui import QPainter, QColor, QPen
+from PyQt5.QtCore import QPoint
+from PyQt5.QtGui import QPainter, QColor, QPen, QPolygon
 
 from .base_renderer import BaseRenderer
 from ...config import config
@@ -29,7 +30,7 @@ class KnifeRenderer(BaseRenderer):
     def _draw_knife_path(self, painter: QPainter, path_points):
         """
         Draw the knife tool path.
-        The path is drawn as a series of connected lines in a distinct color.
+        The path is drawn as a polyline of connected lines in a distinct color.
 
         Args:
             painter (QPainter): The painter to use for drawing
@@ -44,8 +45,6 @@ class KnifeRenderer(BaseRenderer):
         pen.setWidth(config.get_dimension("knife.path_width", 2))
         painter.setPen(pen)
 
-        # Draw lines connecting all points in the path
-        for i in range(len(path_points) - 1):
-            x1, y1 = path_points[i]
-            x2, y2 = path_points[i + 1]
-            painter.drawLine(int(x1), int(y1), int(x2), int(y2))
+        # Draw the whole path as one polyline, handing Qt a single point
+        # array instead of issuing a drawLine call per path segment
+        painter.drawPolyline(QPolygon([QPoint(int(x), int(y)) for x, y in path_points]))
@@ -2,11 +2,83 @@
 Node and group renderer for drawing nodes and their containing groups.
 """
 
-from PyQt5.QtCore import QPointF, QRectF, Qt
-from PyQt5.QtGui import QColor, QPainter, QPen
+import math
+from collections import OrderedDict
+from typing import NamedTuple
+
+from PyQt5.QtCore import QPointF, QRect, QRectF, Qt
+from PyQt5.QtGui import (
+    QImage,
+    QPainter,
+    QPen,
+    QPicture,
+    QStaticText,
+    QTransform,
+)
 
 from ...config import config
-from .base_renderer import BaseRenderer, parse_rgba
+from ...models.rect_node import RectNode
+from .base_renderer import BaseRenderer, cached_color
+
+# Node drawing states, in order of precedence
+STATE_PARALLEL = 0
+STATE_ALL_FOR_ONE = 1
+STATE_SELECTED = 2
+STATE_NORMAL = 3
+
+# Maximum number of laid-out label texts kept by a renderer
+STATIC_TEXT_CACHE_SIZE = 4096
+
+
+class PaintCommand(NamedTuple):
+    """A recorded QPainter call that can be replayed on any painter."""
+
+    method: str
+    args: tuple
+
+    def apply(self, painter):
+        """
+        Replay the call on the given painter.
+
+        Args:
+            painter (QPainter): The painter to draw with
+        """
+        getattr(painter, self.method)(*self.args)
+
+
+class _PaintRecorder:
+    """
+    Painter stand-in that records drawing calls as PaintCommands.
+
+    Queries such as font() and fontMetrics() are forwarded to the real painter
+    so that layout code can run unchanged against the recorder.
+    """
+
+    RECORDED_METHODS = frozenset(
+        (
+            "setPen",
+            "setBrush",
+            "fillRect",
+            "drawRect",
+            "drawRects",
+            "drawText",
+            "drawStaticText",
+        )
+    )
+
+    def __init__(self, painter):
+        self._painter = painter
+        self.commands = []
+
+    def __getattr__(self, name):
+        if name in self.RECORDED_METHODS:
+            commands = self.commands
+
+            def record(*args):
+                commands.append(PaintCommand(name, args))
+
+            return record
+        return getattr(self._painter, name)
 
 
 class NodeRenderer(BaseRenderer):
@@ -15,6 +87,52 @@ class NodeRenderer(BaseRenderer):
     Handles node shapes, colors, labels, and group backgrounds/borders.
     """
 
+    def __init__(self, canvas, graph):
+        """
+        Initialize the node renderer.
+
+        Args:
+            canvas (QWidget): The canvas widget to draw on
+            graph (Graph): The graph model to render
+        """
+        super().__init__(canvas, graph)
+        self._group_layout = None
+        self._group_layout_key = None
+
+        # Per-state (fill color, border pen) table, rebuilt on theme change
+        self._node_style = None
+        self._node_style_key = None
+        self._node_text_color = None
+
+        # Laid-out label texts and their half sizes keyed by (text, font key),
+        # in LRU order
+        self._static_text = OrderedDict()
+
+        # Label text widths and elided texts keyed by font key and text
+        self._text_metrics = {}
+
+        # Group nodes, borders, and labels queued for batched drawing; borders
+        # and labels are each indexed by whether the group is selected
+        self._pending_nodes = []
+        self._pending_borders = ([], [])
+        self._pending_labels = ([], [])
+        self._pending_extent = None
+
+        # Recorded paint commands per pass, as (scene key, commands)
+        self._render_tree = {}
+
+        # Rasterized scene per pass, as (layer key, image)
+        self._layers = {}
+
+        # Drawing state of every non-normal node for the frame being drawn,
+        # keyed by node ID, and a hashable snapshot of it for the scene key
+        self._node_states = {}
+        self._node_states_key = frozenset()
+
+        # Level-of-detail thresholds for the frame being drawn
+        self._min_node_label_size = 0.0
+        self._group_label_text_visible = True
+
     def draw(
         self,
         painter: QPainter,
@@ -40,301 +158,789 @@ class NodeRenderer(BaseRenderer):
         if hasattr(self.canvas, "parallel_selected_nodes"):
             parallel_selected_nodes = self.canvas.parallel_selected_nodes
 
-        # Special case for test mode - just draw all nodes directly
+        # The background pass draws no nodes, so the node states are resolved
+        # only once per frame, by the pass that draws them
+        self._begin_frame(
+            all_for_one_selected_nodes,
+            parallel_selected_nodes,
+            resolve_node_states=not draw_only_backgrounds,
+        )
+
+        # Everything drawn here is axis-aligned rectangles and text, which gain
+        # nothing from antialiasing, so turn it off for the duration of the pass
+        antialiasing = painter.testRenderHint(QPainter.Antialiasing)
+        if antialiasing:
+            painter.setRenderHint(QPainter.Antialiasing, False)
+
         if test_mode:
-            for node in self.graph.nodes:
-                self._draw_node(
-                    painter,
-                    node,
-                    all_for_one_selected_nodes,
-                    parallel_selected_nodes,
+            # Special case for test mode - just draw all nodes directly
+            self._draw_nodes(painter, self.graph.nodes)
+        else:
+            # Layout runs only when the scene changed; otherwise the paint
+            # commands recorded last time are replayed as-is
+            cull_rect = self._get_cull_rect()
+            pass_key = (draw_only_backgrounds, draw_only_nodes)
+            scene_key = self._get_scene_key(painter, cull_rect, draw_only_backgrounds)
+            cached = self._render_tree.get(pass_key)
+            if cached is None or cached[0] != scene_key:
+                recorder = _PaintRecorder(painter)
+                self._draw_scene(
+                    recorder, draw_only_backgrounds, draw_only_nodes, cull_rect
                 )
+                commands = recorder.commands
+                if isinstance(painter, QPainter):
+                    # Bake the pass into a QPicture so it can be rasterized
+                    # once into a image layer
+                    commands = self._record_picture(commands, painter.font())
+                cached = (scene_key, commands)
+                self._render_tree[pass_key] = cached
+            if isinstance(cached[1], QPicture):
+                self._draw_layer(painter, cached[1], pass_key)
+            else:
+                for command in cached[1]:
+                    command.apply(painter)
+
+        if antialiasing:
+            painter.setRenderHint(QPainter.Antialiasing, True)
+
+    def _record_picture(self, commands, font) -> QPicture:
+        """
+        Record paint commands into a QPicture.
+
+        Args:
+            commands (list): The PaintCommands to record
+            font (QFont): The font text is drawn with
+
+        Returns:
+            QPicture: A picture that replays the commands when drawn
+        """
+        picture = QPicture()
+        picture_painter = QPainter(picture)
+        picture_painter.setFont(font)
+        for command in commands:
+            command.apply(picture_painter)
+        picture_painter.end()
+        return picture
+
+    def _draw_layer(self, painter: QPainter, picture: QPicture, pass_key):
+        """
+        Draw a recorded pass through its cached image layer.
+
+        The picture is rasterized at the current zoom into an image covering
+        its visible part, rounded out to whole tiles, so that panning within
+        those tiles only blits the image. Each pass has its own layer, which
+        is rebuilt only when that pass's picture, the zoom, or the covered
+        tiles change. Transforms other than scale and translation, and layers
+        larger than the configured maximum, fall back to replaying the picture
+        directly.
+
+        Args:
+            painter (QPainter): The painter to draw with
+            picture (QPicture): The recorded pass
+            pass_key (tuple): The pass the picture belongs to
+        """
+        transform = painter.worldTransform()
+        scale = transform.m11()
+        bounds = QRectF(picture.boundingRect())
+        if (
+            transform.type() > QTransform.TxScale
+            or scale != transform.m22()
+            or scale <= 0
+        ):
+            painter.drawPicture(0, 0, picture)
+            return
+        if bounds.isEmpty():
             return
 
-        # Get selected group IDs
-        selected_group_ids = [group.id for group in self.graph.selected_groups]
+        # Visible part of the picture, in whole tiles of layer pixels
+        tile = config.get_dimension("canvas.layer_cache.tile_pixels", 256)
+        view = transform.inverted()[0].mapRect(QRectF(painter.window()))
+        left = max(
+            math.floor(view.left() * scale / tile),
+            math.floor(bounds.left() * scale / tile),
+        )
+        top = max(
+            math.floor(view.top() * scale / tile),
+            math.floor(bounds.top() * scale / tile),
+        )
+        right = min(
+            math.ceil(view.right() * scale / tile),
+            math.ceil(bounds.right() * scale / tile),
+        )
+        bottom = min(
+            math.ceil(view.bottom() * scale / tile),
+            math.ceil(bounds.bottom() * scale / tile),
+        )
+        if left >= right or top >= bottom:
+            return
+        width = (right - left) * tile
+        height = (bottom - top) * tile
+        max_pixels = config.get_dimension("canvas.layer_cache.max_pixels", 4096)
+        if width > max_pixels or height > max_pixels:
+            painter.drawPicture(0, 0, picture)
+            return
 
-        # Sort groups by z-index (lowest to highest)
-        sorted_groups = sorted(self.graph.node_groups, key=lambda g: g.z_index)
+        # The sub-pixel part of the pan is baked into the layer so that it is
+        # rasterized exactly as if it were drawn directly
+        offset_x = math.floor(transform.dx())
+        offset_y = math.floor(transform.dy())
+        fraction = (transform.dx() - offset_x, transform.dy() - offset_y)
+
+        pixel_ratio = painter.device().devicePixelRatioF()
+        key = (picture, scale, pixel_ratio, fraction, left, top, right, bottom)
+        layer = self._layers.get(pass_key)
+        if layer is None or layer[0] != key:
+            # A premultiplied image is the raster engine's native format, so
+            # rasterizing into it and blitting it needs no pixel conversion
+            image = QImage(
+                math.ceil((width + 1) * pixel_ratio),
+                math.ceil((height + 1) * pixel_ratio),
+                QImage.Format_ARGB32_Premultiplied,
+            )
+            image.setDevicePixelRatio(pixel_ratio)
+            image.fill(Qt.transparent)
+            layer_painter = QPainter(image)
+            layer_painter.translate(fraction[0] - left * tile, fraction[1] - top * tile)
+            layer_painter.scale(scale, scale)
+            layer_painter.drawPicture(0, 0, picture)
+            layer_painter.end()
+            layer = (key, image)
+            self._layers[pass_key] = layer
+
+        # Blit in device coordinates so layer pixels map 1:1 to the screen
+        painter.save()
+        painter.resetTransform()
+        painter.drawImage(left * tile + offset_x, top * tile + offset_y, layer[1])
+        painter.restore()
+
+    def _get_scene_key(self, painter: QPainter, cull_rect, draw_only_backgrounds):
+        """
+        Build a key describing everything the recorded scene depends on.
 
-        # Prepare standalone nodes (nodes not belonging to any group)
-        standalone_nodes = [
-            node
-            for node in self.graph.nodes
-            if not any(node.id in group.node_ids for group in self.graph.node_groups)
-        ]
+        The model is mutated directly throughout the application, so instead of
+        relying on change notifications the key samples cheap observables: the
+        global node version (position, size, ID), the node list, per-group
+        attributes, the group selection, the theme, and the cull rect. Passes
+        that draw nodes also depend on the node states, group labels, the
+        font, and the label level of detail, which leave the backgrounds as-is.
 
-        if draw_only_backgrounds:
-            # Draw only group backgrounds
-            self._draw_node_group_backgrounds(painter)
-        elif draw_only_nodes:
-            # Draw each group's nodes, borders, and labels (without backgrounds)
-            for group in sorted_groups:
-                self._draw_group(
-                    painter,
-                    group,
-                    selected_group_ids,
-                    all_for_one_selected_nodes,
-                    parallel_selected_nodes,
-                    skip_background=True,
-                )
+        Args:
+            painter (QPainter): The painter the scene will be drawn with
+            cull_rect (QRectF): The culling rectangle, or None
+            draw_only_backgrounds (bool): Whether the key is for the background pass
 
-            # Draw standalone nodes
-            for node in standalone_nodes:
-                self._draw_node(
-                    painter,
-                    node,
-                    all_for_one_selected_nodes,
-                    parallel_selected_nodes,
-                )
-        else:
-            # Draw everything (backwards compatibility)
-            self._draw_node_group_backgrounds(painter)
-
-            for group in sorted_groups:
-                self._draw_group(
-                    painter,
-                    group,
-                    selected_group_ids,
-                    all_for_one_selected_nodes,
-                    parallel_selected_nodes,
-                )
+        Returns:
+            tuple: A hashable key that changes whenever the scene must be rebuilt
+        """
+        nodes = self.graph.nodes
+        key = (
+            RectNode.version,
+            id(nodes),
+            len(nodes),
+            tuple(
+                (group.id, group.z_index, id(group.node_ids), len(group.node_ids))
+                for group in self.graph.node_groups
+            ),
+            self.graph.selected_group_ids,
+            self._node_style_key,
+            cull_rect.getRect() if cull_rect is not None else None,
+        )
+        if draw_only_backgrounds:
+            return key
+        return key + (
+            tuple(
+                (group.name, group.label_position) for group in self.graph.node_groups
+            ),
+            self._node_states_key,
+            painter.font().key(),
+            self._min_node_label_size,
+            self._group_label_text_visible,
+        )
 
-            # Draw standalone nodes
-            for node in standalone_nodes:
-                self._draw_node(
-                    painter,
-                    node,
-                    all_for_one_selected_nodes,
-                    parallel_selected_nodes,
-                )
+    def _draw_scene(
+        self, painter: QPainter, draw_only_backgrounds, draw_only_nodes, cull_rect
+    ):
+        """
+        Draw groups and standalone nodes in z-order.
 
-    def _draw_node_group_backgrounds(self, painter: QPainter):
-        """Draw the background rectangles for all node groups."""
+        Args:
+            painter (QPainter): The painter to use for drawing
+            draw_only_backgrounds (bool): If True, only draw group backgrounds
+            draw_only_nodes (bool): If True, only draw nodes and borders (no backgrounds)
+            cull_rect (QRectF): If given, items outside it are skipped
+        """
         # Get selected group IDs
-        selected_group_ids = [group.id for group in self.graph.selected_groups]
+        selected_group_ids = self.graph.selected_group_ids
+
+        # Groups in z-index order with their nodes and bounds, plus the nodes
+        # not belonging to any group
+        group_layout, standalone_nodes = self._get_group_layout()
+
+        # Skip groups and nodes that lie completely outside the visible area
+        visible_nodes = None
+        if cull_rect is not None:
+            visible_nodes = self._query_visible_nodes(cull_rect)
+            group_layout = [
+                entry
+                for entry in group_layout
+                if self._is_group_visible(entry[2], cull_rect)
+            ]
+            standalone_nodes = [
+                node for node in standalone_nodes if node in visible_nodes
+            ]
+
+        if not draw_only_nodes:
+            # Draw group backgrounds
+            self._draw_node_group_backgrounds(painter, group_layout, selected_group_ids)
+            if draw_only_backgrounds:
+                return
+
+        # Draw each group's nodes, borders, and labels
+        for group, group_nodes, bounds, group_rect in group_layout:
+            self._draw_group(
+                painter,
+                group,
+                group_nodes,
+                bounds,
+                group_rect,
+                selected_group_ids,
+                visible_nodes=visible_nodes,
+            )
+        self._flush_pending_groups(painter)
 
-        # Sort groups by z-index (lowest to highest)
-        sorted_groups = sorted(self.graph.node_groups, key=lambda g: g.z_index)
+        # Draw standalone nodes
+        self._draw_nodes(painter, standalone_nodes)
 
-        # Draw background for each group
-        for group in sorted_groups:
-            group_nodes = group.get_nodes(self.graph.nodes)
-            if not group_nodes:
-                continue
+    def _begin_frame(
+        self,
+        all_for_one_selected_nodes,
+        parallel_selected_nodes,
+        resolve_node_states=True,
+    ):
+        """
+        Prepare the per-frame node state table and style table.
 
-            # Calculate group boundary
-            border_margin = config.get_dimension("group.border_margin", 5)
-            min_x = min(node.x - node.size / 2 for node in group_nodes) - border_margin
-            min_y = min(node.y - node.size / 2 for node in group_nodes) - border_margin
-            max_x = max(node.x + node.size / 2 for node in group_nodes) + border_margin
-            max_y = max(node.y + node.size / 2 for node in group_nodes) + border_margin
-            group_width = max_x - min_x
-            group_height = max_y - min_y
+        Node states are resolved once per frame into a node ID -> state table,
+        so drawing a node needs a single lookup instead of testing each
+        selection set in order of precedence.
 
-            # Special style for selected groups
-            is_selected = group.id in selected_group_ids
+        Args:
+            all_for_one_selected_nodes (list): Nodes selected in All-For-One mode
+            parallel_selected_nodes (list): Nodes selected in Parallel mode
+            resolve_node_states (bool): If False, keep the previous node state
+                table, for passes that draw no nodes
+        """
+        if resolve_node_states:
+            # Filled from lowest to highest precedence, so later states win
+            node_states = {}
+            for state, selected_nodes in (
+                (STATE_SELECTED, self.graph.selected_nodes),
+                (STATE_ALL_FOR_ONE, all_for_one_selected_nodes or ()),
+                (STATE_PARALLEL, parallel_selected_nodes or ()),
+            ):
+                for node in selected_nodes:
+                    node_states[node.id] = state
+            self._node_states = node_states
+            self._node_states_key = frozenset(node_states.items())
+        if self._node_style_key != config.theme_mode:
+            self._refresh_style_cache()
+
+        # Level of detail: labels smaller than this many pixels are not drawn
+        zoom = getattr(self.canvas, "zoom", 1.0) or 1.0
+        self._min_node_label_size = self._node_label_min_pixels / zoom
+        self._group_label_text_visible = (
+            self._group_label_dimensions[2] * zoom >= self._group_label_min_pixels
+        )
 
-            # Draw group background (semi-transparent)
-            bg_color_value = (
+    def _refresh_style_cache(self):
+        """Build the node and group drawing styles from the configuration."""
+        # (state, config key, default fill, default border, default width)
+        state_styles = (
+            (STATE_PARALLEL, "parallel_selected", "#90EE90", "#006400", 3),
+            (STATE_ALL_FOR_ONE, "all_for_one_selected", "#FFA500", "#FF6600", 3),
+            (STATE_SELECTED, "selected", "#ADD8E6", "blue", 2),
+            (STATE_NORMAL, "normal", "skyblue", "gray", 1),
+        )
+        node_style = [None] * len(state_styles)
+        for state, key, fill_default, border_default, width_default in state_styles:
+            fill_color = cached_color(
+                config.get_color(f"node.fill.{key}", fill_default)
+            )
+            pen = QPen(
+                cached_color(config.get_color(f"node.border.{key}", border_default))
+            )
+            pen.setWidth(
+                config.get_dimension(f"node.border_width.{key}", width_default)
+            )
+            node_style[state] = (fill_color, pen)
+
+        self._node_style = node_style
+        self._node_text_color = cached_color(config.get_color("node.text", "#000000"))
+
+        # Group styles, indexed by whether the group is selected
+        self._group_background_colors = (
+            cached_color(
+                config.get_color("group.background.normal", "rgba(245, 245, 245, 20)")
+            ),
+            cached_color(
                 config.get_color("group.background.selected", "rgba(230, 230, 255, 40)")
-                if is_selected
-                else config.get_color(
-                    "group.background.normal", "rgba(245, 245, 245, 20)"
+            ),
+        )
+        self._group_border_colors = (
+            cached_color(config.get_color("group.border.normal", "#C8C8C8")),
+            cached_color(config.get_color("group.border.selected", "#6464FF")),
+        )
+        normal_pen = QPen(self._group_border_colors[0])
+        normal_pen.setWidth(config.get_dimension("group.border_width.normal", 1))
+        normal_pen.setStyle(Qt.DashLine)
+        selected_pen = QPen(self._group_border_colors[1])
+        selected_pen.setWidth(config.get_dimension("group.border_width.selected", 2))
+        selected_pen.setStyle(Qt.SolidLine)
+        self._group_border_pens = (normal_pen, selected_pen)
+        self._group_label_backgrounds = (
+            cached_color(
+                config.get_color(
+                    "group.label.background.normal", "rgba(240, 240, 240, 180)"
                 )
+            ),
+            cached_color(
+                config.get_color(
+                    "group.label.background.selected", "rgba(240, 240, 255, 200)"
+                )
+            ),
+        )
+        self._group_label_text_color = cached_color(
+            config.get_color("group.label.text", "#000000")
+        )
+
+        # Label dimensions, read once instead of per group or per frame
+        self._group_label_dimensions = (
+            config.get_dimension("group.label.text_margin", 10),
+            config.get_dimension("group.label.position_margin", 30),
+            config.get_dimension("group.label.height", 20),
+            config.get_dimension("group.label.fixed_width", 100),
+        )
+        self._node_label_min_pixels = config.get_dimension("node.label.min_pixels", 6)
+        self._group_label_min_pixels = config.get_dimension("group.label.min_pixels", 6)
+        self._node_style_key = config.theme_mode
+
+    def _get_cull_rect(self):
+        """
+        Get the world-space rectangle used for viewport culling.
+
+        Culling is a linear scan over every node, which costs more than it saves
+        on small or dense scenes, so it is only enabled for large graphs. The
+        rectangle is snapped outward to a coarse grid so that small pans keep
+        the same cull rect and can reuse the recorded scene.
+
+        Returns:
+            QRectF: The visible world rectangle inflated by the culling margin,
+            or None if culling is disabled for the current graph
+        """
+        min_nodes = config.get_dimension("canvas.culling.min_nodes", 500)
+        if len(self.graph.nodes) <= min_nodes:
+            return None
+        margin = config.get_dimension("canvas.culling.margin", 50)
+        rect = self.get_visible_world_rect(margin)
+        if rect is None:
+            return None
+
+        snap = config.get_dimension("canvas.culling.snap", 200)
+        left = math.floor(rect.left() / snap) * snap
+        top = math.floor(rect.top() / snap) * snap
+        right = math.ceil(rect.right() / snap) * snap
+        bottom = math.ceil(rect.bottom() / snap) * snap
+        return QRectF(left, top, right - left, bottom - top)
+
+    def _query_visible_nodes(self, cull_rect) -> set:
+        """
+        Find the nodes whose rectangles intersect the culling rectangle.
+
+        Uses the graph's spatial node index, so the renderer and the hit tests
+        share one index.
+
+        Args:
+            cull_rect (QRectF): The visible world rectangle
+
+        Returns:
+            set: The visible nodes
+        """
+        return set(
+            self.graph.find_nodes_in_area(
+                cull_rect.left(), cull_rect.top(), cull_rect.right(), cull_rect.bottom()
             )
-            bg_color = parse_rgba(bg_color_value)
-
-            # Convert to integer positions as required
-            min_x_int = int(min_x)
-            min_y_int = int(min_y)
-            group_width_int = int(group_width)
-            group_height_int = int(group_height)
-            painter.fillRect(
-                min_x_int, min_y_int, group_width_int, group_height_int, bg_color
+        )
+
+    def _get_group_layout(self):
+        """
+        Collect every group's nodes and bounds in a single pass over all nodes.
+
+        Group membership is packed into a node ID -> group index map first, so
+        each node is visited once instead of once per group. Bounds come from
+        Graph.group_bounds. The result is cached until a node is added,
+        removed, moved, or resized, or until group membership or ordering
+        changes.
+
+        Returns:
+            tuple: (group_layout, standalone_nodes), where group_layout is a
+            list of (group, group_nodes, bounds, rect) in z-order for every
+            group with at least one node, bounds is (min_x, min_y, max_x, max_y)
+            including the border margin, and rect is bounds rounded to a QRect
+        """
+        nodes = self.graph.nodes
+        groups = self.graph.groups_by_z
+        border_margin = config.get_dimension("group.border_margin", 5)
+        key = (
+            RectNode.version,
+            id(nodes),
+            len(nodes),
+            tuple(
+                (group.id, id(group.node_ids), len(group.node_ids)) for group in groups
+            ),
+            border_margin,
+        )
+        if key == self._group_layout_key:
+            return self._group_layout
+
+        # Map each node ID to the indices of the groups containing it
+        group_indices = {}
+        for index, group in enumerate(groups):
+            for node_id in group.node_ids:
+                group_indices.setdefault(node_id, []).append(index)
+
+        members = [[] for _ in groups]
+        standalone_nodes = []
+        for node in nodes:
+            indices = group_indices.get(node.id)
+            if indices is None:
+                standalone_nodes.append(node)
+                continue
+            for index in indices:
+                members[index].append(node)
+
+        group_bounds = self.graph.group_bounds
+        group_layout = []
+        for index, group in enumerate(groups):
+            if not members[index]:
+                continue
+            min_x, min_y, max_x, max_y = group_bounds[group.id]
+            min_x -= border_margin
+            min_y -= border_margin
+            max_x += border_margin
+            max_y += border_margin
+            # Round once here so the draw passes can reuse the integer rect
+            rect = QRect(int(min_x), int(min_y), int(max_x - min_x), int(max_y - min_y))
+            group_layout.append(
+                (group, members[index], (min_x, min_y, max_x, max_y), rect)
             )
 
+        self._group_layout = (group_layout, standalone_nodes)
+        self._group_layout_key = key
+        return self._group_layout
+
+    def _is_group_visible(self, bounds, cull_rect) -> bool:
+        """
+        Check whether a group's bounds intersect the culling rectangle.
+
+        Args:
+            bounds (tuple): The group's (min_x, min_y, max_x, max_y)
+            cull_rect (QRectF): The visible world rectangle
+
+        Returns:
+            bool: True if any part of the group may be visible
+        """
+        min_x, min_y, max_x, max_y = bounds
+        return (
+            max_x >= cull_rect.left()
+            and min_x <= cull_rect.right()
+            and max_y >= cull_rect.top()
+            and min_y <= cull_rect.bottom()
+        )
+
+    def _draw_node_group_backgrounds(
+        self, painter: QPainter, group_layout, selected_group_ids
+    ):
+        """
+        Draw the background rectangles for the given node groups.
+
+        Backgrounds are bucketed by selection state and each bucket is filled
+        with a single drawRects call.
+
+        Args:
+            painter (QPainter): The painter to use for drawing
+            group_layout (list): Entries from _get_group_layout() in z-order
+            selected_group_ids (frozenset): IDs of the selected groups
+        """
+        # Collect background rectangles, indexed by selection state
+        background_rects = ([], [])
+        for group, _, _, group_rect in group_layout:
+            background_rects[group.id in selected_group_ids].append(group_rect)
+
+        # Draw group backgrounds (semi-transparent)
+        painter.setPen(Qt.NoPen)
+        for is_selected, rects in enumerate(background_rects):
+            if rects:
+                painter.setBrush(self._group_background_colors[is_selected])
+                painter.drawRects(rects)
+        painter.setBrush(Qt.NoBrush)
+
     def _draw_group(
         self,
         painter: QPainter,
         group,
+        group_nodes,
+        bounds,
+        group_rect,
         selected_group_ids,
-        all_for_one_selected_nodes,
-        parallel_selected_nodes,
-        skip_background=False,
+        visible_nodes=None,
     ):
         """
-        Draw a single group including its nodes, border, and label.
+        Queue a single group's nodes, border, and label.
+
+        Queued groups are drawn together by _flush_pending_groups(), so the
+        nodes of consecutive groups share one batch and each pen and brush is
+        set once per batch rather than once per group. Queued groups are
+        flushed first if this group would cover their decorations, which
+        preserves the z-order.
 
         Args:
             painter (QPainter): The painter to use for drawing
             group: The group to draw
-            selected_group_ids: List of selected group IDs
-            all_for_one_selected_nodes: List of nodes selected in All-For-One mode
-            parallel_selected_nodes: List of nodes selected in Parallel mode
-            skip_background (bool): If True, skip drawing the background
+            group_nodes (list): The nodes belonging to the group
+            bounds (tuple): The group's (min_x, min_y, max_x, max_y)
+            group_rect (QRect): The group's bounds rounded to integers
+            selected_group_ids (frozenset): IDs of the selected groups
+            visible_nodes (set, optional): If given, nodes not in it are skipped
         """
-        group_nodes = group.get_nodes(self.graph.nodes)
-        if not group_nodes:
-            return
-
-        # Calculate group boundary
-        border_margin = config.get_dimension("group.border_margin", 5)
-        min_x = min(node.x - node.size / 2 for node in group_nodes) - border_margin
-        min_y = min(node.y - node.size / 2 for node in group_nodes) - border_margin
-        max_x = max(node.x + node.size / 2 for node in group_nodes) + border_margin
-        max_y = max(node.y + node.size / 2 for node in group_nodes) + border_margin
-        group_width = max_x - min_x
-        group_height = max_y - min_y
+        min_x, min_y, max_x, max_y = bounds
 
         # Special style for selected groups
         is_selected = group.id in selected_group_ids
 
-        # Convert to integer positions
-        min_x_int = int(min_x)
-        min_y_int = int(min_y)
-        group_width_int = int(group_width)
-        group_height_int = int(group_height)
-
-        # Draw nodes within the group
-        for node in group_nodes:
-            self._draw_node(
-                painter,
-                node,
-                all_for_one_selected_nodes,
-                parallel_selected_nodes,
+        min_x_int = group_rect.x()
+        min_y_int = group_rect.y()
+
+        # Flush queued decorations this group is about to be drawn over
+        extent = self._pending_extent
+        if extent is not None and (
+            min_x <= extent[2]
+            and max_x >= extent[0]
+            and min_y <= extent[3]
+            and max_y >= extent[1]
+        ):
+            self._flush_pending_groups(painter)
+
+        # Queue nodes within the group
+        if visible_nodes is not None:
+            self._pending_nodes.extend(
+                node for node in group_nodes if node in visible_nodes
             )
+        else:
+            self._pending_nodes.extend(group_nodes)
 
-        # Draw group border
-        border_color_value = (
-            config.get_color("group.border.selected", "#6464FF")
-            if is_selected
-            else config.get_color("group.border.normal", "#C8C8C8")
-        )
-        pen_color = QColor(border_color_value)
-
-        pen = QPen(pen_color)
-        border_width = (
-            config.get_dimension("group.border_width.selected", 2)
-            if is_selected
-            else config.get_dimension("group.border_width.normal", 1)
+        # Queue group border and label
+        label = self._layout_group_label(
+            painter, group, is_selected, min_x_int, min_y_int, max_x, max_y
         )
-        pen.setWidth(border_width)
-        pen.setStyle(Qt.DashLine if not is_selected else Qt.SolidLine)
-        painter.setPen(pen)
-        painter.drawRect(min_x_int, min_y_int, group_width_int, group_height_int)
-
-        # Draw group label
-        self._draw_group_label(
-            painter,
-            group,
-            group_nodes,
-            is_selected,
-            pen_color,
-            min_x_int,
-            min_y_int,
-            max_x,
-            max_y,
+        self._pending_borders[is_selected].append(group_rect)
+        self._pending_labels[is_selected].append(label)
+        label_rect = label[0]
+        decoration_extent = (
+            min(min_x_int, label_rect.left()),
+            min(min_y_int, label_rect.top()),
+            max(group_rect.right() + 1, label_rect.right() + 1),
+            max(group_rect.bottom() + 1, label_rect.bottom() + 1),
         )
+        extent = self._pending_extent
+        if extent is None:
+            self._pending_extent = decoration_extent
+        else:
+            self._pending_extent = (
+                min(extent[0], decoration_extent[0]),
+                min(extent[1], decoration_extent[1]),
+                max(extent[2], decoration_extent[2]),
+                max(extent[3], decoration_extent[3]),
+            )
 
-    def _draw_node(
-        self,
-        painter: QPainter,
-        node,
-        all_for_one_selected_nodes,
-        parallel_selected_nodes,
-    ):
-        """Draw a single node with its fill, border, and label."""
-        rect = QRectF(
-            node.x - node.size / 2, node.y - node.size / 2, node.size, node.size
-        )
+    def _flush_pending_groups(self, painter: QPainter):
+        """
+        Draw all queued group nodes, then their borders and labels batched by
+        selection state.
 
-        # Determine node selection state
-        is_node_selected = node in self.graph.selected_nodes
-        is_all_for_one_selected = (
-            all_for_one_selected_nodes and node in all_for_one_selected_nodes
-        )
-        is_parallel_selected = node in parallel_selected_nodes
-
-        # Fill color based on selection state
-        if is_parallel_selected:
-            node_fill_color = config.get_color(
-                "node.fill.parallel_selected", "#90EE90"
-            )  # Light green
-        elif is_all_for_one_selected:
-            node_fill_color = config.get_color(
-                "node.fill.all_for_one_selected", "#FFA500"
-            )  # Orange
-        elif is_node_selected:
-            node_fill_color = config.get_color(
-                "node.fill.selected", "#ADD8E6"
-            )  # Selected blue
-        else:
-            node_fill_color = config.get_color(
-                "node.fill.normal", "skyblue"
-            )  # Normal blue
-
-        node_color = QColor(node_fill_color)
-
-        # Fill the node rectangle
-        painter.fillRect(rect, node_color)
-
-        # Draw border based on selection state
-        if is_parallel_selected:
-            border_color = config.get_color(
-                "node.border.parallel_selected", "#006400"
-            )  # Dark green
-            pen = QPen(QColor(border_color))
-            pen.setWidth(config.get_dimension("node.border_width.parallel_selected", 3))
-        elif is_all_for_one_selected:
-            border_color = config.get_color(
-                "node.border.all_for_one_selected", "#FF6600"
-            )  # Dark orange
-            pen = QPen(QColor(border_color))
-            pen.setWidth(
-                config.get_dimension("node.border_width.all_for_one_selected", 3)
+        Args:
+            painter (QPainter): The painter to use for drawing
+        """
+        if self._pending_extent is None:
+            return
+
+        pending_nodes = self._pending_nodes
+        self._pending_nodes = []
+        self._draw_nodes(painter, pending_nodes)
+
+        pending_borders = self._pending_borders
+        pending_labels = self._pending_labels
+        # Start new queues rather than clearing, since the drawn lists may be
+        # referenced by recorded paint commands
+        self._pending_borders = ([], [])
+        self._pending_labels = ([], [])
+        self._pending_extent = None
+
+        # Draw group borders
+        for is_selected, rects in enumerate(pending_borders):
+            if rects:
+                painter.setPen(self._group_border_pens[is_selected])
+                painter.drawRects(rects)
+
+        # Draw label backgrounds and borders
+        for is_selected, labels in enumerate(pending_labels):
+            if labels:
+                painter.setPen(self._group_border_colors[is_selected])
+                painter.setBrush(self._group_label_backgrounds[is_selected])
+                painter.drawRects([label[0] for label in labels])
+        painter.setBrush(Qt.NoBrush)
+
+        # Draw group names, unless labels are too small on screen to be read
+        if not self._group_label_text_visible:
+            return
+        painter.setPen(self._group_label_text_color)
+        font = painter.font()
+        font_key = font.key()
+        for labels in pending_labels:
+            for label_rect, display_text in labels:
+                static_text, half_width, half_height = self._get_static_text(
+                    display_text, font, font_key
+                )
+                painter.drawStaticText(
+                    QPointF(
+                        label_rect.x() + label_rect.width() / 2 - half_width,
+                        label_rect.y() + label_rect.height() / 2 - half_height,
+                    ),
+                    static_text,
+                )
+
+    def _draw_nodes(self, painter: QPainter, nodes):
+        """
+        Draw a batch of nodes with their fills, borders, and labels.
+
+        Shapes are drawn first, one drawRects() call per run of consecutive
+        nodes sharing a state, and all labels are drawn afterwards with a single
+        text pen. Batching only consecutive nodes keeps overlapping nodes in
+        their original paint order.
+
+        Args:
+            painter (QPainter): The painter to use for drawing
+            nodes (list): The nodes to draw, in drawing order
+        """
+        rects = []
+        batches = []
+        batch_key = None
+        get_state = self._node_states.get
+        for node in nodes:
+            rect = node.get_rect()
+            rects.append(rect)
+
+            # drawRects() takes a list of one rect type, so that is part of the key
+            key = (get_state(node.id, STATE_NORMAL), type(rect))
+            if key != batch_key:
+                batch_rects = []
+                batches.append((key[0], batch_rects))
+                batch_key = key
+            batch_rects.append(rect)
+
+        if not rects:
+            return
+
+        for state, batch_rects in batches:
+            fill_color, pen = self._node_style[state]
+            painter.setPen(pen)
+            painter.setBrush(fill_color)
+            painter.drawRects(batch_rects)
+        painter.setBrush(Qt.NoBrush)
+
+        # Draw node IDs, skipping nodes too small on screen for a readable label
+        painter.setPen(self._node_text_color)
+        font = painter.font()
+        font_key = font.key()
+        min_label_size = self._min_node_label_size
+        get_static_text = self._get_static_text
+        for node in nodes:
+            if node.size < min_label_size:
+                continue
+            # Keyed by the ID itself, so str() only runs when laying out
+            static_text, half_width, half_height = get_static_text(
+                node.id, font, font_key
+            )
+            # Kept as QPointF: labels are drawn in world coordinates and scaled
+            # by the zoom, so rounding here would misplace them by up to the
+            # zoom factor in pixels
+            painter.drawStaticText(
+                QPointF(node.x - half_width, node.y - half_height), static_text
             )
-        elif is_node_selected:
-            border_color = config.get_color("node.border.selected", "blue")
-            pen = QPen(QColor(border_color))
-            pen.setWidth(config.get_dimension("node.border_width.selected", 2))
-        else:
-            border_color = config.get_color("node.border.normal", "gray")
-            pen = QPen(QColor(border_color))
-            pen.setWidth(config.get_dimension("node.border_width.normal", 1))
 
-        painter.setPen(pen)
-        painter.drawRect(rect)
+    def _get_static_text(self, text, font, font_key):
+        """
+        Get a laid-out QStaticText for the given text, creating it if needed.
 
-        # Draw node ID
-        text_color = config.get_color("node.text", "#000000")
-        painter.setPen(QColor(text_color))
-        painter.drawText(rect, Qt.AlignCenter, str(node.id))
+        Laying out text is one of the most expensive per-label costs, so
+        prepared texts are kept in a bounded LRU cache across frames together
+        with their half sizes, which is all that centering a label needs.
 
-    def _draw_group_label(
+        Args:
+            text: The text to lay out; non-string values such as node IDs are
+                converted with str() only when laid out
+            font (QFont): The font the text is drawn with
+            font_key (str): The font's key(), used to separate cache entries
+
+        Returns:
+            tuple: (static_text, half_width, half_height)
+        """
+        key = (text, font_key)
+        entry = self._static_text.get(key)
+        if entry is None:
+            static_text = QStaticText(str(text))
+            # Labels are never markup, so skip the rich text detection
+            static_text.setTextFormat(Qt.PlainText)
+            static_text.setPerformanceHint(QStaticText.AggressiveCaching)
+            static_text.prepare(QTransform(), font)
+            size = static_text.size()
+            entry = (static_text, size.width() / 2, size.height() / 2)
+            self._static_text[key] = entry
+            if len(self._static_text) > STATIC_TEXT_CACHE_SIZE:
+                self._static_text.popitem(last=False)
+        else:
+            self._static_text.move_to_end(key)
+        return entry
+
+    def _layout_group_label(
         self,
         painter: QPainter,
         group,
-        group_nodes,
         is_selected,
-        pen_color,
         min_x,
         min_y,
         max_x,
         max_y,
     ):
-        """Draw the label for a node group."""
+        """
+        Calculate the rectangle and text of a node group's label.
+
+        Args:
+            painter (QPainter): The painter whose font metrics are used
+            group: The group the label belongs to
+            is_selected (bool): Whether the group is selected
+            min_x, min_y, max_x, max_y: The group's bounds
+
+        Returns:
+            tuple: (label_rect, display_text) with label_rect as a QRect
+        """
+        text_margin, margin, label_height, fixed_width = self._group_label_dimensions
+
         # Calculate label width (including margins)
-        font_metrics = painter.fontMetrics()
-        text_margin = config.get_dimension("group.label.text_margin", 10)
-        text_width = font_metrics.width(group.name) + text_margin
-        half_width = text_width // 2
+        font_key = painter.font().key()
+        text_width = self._get_text_metric(painter, font_key, group.name) + text_margin
 
         # Calculate label position
         center_x = (min_x + max_x) / 2
-        margin = config.get_dimension("group.label.position_margin", 30)
-        label_height = config.get_dimension("group.label.height", 20)
-        fixed_width = config.get_dimension("group.label.fixed_width", 100)
 
         # Determine label position and width based on group settings
         if group.label_position == group.POSITION_RIGHT:
@@ -346,7 +952,7 @@ class NodeRenderer(BaseRenderer):
             display_text = (
                 group.name
                 if is_selected or text_width <= fixed_width
-                else font_metrics.elidedText(group.name, Qt.ElideRight, fixed_width)
+                else self._get_text_metric(painter, font_key, group.name, fixed_width)
             )
         else:  # POSITION_TOP or POSITION_BOTTOM
             # Center the label
@@ -359,31 +965,35 @@ class NodeRenderer(BaseRenderer):
             display_width = text_width
             display_text = group.name
 
-        # Draw label background
-        label_bg_value = (
-            config.get_color(
-                "group.label.background.selected", "rgba(240, 240, 255, 200)"
-            )
-            if is_selected
-            else config.get_color(
-                "group.label.background.normal", "rgba(240, 240, 240, 180)"
-            )
-        )
-        label_bg = parse_rgba(label_bg_value)
-        painter.fillRect(label_x, label_y, display_width, label_height, label_bg)
-
-        # Draw label border
-        painter.setPen(pen_color)
-        painter.drawRect(label_x, label_y, display_width, label_height)
-
-        # Draw group name
-        text_color = config.get_color("group.label.text", "#000000")
-        painter.setPen(QColor(text_color))
-        painter.drawText(
-            label_x,
-            label_y,
-            display_width,
-            label_height,
-            Qt.AlignCenter,
-            display_text,
-        )
+        return QRect(label_x, label_y, display_width, label_height), display_text
+
+    def _get_text_metric(self, painter: QPainter, font_key, text, elide_width=None):
+        """
+        Get the width of a text, or its elided form, using cached font metrics.
+
+        Measuring text shapes it on every call, while group names rarely change
+        between paints. Results are keyed by the font key, so a font change
+        simply misses the cache.
+
+        Args:
+            painter (QPainter): The painter whose font metrics are used
+            font_key (str): The painter font's key()
+            text (str): The text to measure
+            elide_width (int, optional): If given, return the text elided on the
+                right to fit this width instead of its width
+
+        Returns:
+            int or str: The text width, or the elided text
+        """
+        key = (font_key, text, elide_width)
+        result = self._text_metrics.get(key)
+        if result is None:
+            font_metrics = painter.fontMetrics()
+            if elide_width is None:
+                result = font_metrics.width(text)
+            else:
+                result = font_metrics.elidedText(text, Qt.ElideRight, elide_width)
+            if len(self._text_metrics) >= STATIC_TEXT_CACHE_SIZE:
+                self._text_metrics.clear()
+            self._text_metrics[key] = result
+        return result
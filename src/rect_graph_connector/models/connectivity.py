@@ -5,11 +5,27 @@ It provides functions for establishing connections between nodes
 in various patterns like 4-directional connections.
 """
 
+import math
 from typing import Dict, List, Tuple
 
+from ..config import config
+from ..utils.spatial_index import SpatialIndex
 from .graph import Graph
 from .rect_node import RectNode
 
+# Row and column offsets of the adjacent grid cells, in connection order.
+# Connections are symmetric, so only the cells after a node in row-major order
+# are probed: the cell above, to the left, and diagonally above are the ones
+# whose nodes already proposed the connection from their side.
+_NEIGHBOR_OFFSETS_4 = (
+    (1, 0),  # down
+    (0, 1),  # right
+)
+_NEIGHBOR_OFFSETS_8 = _NEIGHBOR_OFFSETS_4 + (
+    (1, -1),  # down-left
+    (1, 1),  # down-right
+)
+
 
 def connect_nodes_in_4_directions(graph: Graph, nodes: List[RectNode]) -> None:
     """
@@ -26,52 +42,7 @@ def connect_nodes_in_4_directions(graph: Graph, nodes: List[RectNode]) -> None:
         graph (Graph): The graph where connections will be added
         nodes (List[RectNode]): The list of nodes to connect
     """
-    if not nodes:
-        return
-
-    # Create a grid structure: store nodes with row and col as keys
-    grid = {}
-    # Create a mapping of nodes to their groups
-    node_to_group = {}
-
-    # Populate node_to_group mapping
-    for node in nodes:
-        grid[(node.row, node.col)] = node
-        # Find the group this node belongs to
-        group = graph.get_group_for_node(node)
-        if group:
-            node_to_group[node.id] = group.id
-
-    # For each node, connect to adjacent nodes in four directions (up, down, left, right)
-    for node in nodes:
-        # Get the group of the current node
-        node_group_id = node_to_group.get(node.id)
-
-        # Skip nodes that don't belong to any group
-        if node_group_id is None:
-            continue
-
-        # Calculate the coordinates of adjacent cells in four directions
-        neighbors = [
-            (node.row - 1, node.col),  # up
-            (node.row + 1, node.col),  # down
-            (node.row, node.col - 1),  # left
-            (node.row, node.col + 1),  # right
-        ]
-
-        # Connect with adjacent nodes
-        for neighbor_pos in neighbors:
-            if neighbor_pos in grid:
-                neighbor_node = grid[neighbor_pos]
-                neighbor_group_id = node_to_group.get(neighbor_node.id)
-
-                # Only connect if both nodes belong to the same group
-                if (
-                    neighbor_group_id is not None
-                    and node_group_id == neighbor_group_id
-                    and not graph.has_edge(node, neighbor_node)
-                ):
-                    graph.add_edge(node, neighbor_node)
+    _connect_grid_neighbors(graph, nodes, _NEIGHBOR_OFFSETS_4)
 
 
 def connect_nodes_in_8_directions(graph: Graph, nodes: List[RectNode]) -> None:
@@ -89,59 +60,66 @@ def connect_nodes_in_8_directions(graph: Graph, nodes: List[RectNode]) -> None:
         graph (Graph): The graph where connections will be added
         nodes (List[RectNode]): The list of nodes to connect
     """
-    if not nodes:
-        return
+    _connect_grid_neighbors(graph, nodes, _NEIGHBOR_OFFSETS_8)
 
-    # Create a grid structure: store nodes with row and col as keys
-    grid = {}
-    # Create a mapping of nodes to their groups
-    node_to_group = {}
 
-    # Populate node_to_group mapping
-    for node in nodes:
-        grid[(node.row, node.col)] = node
-        # Find the group this node belongs to
-        group = graph.get_group_for_node(node)
-        if group:
-            node_to_group[node.id] = group.id
+def _connect_grid_neighbors(
+    graph: Graph, nodes: List[RectNode], offsets: Tuple[Tuple[int, int], ...]
+) -> None:
+    """
+    Connect each node to the nodes of the same group in the adjacent grid cells.
 
-    # For each node, connect to adjacent nodes in eight directions
-    for node in nodes:
-        # Get the group of the current node
-        node_group_id = node_to_group.get(node.id)
+    Args:
+        graph (Graph): The graph where connections will be added
+        nodes (List[RectNode]): The list of nodes to connect
+        offsets (Tuple[Tuple[int, int], ...]): (row, col) offsets of the adjacent
+            cells, each at most one row and one column away
+    """
+    if not nodes:
+        return
 
-        # Skip nodes that don't belong to any group
-        if node_group_id is None:
-            continue
+    # Look up each node's group in the graph's cached map, instead of
+    # searching the groups for every node
+    groups_by_node_id = graph.groups_by_node_id
 
-        # Calculate the coordinates of adjacent cells in eight directions
-        neighbors = [
-            (node.row - 1, node.col),  # up
-            (node.row + 1, node.col),  # down
-            (node.row, node.col - 1),  # left
-            (node.row, node.col + 1),  # right
-            (node.row - 1, node.col - 1),  # up-left
-            (node.row - 1, node.col + 1),  # up-right
-            (node.row + 1, node.col - 1),  # down-left
-            (node.row + 1, node.col + 1),  # down-right
+    # Bucket the grouped nodes by group, so that nodes of different groups
+    # sharing a row and col do not replace each other and neighbors are always
+    # from the same group
+    nodes_by_group = {}
+    for node in nodes:
+        group = groups_by_node_id.get(node.id)
+        if group is not None:
+            nodes_by_group.setdefault(group.id, []).append(node)
+
+    # Collect the connections first and add them in one batch, which checks
+    # them against a single set of the existing edges
+    node_pairs = []
+
+    for group_nodes in nodes_by_group.values():
+        # Create a grid structure: a flat list covering the group's rows and
+        # columns plus a border of empty cells, indexed by row * stride + col.
+        # Neighbors are then found by adding a fixed index offset, without
+        # hashing (row, col) tuples; the border keeps every offset in range.
+        row_min = min(node.row for node in group_nodes) - 1
+        col_min = min(node.col for node in group_nodes) - 1
+        height = max(node.row for node in group_nodes) - row_min + 2
+        stride = max(node.col for node in group_nodes) - col_min + 2
+        grid = [None] * (height * stride)
+        for node in group_nodes:
+            grid[(node.row - row_min) * stride + node.col - col_min] = node
+        index_offsets = [
+            row_offset * stride + col_offset for row_offset, col_offset in offsets
         ]
 
-        # Connect with adjacent nodes
-        for neighbor_pos in neighbors:
-            if neighbor_pos in grid:
-                neighbor_node = grid[neighbor_pos]
-                neighbor_group_id = node_to_group.get(neighbor_node.id)
-
-                # Only connect if both nodes belong to the same group
-                if (
-                    neighbor_group_id is not None
-                    and node_group_id == neighbor_group_id
-                    and not graph.has_edge(node, neighbor_node)
-                ):
-                    graph.add_edge(node, neighbor_node)
+        # For each node, connect to adjacent nodes in the given directions
+        for node in group_nodes:
+            index = (node.row - row_min) * stride + node.col - col_min
+            for index_offset in index_offsets:
+                neighbor_node = grid[index + index_offset]
+                if neighbor_node is not None:
+                    node_pairs.append((node, neighbor_node))
 
-
-from ..config import config
+    graph.add_edges(node_pairs)
 
 
 def delete_edge_at_position(
@@ -173,37 +151,43 @@ def delete_edge_at_position(
     # Get default thresholds from configuration file
     if threshold is None:
         threshold = config.get_dimension("edge.detection_threshold", 10.0)
-    # Find the closest edge
+    # Find the closest edge. The visible segments of all edges are computed
+    # in one batch first, so the distance loop only does arithmetic on
+    # precomputed coordinates
+    # Squared distances order the edges the same way, so the square root is
+    # never taken
     closest_edge = None
-    min_distance = float("inf")
-
-    for source_id, target_id in graph.edges:
-        # Get source and target nodes
-        source_node = None
-        target_node = None
-
-        try:
-            source_node = next(n for n in graph.nodes if n.id == source_id)
-            target_node = next(n for n in graph.nodes if n.id == target_id)
-        except StopIteration:
+    min_distance_sq = float("inf")
+
+    # Only edges whose bounding box lies within the threshold of the point can
+    # be deleted, so the distance is computed for those alone
+    min_x = px - threshold
+    max_x = px + threshold
+    min_y = py - threshold
+    max_y = py + threshold
+
+    for edge, (start_x, start_y, end_x, end_y) in get_edge_segments(graph):
+        if start_x < end_x:
+            if end_x < min_x or start_x > max_x:
+                continue
+        elif start_x < min_x or end_x > max_x:
+            continue
+        if start_y < end_y:
+            if end_y < min_y or start_y > max_y:
+                continue
+        elif start_y < min_y or end_y > max_y:
             continue
 
-        if source_node and target_node:
-            # Calculate actual edge endpoints considering node sizes
-            (start_x, start_y), (end_x, end_y) = calculate_edge_endpoints(
-                source_node, target_node
-            )
-
-            # Calculate distance from point to line segment (edge)
-            distance = point_to_line_distance(px, py, start_x, start_y, end_x, end_y)
+        # Calculate squared distance from point to line segment (edge)
+        distance_sq = point_to_line_distance_sq(px, py, start_x, start_y, end_x, end_y)
 
-            if distance < min_distance:
-                min_distance = distance
-                closest_edge = (source_id, target_id)
+        if distance_sq < min_distance_sq:
+            min_distance_sq = distance_sq
+            closest_edge = edge
 
     # Delete the edge if it's close enough
-    if closest_edge and min_distance <= threshold:
-        graph.edges.remove(closest_edge)
+    if closest_edge and min_distance_sq <= threshold * threshold:
+        graph.remove_edges([closest_edge])
         return True
 
     return False
@@ -223,22 +207,46 @@ def point_to_line_distance(
     Returns:
         float: The minimum distance from the point to the line segment
     """
+    return math.sqrt(point_to_line_distance_sq(px, py, x1, y1, x2, y2))
+
+
+def point_to_line_distance_sq(
+    px: float, py: float, x1: float, y1: float, x2: float, y2: float
+) -> float:
+    """
+    Calculate the squared minimum distance from a point to a line segment.
+
+    Use this instead of point_to_line_distance() when distances are only
+    compared with each other or with a squared threshold.
+
+    Args:
+        px, py: Point coordinates
+        x1, y1: Line segment start coordinates
+        x2, y2: Line segment end coordinates
+
+    Returns:
+        float: The squared minimum distance from the point to the line segment
+    """
+    dx = x2 - x1
+    dy = y2 - y1
     # Line length squared
-    line_length_sq = (x2 - x1) ** 2 + (y2 - y1) ** 2
+    line_length_sq = dx * dx + dy * dy
 
     # If the line is actually a point
     if line_length_sq == 0:
-        return ((px - x1) ** 2 + (py - y1) ** 2) ** 0.5
+        return (px - x1) * (px - x1) + (py - y1) * (py - y1)
 
-    # Calculate projection of point onto line
-    t = max(0, min(1, ((px - x1) * (x2 - x1) + (py - y1) * (y2 - y1)) / line_length_sq))
+    # Calculate projection of point onto line, clamped to the segment
+    t = ((px - x1) * dx + (py - y1) * dy) / line_length_sq
+    if t < 0:
+        t = 0.0
+    elif t > 1:
+        t = 1.0
 
-    # Calculate closest point on line segment
-    closest_x = x1 + t * (x2 - x1)
-    closest_y = y1 + t * (y2 - y1)
-
-    # Return distance to closest point
-    return ((px - closest_x) ** 2 + (py - closest_y) ** 2) ** 0.5
+    # Squared distance to the closest point on the line segment
+    offset_x = px - (x1 + t * dx)
+    offset_y = py - (y1 + t * dy)
+    return offset_x * offset_x + offset_y * offset_y
 
 
 def line_segments_intersect(
@@ -263,17 +271,34 @@ def line_segments_intersect(
     Returns:
         bool: True if the line segments intersect, False otherwise
     """
+    dx12 = x2 - x1
+    dy12 = y2 - y1
+    dx34 = x4 - x3
+    dy34 = y4 - y3
+
     # Calculate the denominator
-    denom = (y4 - y3) * (x2 - x1) - (x4 - x3) * (y2 - y1)
+    denom = dy34 * dx12 - dx34 * dy12
     if denom == 0:  # Lines are parallel
         return False
 
-    # Calculate ua and ub
-    ua = ((x4 - x3) * (y1 - y3) - (y4 - y3) * (x1 - x3)) / denom
-    ub = ((x2 - x1) * (y1 - y3) - (y2 - y1) * (x1 - x3)) / denom
+    # ua and ub lie in [0, 1] exactly when their numerators lie between 0 and
+    # denom, so compare the numerators instead of dividing. Flip the signs
+    # so denom is positive, and skip ub when ua already misses.
+    dx13 = x1 - x3
+    dy13 = y1 - y3
+    ua_num = dx34 * dy13 - dy34 * dx13
+    if denom < 0:
+        denom = -denom
+        if not 0 <= -ua_num <= denom:
+            return False
+        ub_num = dy12 * dx13 - dx12 * dy13
+    else:
+        if not 0 <= ua_num <= denom:
+            return False
+        ub_num = dx12 * dy13 - dy12 * dx13
 
     # Return true if the intersection is within both line segments
-    return (0 <= ua <= 1) and (0 <= ub <= 1)
+    return 0 <= ub_num <= denom
 
 
 def calculate_edge_endpoints(
@@ -289,25 +314,50 @@ def calculate_edge_endpoints(
     Returns:
         Tuple[Tuple[float, float], Tuple[float, float]]: ((start_x, start_y), (end_x, end_y))
     """
+    start_x, start_y, end_x, end_y = calculate_edge_segment(source_node, target_node)
+    return ((start_x, start_y), (end_x, end_y))
+
+
+def calculate_edge_segment(
+    source_node: RectNode, target_node: RectNode
+) -> Tuple[float, float, float, float]:
+    """
+    Calculate the visible segment of an edge as flat coordinates.
+
+    This is the single implementation of the edge endpoint math, shared by the
+    edge tools here and by the renderers.
+
+    Args:
+        source_node (RectNode): The source node
+        target_node (RectNode): The target node
+
+    Returns:
+        Tuple[float, float, float, float]: (start_x, start_y, end_x, end_y)
+    """
+    start_x = source_node.x
+    start_y = source_node.y
+    end_x = target_node.x
+    end_y = target_node.y
+
     # Calculate direction vector
-    dx = target_node.x - source_node.x
-    dy = target_node.y - source_node.y
+    dx = end_x - start_x
+    dy = end_y - start_y
     length = (dx * dx + dy * dy) ** 0.5
 
     if length == 0:
-        return ((source_node.x, source_node.y), (target_node.x, target_node.y))
+        return start_x, start_y, end_x, end_y
 
     # Normalize direction vector
     dx /= length
     dy /= length
 
     # Calculate actual endpoints considering node sizes
-    start_x = source_node.x + dx * source_node.size / 2
-    start_y = source_node.y + dy * source_node.size / 2
-    end_x = target_node.x - dx * target_node.size / 2
-    end_y = target_node.y - dy * target_node.size / 2
-
-    return ((start_x, start_y), (end_x, end_y))
+    return (
+        start_x + dx * source_node.size / 2,
+        start_y + dy * source_node.size / 2,
+        end_x - dx * target_node.size / 2,
+        end_y - dy * target_node.size / 2,
+    )
 
 
 def connect_all_for_one_edge_selection(
@@ -327,15 +377,93 @@ def connect_all_for_one_edge_selection(
     if not source_nodes or not target_node:
         return
 
-    # Create connections from each source node to the target node
-    for source_node in source_nodes:
-        # Skip self-connections
-        if source_node != target_node and not graph.has_edge(source_node, target_node):
-            graph.add_edge(source_node, target_node)
+    # Create connections from each source node to the target node. add_edges()
+    # skips self-connections and existing edges, checking them against one set
+    # of the existing edges instead of scanning the edge list per source node
+    graph.add_edges((source_node, target_node) for source_node in source_nodes)
+
+
+def get_edge_segments(
+    graph: Graph, target_groups=None
+) -> List[Tuple[Tuple[str, str], Tuple[float, float, float, float]]]:
+    """
+    Get the visible segment of every edge, for repeated intersection tests.
+
+    The segments only depend on the nodes, edges and target groups, so callers
+    that test many paths against an unchanged graph (like the knife tool while
+    a cut is being drawn) can compute them once and pass them to
+    find_intersecting_edges(). Without target groups, the graph's cached
+    Graph.edge_segments list is returned, which must not be modified.
+
+    Args:
+        graph (Graph): The graph containing the edges
+        target_groups (List, optional): List of target NodeGroups to filter edges by
+
+    Returns:
+        List[Tuple[Tuple[str, str], Tuple[float, float, float, float]]]: Pairs of
+            an edge tuple (source_id, target_id) and its segment
+            (start_x, start_y, end_x, end_y)
+    """
+    # The graph caches the segments of all edges until the edges or nodes
+    # change, so only the target group filter runs per call
+    if not target_groups:
+        return graph.edge_segments
+
+    # Resolve endpoint groups through the graph's node-to-group map and test
+    # them against a set, instead of searching the groups per endpoint
+    target_group_set = set(target_groups)
+    groups_by_node_id = graph.groups_by_node_id
+    return [
+        edge_segment
+        for edge_segment in graph.edge_segments
+        # Keep edges where at least one endpoint belongs to a target group
+        if groups_by_node_id.get(edge_segment[0][0]) in target_group_set
+        or groups_by_node_id.get(edge_segment[0][1]) in target_group_set
+    ]
+
+
+def build_edge_index(edge_segments) -> SpatialIndex:
+    """
+    Build a spatial index of edge segments for find_intersecting_edges().
+
+    Args:
+        edge_segments (List): Result of get_edge_segments()
+
+    Returns:
+        SpatialIndex: Index mapping positions in edge_segments to the bounding
+            boxes of their segments
+    """
+    bboxes = [
+        (
+            min(start_x, end_x),
+            min(start_y, end_y),
+            max(start_x, end_x),
+            max(start_y, end_y),
+        )
+        for _, (start_x, start_y, end_x, end_y) in edge_segments
+    ]
+    if bboxes:
+        extent = (
+            min(bbox[0] for bbox in bboxes),
+            min(bbox[1] for bbox in bboxes),
+            max(bbox[2] for bbox in bboxes),
+            max(bbox[3] for bbox in bboxes),
+        )
+    else:
+        extent = (0.0, 0.0, 0.0, 0.0)
+
+    edge_index = SpatialIndex(extent)
+    for position, bbox in enumerate(bboxes):
+        edge_index.insert(position, bbox)
+    return edge_index
 
 
 def find_intersecting_edges(
-    graph: Graph, path_points: List[Tuple[float, float]], target_groups=None
+    graph: Graph,
+    path_points: List[Tuple[float, float]],
+    target_groups=None,
+    edge_segments=None,
+    edge_index: SpatialIndex = None,
 ) -> List[Tuple[str, str]]:
     """
     Find all edges that intersect with a given path.
@@ -347,6 +475,11 @@ def find_intersecting_edges(
         graph (Graph): The graph containing the edges
         path_points (List[Tuple[float, float]]): List of points forming the path
         target_groups (List, optional): List of target NodeGroups to filter edges by
+        edge_segments (List, optional): Precomputed result of get_edge_segments()
+            for the same graph and target groups
+        edge_index (SpatialIndex, optional): Result of build_edge_index() for
+            edge_segments. When given, each path segment is only tested against
+            the edges whose bounding boxes it overlaps.
 
     Returns:
         List[Tuple[str, str]]: List of edge tuples (source_id, target_id) that intersect with the path
@@ -357,34 +490,46 @@ def find_intersecting_edges(
     if len(path_points) < 2:
         return intersecting_edges
 
-    # Check each edge against each path segment
-    for source_id, target_id in graph.edges:
-        # Get source and target nodes
-        try:
-            source_node = next(n for n in graph.nodes if n.id == source_id)
-            target_node = next(n for n in graph.nodes if n.id == target_id)
-        except StopIteration:
-            continue
-
-        # If target_groups is provided, check if at least one endpoint belongs to a target group
-        if target_groups:
-            source_group = graph.get_group_for_node(source_node)
-            target_group = graph.get_group_for_node(target_node)
-
-            # Skip this edge if neither endpoint belongs to a target group
-            if source_group not in target_groups and target_group not in target_groups:
-                continue
-
-        # Calculate actual edge endpoints considering node sizes
-        (start_x, start_y), (end_x, end_y) = calculate_edge_endpoints(
-            source_node, target_node
+    if edge_segments is None:
+        edge_segments = get_edge_segments(graph, target_groups)
+
+    # Pair up the path points once instead of re-reading them for every edge,
+    # along with the bounding box of each path segment
+    path_segments = [
+        (x1, y1, x2, y2, min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+        for (x1, y1), (x2, y2) in zip(path_points, path_points[1:])
+    ]
+
+    if edge_index is not None:
+        # Test each path segment against the nearby edges only, then report
+        # the hits in edge order like the full search below
+        hit_positions = set()
+        for x1, y1, x2, y2, *path_bbox in path_segments:
+            for position in edge_index.query(path_bbox):
+                if position not in hit_positions and line_segments_intersect(
+                    x1, y1, x2, y2, *edge_segments[position][1]
+                ):
+                    hit_positions.add(position)
+        return [edge_segments[position][0] for position in sorted(hit_positions)]
+
+    # Check each edge against each path segment. Segments can only intersect
+    # if their bounding boxes overlap, so most pairs are rejected by a few
+    # comparisons before the full intersection test.
+    for edge, (start_x, start_y, end_x, end_y) in edge_segments:
+        edge_min_x, edge_max_x = (
+            (start_x, end_x) if start_x < end_x else (end_x, start_x)
         )
-
-        # Check intersection with each path segment
-        for i in range(len(path_points) - 1):
-            x1, y1 = path_points[i]
-            x2, y2 = path_points[i + 1]
-
+        edge_min_y, edge_max_y = (
+            (start_y, end_y) if start_y < end_y else (end_y, start_y)
+        )
+        for x1, y1, x2, y2, min_x, min_y, max_x, max_y in path_segments:
+            if (
+                max_x < edge_min_x
+                or min_x > edge_max_x
+                or max_y < edge_min_y
+                or min_y > edge_max_y
+            ):
+                continue
             if line_segments_intersect(
                 x1,
                 y1,
@@ -395,7 +540,7 @@ def find_intersecting_edges(
                 end_x,
                 end_y,
             ):
-                intersecting_edges.append((source_id, target_id))
+                intersecting_edges.append(edge)
                 break  # One intersection is enough to mark this edge
 
     return intersecting_edges
@@ -2,7 +2,9 @@
 This module contains the Graph class which manages the graph structure and node groups.
 """
 
-from typing import Dict, List, Optional, Set, Tuple
+import math
+from operator import attrgetter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 from PyQt5.QtCore import QPointF
 
@@ -13,6 +15,7 @@ from ..utils.naming_utils import (
     generate_unique_name_if_needed,
     rename_node,
 )
+from ..utils.spatial_index import SpatialIndex
 from .rect_node import RectNode
 
 logger = get_logger(__name__)
@@ -36,6 +39,10 @@ class NodeGroup:
     POSITION_RIGHT = "right"
     POSITION_BOTTOM = "bottom"
 
+    # Incremented whenever the z-index of any group changes, so that cached
+    # z-orderings (see Graph.groups_by_z) can detect staleness
+    z_index_version = 0
+
     def __init__(
         self,
         name: str,
@@ -74,6 +81,20 @@ class NodeGroup:
             self.node_ids = []
             self._nodes_cache = None
 
+        # Memoized result of get_nodes() and the key it was computed for
+        self._get_nodes_result: List[RectNode] = []
+        self._get_nodes_key = None
+
+    @property
+    def z_index(self) -> int:
+        """Z-index for rendering order (higher values are rendered on top)."""
+        return self._z_index
+
+    @z_index.setter
+    def z_index(self, value: int) -> None:
+        self._z_index = value
+        NodeGroup.z_index_version += 1
+
     @property
     def nodes(self) -> List[RectNode]:
         """
@@ -92,13 +113,29 @@ class NodeGroup:
         """
         Get the nodes in this group from the full list of nodes.
 
+        The lookup is memoized on the node list, the group's node ID list, and
+        the global node version, so repeated calls between changes to the
+        graph only copy the previous result instead of scanning all nodes.
+
         Args:
             all_nodes (List[RectNode]): All nodes in the graph
 
         Returns:
             List[RectNode]: Nodes that belong to this group
         """
-        nodes = [node for node in all_nodes if node.id in self.node_ids]
+        key = (
+            id(all_nodes),
+            len(all_nodes),
+            id(self.node_ids),
+            len(self.node_ids),
+            RectNode.version,
+        )
+        if key != self._get_nodes_key:
+            # Hash the IDs once rather than scanning node_ids for every node
+            node_ids = set(self.node_ids)
+            self._get_nodes_result = [node for node in all_nodes if node.id in node_ids]
+            self._get_nodes_key = key
+        nodes = list(self._get_nodes_result)
         # Update cache
         self._nodes_cache = nodes
         return nodes
@@ -122,6 +159,7 @@ class Graph:
 
     def __init__(self):
         """Initialize an empty graph structure."""
+        self._edges_version = 0
         self.nodes: List[RectNode] = []
         self.edges: List[Tuple[int, int]] = []
         self.node_groups: List[NodeGroup] = []
@@ -130,6 +168,24 @@ class Graph:
         self.selected_groups: List[NodeGroup] = []
         self.next_group_number: int = 1
         self.next_z_index: int = 0  # Counter for assigning z-index values
+        self._groups_by_z: List[NodeGroup] = []
+        self._groups_by_z_key = None
+        self._selected_group_ids: frozenset = frozenset()
+        self._selected_group_ids_key = None
+        self._group_bounds: Dict[str, Tuple[float, float, float, float]] = {}
+        self._group_bounds_key = None
+        self._node_index: Optional[SpatialIndex] = None
+        self._node_index_key = None
+        self._edge_set: Set[Tuple[int, int]] = set()
+        self._edge_set_key = None
+        self._nodes_by_id: Dict[int, RectNode] = {}
+        self._nodes_by_id_key = None
+        self._groups_by_node_id: Dict[int, NodeGroup] = {}
+        self._groups_by_node_id_key = None
+        self._edge_segments: List[
+            Tuple[Tuple[int, int], Tuple[float, float, float, float]]
+        ] = []
+        self._edge_segments_key = None
 
     def add_node_group(
         self,
@@ -206,7 +262,7 @@ class Graph:
 
     def has_edge(self, source_node: RectNode, target_node: RectNode) -> bool:
         """
-        Check if there is an edge between two nodes.
+        Check if there is an edge between two nodes, in either direction.
 
         Args:
             source_node (RectNode): Source node of the edge
@@ -215,22 +271,11 @@ class Graph:
         Returns:
             bool: True if an edge exists between the nodes, False otherwise
         """
-        # Check for exact match
-        if (source_node.id, target_node.id) in self.edges:
-            return True
-
-        # Check for reverse match
-        if (target_node.id, source_node.id) in self.edges:
-            return True
-
-        # Check for duplicate edges with the same source and target
-        for src, tgt in self.edges:
-            if src == source_node.id and tgt == target_node.id:
-                return True
-            if src == target_node.id and tgt == source_node.id:
-                return True
-
-        return False
+        edge_set = self.edge_set
+        return (source_node.id, target_node.id) in edge_set or (
+            target_node.id,
+            source_node.id,
+        ) in edge_set
 
     def add_edge(self, source_node: RectNode, target_node: RectNode) -> None:
         """
@@ -241,7 +286,137 @@ class Graph:
             target_node (RectNode): Target node of the edge
         """
         if source_node != target_node and not self.has_edge(source_node, target_node):
-            self.edges.append((source_node.id, target_node.id))
+            edge = (source_node.id, target_node.id)
+            self.edges.append(edge)
+            self._edges_version += 1
+            # has_edge() just validated the edge set, so keep it valid
+            self._edge_set.add(edge)
+            self._edge_set_key = self._get_edge_set_key()
+
+    def add_edges(self, node_pairs: Iterable[Tuple[RectNode, RectNode]]) -> None:
+        """
+        Add edges between several pairs of nodes at once.
+
+        Follows the same rules as add_edge(), skipping self-connections and
+        edges that already exist in either direction, and extends the edge
+        list once for the whole batch.
+
+        Args:
+            node_pairs (Iterable[Tuple[RectNode, RectNode]]): (source, target) node pairs
+        """
+        existing_edges = self.edge_set
+        new_edges = []
+        for source_node, target_node in node_pairs:
+            if source_node == target_node:
+                continue
+            edge = (source_node.id, target_node.id)
+            if edge in existing_edges or (edge[1], edge[0]) in existing_edges:
+                continue
+            existing_edges.add(edge)
+            new_edges.append(edge)
+        self.edges.extend(new_edges)
+        self._edges_version += 1
+        self._edge_set_key = self._get_edge_set_key()
+
+    def remove_edges(self, edges: Iterable[Tuple[int, int]]) -> None:
+        """
+        Remove several edges at once.
+
+        The edge list is filtered in a single pass against a set of the edges
+        to remove, instead of being searched and shifted once per edge.
+
+        Args:
+            edges (Iterable[Tuple[int, int]]): (source_id, target_id) edges to remove
+        """
+        edges_to_remove = {(src, tgt) for src, tgt in edges}
+        if edges_to_remove:
+            self.edges = [
+                edge for edge in self.edges if (edge[0], edge[1]) not in edges_to_remove
+            ]
+
+    @property
+    def edges(self) -> List[Tuple[int, int]]:
+        """
+        The edges as a list of (source_id, target_id) tuples.
+
+        Assigning a new list bumps the edge version that the edge caches are
+        keyed on. Graph methods that change the list in place bump it too.
+        """
+        return self._edges
+
+    @edges.setter
+    def edges(self, edges: List[Tuple[int, int]]) -> None:
+        self._edges = edges
+        self._edges_version += 1
+
+    @property
+    def edge_set(self) -> Set[Tuple[int, int]]:
+        """
+        The edges as a set of (source_id, target_id) tuples.
+
+        The set is cached against the edge version together with the length
+        and last entry of the edge list. Graph methods bump the version on
+        every change, and the length and last entry also catch appends and
+        removals made directly on the list by other code.
+        The returned set is shared and must not be modified.
+
+        Returns:
+            Set[Tuple[int, int]]: The edges of the graph
+        """
+        key = self._get_edge_set_key()
+        if key != self._edge_set_key:
+            # Edges loaded from files may be lists, so normalize them to tuples
+            self._edge_set = {(src, tgt) for src, tgt in self.edges}
+            self._edge_set_key = key
+        return self._edge_set
+
+    def _get_edge_set_key(self) -> tuple:
+        """Get the cache key of edge_set for the current edge list."""
+        edges = self._edges
+        return (
+            self._edges_version,
+            len(edges),
+            tuple(edges[-1]) if edges else None,
+        )
+
+    @property
+    def edge_segments(
+        self,
+    ) -> List[Tuple[Tuple[int, int], Tuple[float, float, float, float]]]:
+        """
+        The visible segment of every edge whose nodes both exist.
+
+        The segments are cached against the edge list (like edge_set), the
+        node list and the global node version, so they are recomputed only
+        when edges change or nodes are added, removed, moved, or resized. The
+        returned list is shared and must not be modified.
+
+        Returns:
+            List[Tuple[Tuple[int, int], Tuple[float, float, float, float]]]:
+            Pairs of an edge tuple (source_id, target_id) and its segment
+            (start_x, start_y, end_x, end_y), in edge order
+        """
+        nodes = self.nodes
+        key = (self._get_edge_set_key(), id(nodes), len(nodes), RectNode.version)
+        if key != self._edge_segments_key:
+            from .connectivity import calculate_edge_segment
+
+            nodes_by_id = self.nodes_by_id
+            edge_segments = []
+            for source_id, target_id in self.edges:
+                source_node = nodes_by_id.get(source_id)
+                target_node = nodes_by_id.get(target_id)
+                if source_node is None or target_node is None:
+                    continue
+                edge_segments.append(
+                    (
+                        (source_id, target_id),
+                        calculate_edge_segment(source_node, target_node),
+                    )
+                )
+            self._edge_segments = edge_segments
+            self._edge_segments_key = key
+        return self._edge_segments
 
     def delete_group(self, group: NodeGroup) -> None:
         """
@@ -275,12 +450,12 @@ class Graph:
                 )
 
         # Only nodes belonging to a group that do not belong to another group are deleted.
-        nodes_to_delete = [
-            node for node in group_nodes if node.id not in node_ids_in_other_groups
-        ]
-        node_ids_to_delete = {node.id for node in nodes_to_delete}
+        # Nodes compare by ID, so the IDs alone identify them in the filters below.
+        node_ids_to_delete = {
+            node.id for node in group_nodes if node.id not in node_ids_in_other_groups
+        }
         logger.debug(
-            f"Will delete {len(nodes_to_delete)} nodes that don't belong to other groups"
+            f"Will delete {len(node_ids_to_delete)} nodes that don't belong to other groups"
         )
 
         # Remove edges connected to nodes that will be deleted
@@ -296,7 +471,7 @@ class Graph:
 
         # Remove only nodes that don't belong to any other group
         orig_node_count = len(self.nodes)
-        self.nodes = [node for node in self.nodes if node not in nodes_to_delete]
+        self.nodes = [node for node in self.nodes if node.id not in node_ids_to_delete]
         logger.debug(f"Removed {orig_node_count - len(self.nodes)} nodes")
 
         # Delete the group itself
@@ -406,7 +581,12 @@ class Graph:
                 node.y = group_center_y + rel_x
 
                 logger.debug(
-                    f"  Node {node.id}: ({orig_x:.2f}, {orig_y:.2f}) -> ({node.x:.2f}, {node.y:.2f})"
+                    "  Node %s: (%.2f, %.2f) -> (%.2f, %.2f)",
+                    node.id,
+                    orig_x,
+                    orig_y,
+                    node.x,
+                    node.y,
                 )
 
     def import_graph(self, data: Dict, mode: str = "force") -> None:
@@ -525,6 +705,7 @@ class Graph:
             if mapped_src is not None and mapped_dst is not None:
                 if (mapped_src, mapped_dst) not in self.edges:
                     self.edges.append((mapped_src, mapped_dst))
+                    self._edges_version += 1
 
         # 5. Process groups that haven't been handled in step 2
         for group_data in data.get("groups", []):
@@ -696,23 +877,17 @@ class Graph:
         incoming_groups = data.get("groups", [])
         existing_group_names = {g.name for g in self.node_groups}
         group_name_mapping = {}  # Original name -> Final name
-        group_order = []  # Maintain original order of groups
 
-        # Create a mapping of base names to their groups for proper ordering
+        # Create a mapping of base names to their groups for proper ordering.
+        # Groups are appended in file order, so each bucket is already sorted
+        # and needs no further ordering pass.
         base_name_groups = {}
         for grp in incoming_groups:
-            original_name = grp.get("name", "")
-            base_name = original_name.split("(")[0]
-            if base_name not in base_name_groups:
-                base_name_groups[base_name] = []
-            base_name_groups[base_name].append(grp)
-            group_order.append(original_name)
+            base_name = grp.get("name", "").split("(")[0]
+            base_name_groups.setdefault(base_name, []).append(grp)
 
         # Assign new names while preserving order relationships
-        for base_name, groups in base_name_groups.items():
-            # Sort groups by their original order in the file
-            groups.sort(key=lambda g: group_order.index(g.get("name", "")))
-
+        for groups in base_name_groups.values():
             for grp in groups:
                 original_name = grp.get("name", "")
                 if (
@@ -731,9 +906,8 @@ class Graph:
 
         # Second pass: Create groups maintaining original order
         new_node_groups = []
-        for original_name in group_order:
-            grp = next(g for g in incoming_groups if g.get("name", "") == original_name)
-            grp["name"] = group_name_mapping[original_name]
+        for grp in incoming_groups:
+            grp["name"] = group_name_mapping[grp.get("name", "")]
 
             # Update node IDs (apply new mapping)
             if "node_ids" in grp:
@@ -760,6 +934,7 @@ class Graph:
         # Add nodes and edges
         self.nodes.extend(incoming_nodes)
         self.edges.extend(incoming_edges)
+        self._edges_version += 1
 
     def _create_group_from_dict(
         self, group_data: Dict, no_append: bool = False
@@ -822,6 +997,7 @@ class Graph:
         """Reset the graph to its initial empty state."""
         self.nodes.clear()
         self.edges.clear()
+        self._edges_version += 1
         self.node_groups.clear()
         self.group_map.clear()  # Also clear group map
         self.selected_nodes.clear()
@@ -935,12 +1111,17 @@ class Graph:
         # Start from the configured starting index
         new_id = config.node_id_start
 
-        # Assign an ID first to a node belonging to a group
+        # Assign an ID first to a node belonging to a group. Every node listed
+        # in node_groups_by_id is one of self.nodes, so membership is checked
+        # by memory address rather than by scanning the node list.
         processed_nodes = set()  # Track processed nodes by memory address
         for group in self.node_groups:
             for node in node_groups_by_id.get(group.id, []):
                 node_addr = id(node)  # Use memory address as unique identifier
-                if node_addr not in processed_nodes and node in self.nodes:
+                if (
+                    node_addr not in processed_nodes
+                    and node_addr in node_by_memory_addr
+                ):
                     old_id = node.id
                     node.id = new_id
                     old_to_new_id[old_id] = new_id
@@ -977,7 +1158,9 @@ class Graph:
             # Get nodes belonging to this group
             nodes_in_group = node_groups_by_id.get(group.id, [])
             # Update node_ids with the new ID of the node object
-            group.node_ids = [node.id for node in nodes_in_group if node in self.nodes]
+            group.node_ids = [
+                node.id for node in nodes_in_group if id(node) in node_by_memory_addr
+            ]
 
         # Check if all groups and edges refer to actual nodes
         valid_node_ids = {node.id for node in self.nodes}
@@ -1156,6 +1339,7 @@ class Graph:
         for old_src, old_dst in copied_data["edges"]:
             if old_src in old_to_new_id and old_dst in old_to_new_id:
                 self.edges.append((old_to_new_id[old_src], old_to_new_id[old_dst]))
+                self._edges_version += 1
 
         return new_groups
 
@@ -1190,6 +1374,106 @@ class Graph:
             f"Brought group '{group.name}' to front with z-index {group.z_index}"
         )
 
+    @property
+    def groups_by_z(self) -> List[NodeGroup]:
+        """
+        Node groups sorted by z-index (lowest to highest).
+
+        The sorted list is cached and only re-sorted when a group is added,
+        removed, or reordered, or when any group's z-index changes. The returned
+        list is shared and must not be modified.
+
+        Returns:
+            List[NodeGroup]: Groups sorted by z-index
+        """
+        key = (tuple(map(id, self.node_groups)), NodeGroup.z_index_version)
+        if key != self._groups_by_z_key:
+            self._groups_by_z = sorted(self.node_groups, key=attrgetter("z_index"))
+            self._groups_by_z_key = key
+        return self._groups_by_z
+
+    @property
+    def selected_group_ids(self) -> frozenset:
+        """
+        IDs of the currently selected groups.
+
+        selected_groups is reassigned and mutated in place throughout the GUI,
+        so the set is cached against the IDs of the selected groups and rebuilt
+        only when the selection actually changes. Group IDs are unique, unlike
+        object addresses, which a deleted group can pass on to a new one.
+
+        Returns:
+            frozenset: IDs of the selected groups
+        """
+        key = tuple(group.id for group in self.selected_groups)
+        if key != self._selected_group_ids_key:
+            self._selected_group_ids = frozenset(key)
+            self._selected_group_ids_key = key
+        return self._selected_group_ids
+
+    @property
+    def group_bounds(self) -> Dict[str, Tuple[float, float, float, float]]:
+        """
+        Bounding boxes of all node groups, keyed by group ID.
+
+        All bounds are computed together in a single pass over the nodes, so
+        the cost is linear in the number of nodes rather than in nodes times
+        groups. The result is cached until a node is added, removed, moved, or
+        resized, or until group membership changes. Groups without nodes are
+        omitted. The returned dict is shared and must not be modified.
+
+        Returns:
+            Dict[str, Tuple[float, float, float, float]]: (min_x, min_y, max_x,
+            max_y) of each non-empty group
+        """
+        key = (
+            RectNode.version,
+            id(self.nodes),
+            len(self.nodes),
+            tuple(
+                (group.id, id(group.node_ids), len(group.node_ids))
+                for group in self.node_groups
+            ),
+        )
+        if key == self._group_bounds_key:
+            return self._group_bounds
+
+        # Map each node ID to the bounds of the groups containing it
+        bounds_by_node_id = {}
+        group_bounds = {}
+        for group in self.node_groups:
+            bounds = [math.inf, math.inf, -math.inf, -math.inf]
+            group_bounds[group.id] = bounds
+            for node_id in group.node_ids:
+                bounds_by_node_id.setdefault(node_id, []).append(bounds)
+
+        for node in self.nodes:
+            node_bounds = bounds_by_node_id.get(node.id)
+            if node_bounds is None:
+                continue
+            half_size = node.size / 2
+            left = node.x - half_size
+            top = node.y - half_size
+            right = node.x + half_size
+            bottom = node.y + half_size
+            for bounds in node_bounds:
+                if left < bounds[0]:
+                    bounds[0] = left
+                if top < bounds[1]:
+                    bounds[1] = top
+                if right > bounds[2]:
+                    bounds[2] = right
+                if bottom > bounds[3]:
+                    bounds[3] = bottom
+
+        self._group_bounds = {
+            group_id: tuple(bounds)
+            for group_id, bounds in group_bounds.items()
+            if bounds[0] != math.inf
+        }
+        self._group_bounds_key = key
+        return self._group_bounds
+
     def get_groups_by_z_index(self) -> List[NodeGroup]:
         """
         Get node groups sorted by z-index (lowest to highest).
@@ -1198,7 +1482,7 @@ class Graph:
         Returns:
             List[NodeGroup]: Groups sorted by z-index
         """
-        return sorted(self.node_groups, key=lambda g: g.z_index)
+        return list(self.groups_by_z)
 
     def find_node_at_position(self, point: QPointF) -> Optional[RectNode]:
         """
@@ -1211,24 +1495,115 @@ class Graph:
         Returns:
             Optional[RectNode]: The node at the position, or None if no node is found
         """
-        # First, sort groups by z-index by descending order (highest value = first from the front)
-        sorted_groups = sorted(self.node_groups, key=lambda g: g.z_index, reverse=True)
+        x, y = point.x(), point.y()
+        candidates = [
+            node
+            for node in self.find_nodes_in_area(x, y, x, y)
+            if node.contains_point(x, y)
+        ]
+        if not candidates:
+            return None
 
-        # Find nodes from the group on the front
-        for group in sorted_groups:
-            group_nodes = group.get_nodes(self.nodes)
-            for node in group_nodes:
-                if node.contains(point):
+        # Find nodes from the group on the front (highest z-index first)
+        for group in reversed(self.groups_by_z):
+            for node in candidates:
+                if node.id in group.node_ids:
                     return node
 
         # Find nodes that do not belong to a group (final search)
-        for node in self.nodes:
-            if not any(node.id in group.node_ids for group in self.node_groups):
-                if node.contains(point):
-                    return node
+        grouped_ids = set().union(*(group.node_ids for group in self.node_groups))
+        for node in candidates:
+            if node.id not in grouped_ids:
+                return node
 
         return None
 
+    def find_nodes_in_area(
+        self, min_x: float, min_y: float, max_x: float, max_y: float
+    ) -> List[RectNode]:
+        """
+        Find the nodes whose rectangles overlap an area, using the spatial index.
+
+        Nodes are returned in graph order, so callers that pick the first match
+        resolve ties the same way as a full scan of the node list.
+
+        Args:
+            min_x (float): Left edge of the area
+            min_y (float): Top edge of the area
+            max_x (float): Right edge of the area
+            max_y (float): Bottom edge of the area
+
+        Returns:
+            List[RectNode]: Nodes overlapping or touching the area
+        """
+        nodes = self.nodes
+        positions = self._get_node_index().query((min_x, min_y, max_x, max_y))
+        return [nodes[position] for position in sorted(positions)]
+
+    @property
+    def nodes_by_id(self) -> Dict[int, RectNode]:
+        """
+        Map from node ID to node.
+
+        The map is keyed on the node list and the global node version, so it
+        is rebuilt only when nodes are added or removed or a node's ID
+        changes. The returned dict is shared and must not be modified.
+
+        Returns:
+            Dict[int, RectNode]: Nodes keyed by node ID
+        """
+        nodes = self.nodes
+        key = (id(nodes), len(nodes), RectNode.version)
+        if key != self._nodes_by_id_key:
+            self._nodes_by_id = {node.id: node for node in nodes}
+            self._nodes_by_id_key = key
+        return self._nodes_by_id
+
+    def _get_node_index(self) -> SpatialIndex:
+        """
+        Get the spatial index of node rectangles, rebuilding it if stale.
+
+        The index is keyed on the node list and the global node version, so
+        adding, removing, moving, or resizing nodes invalidates it.
+
+        Returns:
+            SpatialIndex: Index mapping node positions in self.nodes to their
+            bounding boxes
+        """
+        nodes = self.nodes
+        key = (id(nodes), len(nodes), RectNode.version)
+        if self._node_index is not None and key == self._node_index_key:
+            return self._node_index
+
+        bboxes = []
+        for node in nodes:
+            half_size = node.size / 2
+            bboxes.append(
+                (
+                    node.x - half_size,
+                    node.y - half_size,
+                    node.x + half_size,
+                    node.y + half_size,
+                )
+            )
+        if bboxes:
+            extent = (
+                min(b[0] for b in bboxes),
+                min(b[1] for b in bboxes),
+                max(b[2] for b in bboxes),
+                max(b[3] for b in bboxes),
+            )
+        else:
+            extent = (0.0, 0.0, 0.0, 0.0)
+
+        index = SpatialIndex(extent)
+        for position, bbox in enumerate(bboxes):
+            index.insert(position, bbox)
+
+        self._node_index = index
+        self._node_index_key = key
+        return index
+
     def get_group_for_node(self, node: RectNode) -> Optional[NodeGroup]:
         """
         Find the group containing the given node.
@@ -1242,10 +1617,38 @@ class Graph:
         if node is None:
             return None
 
-        for group in self.node_groups:
-            if node.id in group.node_ids:
-                return group
-        return None
+        return self.groups_by_node_id.get(node.id)
+
+    @property
+    def groups_by_node_id(self) -> Dict[int, NodeGroup]:
+        """
+        Map from node ID to the group containing the node.
+
+        A node in several groups maps to the first one in the group list. The
+        map is keyed on the global node version and on the ID of each group and
+        the identity and length of its node ID list, so it is rebuilt when
+        groups are added, removed, or reordered, their membership changes, or
+        node IDs are reassigned. The returned dict is shared and must not be
+        modified.
+
+        Returns:
+            Dict[int, NodeGroup]: Groups keyed by the IDs of their nodes
+        """
+        key = (
+            RectNode.version,
+            tuple(
+                (group.id, id(group.node_ids), len(group.node_ids))
+                for group in self.node_groups
+            ),
+        )
+        if key != self._groups_by_node_id_key:
+            groups_by_node_id = {}
+            for group in self.node_groups:
+                for node_id in group.node_ids:
+                    groups_by_node_id.setdefault(node_id, group)
+            self._groups_by_node_id = groups_by_node_id
+            self._groups_by_node_id_key = key
+        return self._groups_by_node_id
 
     def create_node_group(
         self, nodes: List[RectNode], name: Optional[str] = None
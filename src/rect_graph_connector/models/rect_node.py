@@ -2,9 +2,12 @@
 This module contains the RectNode class which represents a rectangular node in the graph.
 """
 
-from dataclasses import dataclass
+import logging
+import uuid
+from dataclasses import dataclass, field
+from typing import ClassVar
 
-from PyQt5.QtCore import QPointF
+from PyQt5.QtCore import QPointF, QRect, QRectF
 
 from ..config import config
 from ..utils.logging_utils import get_logger
@@ -12,11 +15,15 @@ from ..utils.logging_utils import get_logger
 logger = get_logger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class RectNode:
     """
     A class representing a rectangular node in the graph.
 
+    Nodes use __slots__ instead of a per-instance __dict__, which keeps large
+    graphs smaller in memory and makes attribute access in drawing and hit
+    testing loops cheaper.
+
     Attributes:
         id (int): Unique identifier for the node
         x (float): X-coordinate of the node's center
@@ -32,18 +39,43 @@ class RectNode:
     row: int = 0  # Default value for backward compatibility
     col: int = 0  # Default value for backward compatibility
     size: float = None
+    _rect_cache: object = field(default=None, init=False, repr=False, compare=False)
+    _hash: int = field(default=None, init=False, repr=False, compare=False)
+
+    # Incremented whenever the position, size, or ID of any node changes, so
+    # that caches built from nodes (e.g. spatial indexes, recorded paint
+    # commands) can detect staleness
+    version: ClassVar[int] = 0
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in ("x", "y", "size", "id"):
+            RectNode.version += 1
+            object.__setattr__(self, "_rect_cache", None)
+            if name == "id":
+                object.__setattr__(self, "_hash", hash(value))
 
     def __post_init__(self):
         """Initialize default values from configuration if not provided."""
-        # Generate a unique ID if none is provided
+        # Generate a unique ID if none is provided. Nodes created by the graph
+        # always get sequential integer IDs (see Graph.add_node_group), so
+        # this string fallback never ends up in the hashed edge lookups; a
+        # counter here could collide with those graph-assigned IDs
         if self.id is None:
-            import uuid
-
             self.id = str(uuid.uuid4())
-
-        logger.debug(
-            f"DEBUG: RectNode.__post_init__ called with id={self.id}, x={self.x}, y={self.y}, row={self.row}, col={self.col}, size={self.size}"
-        )
+        # The dataclass __init__ resets _hash after assigning the ID
+        object.__setattr__(self, "_hash", hash(self.id))
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "RectNode.__post_init__ called with id=%s, x=%s, y=%s, row=%s, col=%s, size=%s",
+                self.id,
+                self.x,
+                self.y,
+                self.row,
+                self.col,
+                self.size,
+            )
         if self.size is None:
             self.size = config.get_dimension("node.default_size", 30.0)
 
@@ -57,21 +89,50 @@ class RectNode:
         Returns:
             bool: True if the point is within the node's boundaries, False otherwise
         """
+        half_size = self.size / 2
         return (
-            abs(self.x - point.x()) <= self.size / 2
-            and abs(self.y - point.y()) <= self.size / 2
+            abs(self.x - point.x()) <= half_size
+            and abs(self.y - point.y()) <= half_size
         )
 
+    def get_rect(self):
+        """
+        Get the node's bounding rectangle.
+
+        The rectangle is cached until the node is moved or resized. An integer
+        QRect is returned when all edges fall on whole coordinates, since Qt's
+        raster engine fills those faster; otherwise a QRectF is returned. The
+        returned object is shared and must not be modified.
+
+        Returns:
+            QRect or QRectF: The node's bounding rectangle
+        """
+        rect = self._rect_cache
+        if rect is None:
+            left = self.x - self.size / 2
+            top = self.y - self.size / 2
+            if left.is_integer() and top.is_integer() and float(self.size).is_integer():
+                rect = QRect(int(left), int(top), int(self.size), int(self.size))
+            else:
+                rect = QRectF(left, top, self.size, self.size)
+            object.__setattr__(self, "_rect_cache", rect)
+        return rect
+
     def move(self, dx: float, dy: float) -> None:
         """
         Move the node by the specified delta values.
 
+        Both coordinates are written directly and the version is bumped once,
+        instead of going through __setattr__ for each coordinate.
+
         Args:
             dx (float): Change in x-coordinate
             dy (float): Change in y-coordinate
         """
-        self.x += dx
-        self.y += dy
+        object.__setattr__(self, "x", self.x + dx)
+        object.__setattr__(self, "y", self.y + dy)
+        object.__setattr__(self, "_rect_cache", None)
+        RectNode.version += 1
 
     def to_dict(self) -> dict:
         """
@@ -100,7 +161,7 @@ class RectNode:
         Returns:
             RectNode: A new RectNode instance
         """
-        logger.debug(f"DEBUG: RectNode.from_dict called with data={data}")
+        logger.debug("RectNode.from_dict called with data=%s", data)
 
         # Handle missing keys with default values
         node_id = data.get("id", str(id(data)))  # Use object id if no id provided
@@ -134,7 +195,8 @@ class RectNode:
         Returns:
             bool: True if the point is within the node's boundaries, False otherwise
         """
-        return abs(self.x - x) <= self.size / 2 and abs(self.y - y) <= self.size / 2
+        half_size = self.size / 2
+        return abs(self.x - x) <= half_size and abs(self.y - y) <= half_size
 
     def __eq__(self, other):
         """
@@ -154,7 +216,11 @@ class RectNode:
         """
         Hash function for RectNode based on its ID.
 
+        The hash is computed when the ID is assigned, since nodes are hashed
+        far more often (edge and selection sets, dict keys) than their IDs
+        change.
+
         Returns:
             int: Hash value
         """
-        return hash(self.id)
+        return self._hash
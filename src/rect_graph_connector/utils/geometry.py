@@ -70,12 +70,9 @@ class GeometryCalculator:
         Returns:
             float: The distance between the points
         """
-        print(f"Calculating distance between {point1} and {point2}")
         dx = point2.x - point1.x
         dy = point2.y - point1.y
-        result = math.sqrt(dx * dx + dy * dy)
-        print(f"Distance result: {result}")
-        return result
+        return math.sqrt(dx * dx + dy * dy)
 
     @staticmethod
     def calculate_center(points: list[Point]) -> Point:
@@ -0,0 +1,140 @@
+"""
+This module provides a quadtree spatial index for axis-aligned bounding boxes.
+"""
+
+from typing import Dict, Hashable, List, Tuple
+
+# Bounding box as (min_x, min_y, max_x, max_y)
+BBox = Tuple[float, float, float, float]
+
+
+def _intersects(a: BBox, b: BBox) -> bool:
+    """Check whether two bounding boxes overlap (touching counts as overlap)."""
+    return a[0] <= b[2] and a[2] >= b[0] and a[1] <= b[3] and a[3] >= b[1]
+
+
+def _contains(outer: BBox, inner: BBox) -> bool:
+    """Check whether the outer bounding box fully contains the inner one."""
+    return (
+        outer[0] <= inner[0]
+        and outer[1] <= inner[1]
+        and outer[2] >= inner[2]
+        and outer[3] >= inner[3]
+    )
+
+
+class _QuadNode:
+    """A single quadtree cell holding items and up to four children."""
+
+    __slots__ = ("bbox", "depth", "items", "children")
+
+    def __init__(self, bbox: BBox, depth: int):
+        self.bbox = bbox
+        self.depth = depth
+        self.items: Dict[Hashable, BBox] = {}
+        self.children: List["_QuadNode"] = []
+
+    def split(self):
+        """Create the four child cells of this node."""
+        min_x, min_y, max_x, max_y = self.bbox
+        mid_x = (min_x + max_x) / 2
+        mid_y = (min_y + max_y) / 2
+        depth = self.depth + 1
+        self.children = [
+            _QuadNode((min_x, min_y, mid_x, mid_y), depth),
+            _QuadNode((mid_x, min_y, max_x, mid_y), depth),
+            _QuadNode((min_x, mid_y, mid_x, max_y), depth),
+            _QuadNode((mid_x, mid_y, max_x, max_y), depth),
+        ]
+
+
+class SpatialIndex:
+    """
+    A quadtree of item bounding boxes supporting rectangle queries.
+
+    Items that straddle a cell boundary are kept in the smallest cell that fully
+    contains them, so every item is stored exactly once. Items outside the root
+    bounds are kept at the root and are still returned by queries.
+
+    The index is insert-only: callers build a new index when their items
+    change, and each item must be inserted only once.
+
+    Attributes:
+        bbox (BBox): The area covered by the root cell
+        max_items (int): Number of items a cell holds before it is split
+        max_depth (int): Maximum depth of the tree
+    """
+
+    def __init__(self, bbox: BBox, max_items: int = 16, max_depth: int = 8):
+        """
+        Initialize an empty index.
+
+        Args:
+            bbox (BBox): The area covered by the root cell
+            max_items (int): Number of items a cell holds before it is split
+            max_depth (int): Maximum depth of the tree
+        """
+        self.bbox = bbox
+        self.max_items = max_items
+        self.max_depth = max_depth
+        self._root = _QuadNode(bbox, 0)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def insert(self, item: Hashable, bbox: BBox) -> None:
+        """
+        Insert an item with the given bounding box.
+
+        Args:
+            item (Hashable): The item to store
+            bbox (BBox): The item's bounding box as (min_x, min_y, max_x, max_y)
+        """
+        node = self._root
+        while True:
+            if node.children:
+                for child in node.children:
+                    if _contains(child.bbox, bbox):
+                        node = child
+                        break
+                else:
+                    break
+                continue
+
+            if len(node.items) < self.max_items or node.depth >= self.max_depth:
+                break
+
+            # Split the full leaf and push its items down where they fit
+            node.split()
+            for other, other_bbox in list(node.items.items()):
+                for child in node.children:
+                    if _contains(child.bbox, other_bbox):
+                        del node.items[other]
+                        child.items[other] = other_bbox
+                        break
+
+        node.items[item] = bbox
+        self._size += 1
+
+    def query(self, bbox: BBox) -> list:
+        """
+        Find all items whose bounding box overlaps the given one.
+
+        Args:
+            bbox (BBox): The query rectangle as (min_x, min_y, max_x, max_y)
+
+        Returns:
+            list: The overlapping items, in no particular order
+        """
+        result = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            for item, item_bbox in node.items.items():
+                if _intersects(item_bbox, bbox):
+                    result.append(item)
+            for child in node.children:
+                if _intersects(child.bbox, bbox):
+                    stack.append(child)
+        return result
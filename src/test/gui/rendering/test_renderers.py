@@ -3,14 +3,21 @@ Tests for the rendering components with fixes for PyQt initialization.
 """
 
 import pytest
-from PyQt5.QtCore import QPointF, QRectF, Qt
-from PyQt5.QtGui import QColor, QPainter
+from PyQt5.QtCore import QPointF, QRect, QRectF, Qt
+from PyQt5.QtGui import QColor, QFont, QImage, QPainter, QPicture
 from PyQt5.QtWidgets import QWidget
 
-from rect_graph_connector.gui.rendering.base_renderer import BaseRenderer
+from rect_graph_connector.gui.rendering.base_renderer import (
+    BaseRenderer,
+    cached_color,
+    parse_rgba,
+)
+from rect_graph_connector.config import config
+from rect_graph_connector.gui.rendering.border_renderer import BorderRenderer
 from rect_graph_connector.gui.rendering.composite_renderer import CompositeRenderer
 from rect_graph_connector.gui.rendering.edge_renderer import EdgeRenderer
 from rect_graph_connector.gui.rendering.grid_renderer import GridRenderer
+from rect_graph_connector.gui.rendering.knife_renderer import KnifeRenderer
 from rect_graph_connector.gui.rendering.node_renderer import NodeRenderer
 from rect_graph_connector.gui.rendering.selection_renderer import SelectionRenderer
 from rect_graph_connector.models.graph import Graph
@@ -22,6 +29,7 @@ class MockPainter:
 
     def __init__(self):
         self.draw_calls = []
+        self.render_hints = {}
 
     def setPen(self, pen):
         self.draw_calls.append(("setPen", pen))
@@ -42,8 +50,11 @@ class MockPainter:
         else:  # x, y, width, height, brush
             self.draw_calls.append(("fillRect", (rect_or_x, y, width, height, brush)))
 
-    def drawLine(self, x1, y1, x2, y2):
-        self.draw_calls.append(("drawLine", (x1, y1, x2, y2)))
+    def drawLine(self, *args):
+        if len(args) == 1:  # A single QLine
+            line = args[0]
+            args = (line.x1(), line.y1(), line.x2(), line.y2())
+        self.draw_calls.append(("drawLine", args))
 
     def drawText(
         self, x, y, text=None, width=None, height=None, flags=None, text2=None
@@ -57,6 +68,25 @@ class MockPainter:
                 ("drawText", (x, y, width, height, flags, text2 or text))
             )
 
+    def drawRects(self, rects):
+        self.draw_calls.append(("drawRects", list(rects)))
+
+    def drawLines(self, lines):
+        self.draw_calls.append(
+            ("drawLines", [(l.x1(), l.y1(), l.x2(), l.y2()) for l in lines])
+        )
+
+    def drawPolyline(self, polygon):
+        self.draw_calls.append(
+            ("drawPolyline", [(point.x(), point.y()) for point in polygon])
+        )
+
+    def drawStaticText(self, point, static_text):
+        self.draw_calls.append(("drawStaticText", (point, static_text.text())))
+
+    def font(self):
+        return QFont()
+
     def drawEllipse(self, rect):
         self.draw_calls.append(("drawEllipse", rect))
 
@@ -79,8 +109,12 @@ class MockPainter:
         self.draw_calls.append(("scale", (sx, sy)))
 
     def setRenderHint(self, hint, enabled=True):
+        self.render_hints[hint] = enabled
         self.draw_calls.append(("setRenderHint", (hint, enabled)))
 
+    def testRenderHint(self, hint):
+        return self.render_hints.get(hint, False)
+
     def fontMetrics(self):
         class MockFontMetrics:
             def width(self, text):
@@ -94,6 +128,17 @@ class MockPainter:
         return MockFontMetrics()
 
 
+def drawn_lines(painter):
+    """Collect the lines drawn by drawLine and drawLines calls, in order."""
+    lines = []
+    for name, args in painter.draw_calls:
+        if name == "drawLine":
+            lines.append(args)
+        elif name == "drawLines":
+            lines.extend(args)
+    return lines
+
+
 # Use a simple dict instead of QWidget to avoid PyQt initialization issues
 class MockWidget:
     """Mock widget that doesn't require QApplication."""
@@ -118,8 +163,9 @@ class MockWidget:
 
 
 @pytest.fixture
-def mock_painter():
+def mock_painter(qapp):
     """Fixture that provides a mock painter for testing."""
+    # Text layout (fonts, static text) requires a QApplication
     return MockPainter()
 
 
@@ -189,6 +235,21 @@ def test_grid_renderer_draw(mock_widget, graph_with_nodes, mock_painter):
     # Check that drawLine was called (for grid lines)
     assert any(call[0] == "drawLine" for call in mock_painter.draw_calls)
 
+    # The pan translation is undone without saving the painter state
+    assert not any(call[0] == "save" for call in mock_painter.draw_calls)
+    translations = [
+        call[1] for call in mock_painter.draw_calls if call[0] == "translate"
+    ]
+    assert translations == [mock_widget.pan_offset, -mock_widget.pan_offset]
+
+    # Antialiasing is switched off for the lines and restored afterwards
+    mock_painter.draw_calls = []
+    mock_painter.setRenderHint(QPainter.Antialiasing, True)
+    renderer.draw(mock_painter)
+    hints = [call[1] for call in mock_painter.draw_calls if call[0] == "setRenderHint"]
+    assert hints[1:] == [(QPainter.Antialiasing, False), (QPainter.Antialiasing, True)]
+    assert mock_painter.testRenderHint(QPainter.Antialiasing)
+
     # Test with grid not visible
     mock_painter.draw_calls = []
     mock_widget.grid_visible = False
@@ -198,6 +259,25 @@ def test_grid_renderer_draw(mock_widget, graph_with_nodes, mock_painter):
     assert len(mock_painter.draw_calls) == 0
 
 
+def test_grid_renderer_limits_lines_to_paint_rect(mock_widget, mock_painter):
+    """Test that only grid lines crossing the repainted area are drawn."""
+    renderer = GridRenderer(mock_widget, Graph())
+
+    renderer.draw(mock_painter)
+    full_lines = [call for call in mock_painter.draw_calls if call[0] == "drawLine"]
+
+    mock_painter.draw_calls = []
+    mock_widget.paint_rect = QRectF(100, 100, 50, 50)
+    renderer.draw(mock_painter)
+    partial_lines = [call for call in mock_painter.draw_calls if call[0] == "drawLine"]
+
+    assert 0 < len(partial_lines) < len(full_lines)
+    # Lines span the area plus a small margin and lie at most one grid step away
+    for _, (x1, y1, x2, y2) in partial_lines:
+        assert 80 <= min(x1, x2) and max(x1, x2) <= 170
+        assert 80 <= min(y1, y2) and max(y1, y2) <= 170
+
+
 def test_node_renderer_draw(mock_widget, graph_with_nodes, mock_painter):
     """Test that the NodeRenderer draws nodes."""
     renderer = NodeRenderer(mock_widget, graph_with_nodes)
@@ -208,18 +288,15 @@ def test_node_renderer_draw(mock_widget, graph_with_nodes, mock_painter):
     # Check that drawing calls were made
     assert len(mock_painter.draw_calls) > 0
 
-    # Check that setPen and fillRect were called (for node outlines and fills)
+    # Check that setPen and setBrush were called (for node outlines and fills)
     assert any(call[0] == "setPen" for call in mock_painter.draw_calls)
-    assert any(call[0] == "fillRect" for call in mock_painter.draw_calls)
+    assert any(call[0] == "setBrush" for call in mock_painter.draw_calls)
 
-    # Check that drawRect was called (for nodes)
-    assert any(call[0] == "drawRect" for call in mock_painter.draw_calls)
-
-    # Count the number of drawRect calls (should be one per node)
-    draw_rect_calls = [
-        call for call in mock_painter.draw_calls if call[0] == "drawRect"
+    # Nodes sharing a state are drawn in one drawRects call
+    draw_rects_calls = [
+        call[1] for call in mock_painter.draw_calls if call[0] == "drawRects"
     ]
-    assert len(draw_rect_calls) == len(graph_with_nodes.nodes)
+    assert [len(rects) for rects in draw_rects_calls] == [len(graph_with_nodes.nodes)]
 
 
 def test_edge_renderer_draw(mock_widget, graph_with_nodes, mock_painter):
@@ -235,14 +312,48 @@ def test_edge_renderer_draw(mock_widget, graph_with_nodes, mock_painter):
     # Check that setPen was called (for edge lines)
     assert any(call[0] == "setPen" for call in mock_painter.draw_calls)
 
-    # Check that drawLine was called (for edges)
-    assert any(call[0] == "drawLine" for call in mock_painter.draw_calls)
+    # Check that drawLines was called (for edges)
+    assert any(call[0] == "drawLines" for call in mock_painter.draw_calls)
 
-    # Count the number of drawLine calls (should be one per edge)
-    draw_line_calls = [
-        call for call in mock_painter.draw_calls if call[0] == "drawLine"
-    ]
-    assert len(draw_line_calls) == len(graph_with_nodes.edges)
+    # Count the number of lines drawn (should be one per edge)
+    assert len(drawn_lines(mock_painter)) == len(graph_with_nodes.edges)
+
+
+def test_edge_renderer_draws_selected_edges_once(
+    mock_widget, graph_with_nodes, mock_painter
+):
+    """Test that selected edges are only drawn by the selected edge pass."""
+    renderer = EdgeRenderer(mock_widget, graph_with_nodes)
+    node1, node2, _ = graph_with_nodes.nodes
+
+    renderer.draw(mock_painter, selected_edges=[(node1, node2)])
+
+    assert len(drawn_lines(mock_painter)) == len(graph_with_nodes.edges)
+
+
+def test_edge_renderer_draws_group_and_cross_group_edges(mock_widget, mock_painter):
+    """Test that cross-group edges are drawn first, then group edges in z-order."""
+    graph = Graph()
+    front = graph.add_node_group(1, 2, base_x=0, base_y=0)
+    back = graph.add_node_group(1, 2, base_x=0, base_y=200)
+    graph.bring_group_to_front(front)
+    front_ids = front.node_ids
+    back_ids = back.node_ids
+    graph.edges.extend(
+        [
+            (front_ids[0], front_ids[1]),
+            (back_ids[0], back_ids[1]),
+            (front_ids[0], back_ids[0]),
+        ]
+    )
+    renderer = EdgeRenderer(mock_widget, graph)
+
+    renderer.draw(mock_painter)
+
+    lines = drawn_lines(mock_painter)
+    # The cross-group edge, then the back group's edge, then the front group's
+    assert [line[1] < 100 for line in lines] == [True, False, True]
+    assert lines[0][3] > 100
 
 
 def test_selection_renderer_draw(mock_widget, graph_with_nodes, mock_painter):
@@ -294,6 +405,48 @@ def test_composite_renderer_draw(mock_widget, graph_with_nodes, mock_painter):
     assert len(mock_painter.draw_calls) > 0
 
 
+def test_edge_renderer_batches_preview_edges(
+    mock_widget, graph_with_nodes, mock_painter
+):
+    """Test that preview edges start at node boundaries and are drawn in one call."""
+    renderer = EdgeRenderer(mock_widget, graph_with_nodes)
+    node1, node2, node3 = graph_with_nodes.nodes
+
+    renderer._draw_parallel_edges(
+        mock_painter,
+        {
+            "selected_nodes": [node1, node2, node3],
+            "edge_endpoints": [(100, 300), (200, 100), (300, 200)],
+        },
+    )
+    # The second endpoint is the node center, so it has no preview edge
+    assert [call for call in mock_painter.draw_calls if call[0] == "drawLines"] == [
+        ("drawLines", [(100, 120, 100, 300), (120, 200, 300, 200)])
+    ]
+
+    mock_painter.draw_calls = []
+    renderer._draw_all_for_one_edges(
+        mock_painter, (node1, QPointF(100, 400)), [node1, node2, node3]
+    )
+    assert drawn_lines(mock_painter) == [(193, 118, 100, 400), (100, 220, 100, 400)]
+
+
+def test_knife_renderer_draws_path_as_polyline(
+    mock_widget, graph_with_nodes, mock_painter
+):
+    """Test that the knife path is drawn in a single polyline call."""
+    renderer = KnifeRenderer(mock_widget, graph_with_nodes)
+
+    renderer.draw(mock_painter, knife_data={"path": [(10.7, 20.2)]})
+    assert mock_painter.draw_calls == []
+
+    renderer.draw(
+        mock_painter, knife_data={"path": [(10.7, 20.2), (30, 40), (50.5, 60)]}
+    )
+    polylines = [call for call in mock_painter.draw_calls if call[0] != "setPen"]
+    assert polylines == [("drawPolyline", [(10, 20), (30, 40), (50, 60)])]
+
+
 def test_edge_renderer_calculate_edge_endpoints(mock_widget, graph_with_nodes):
     """Test calculating edge endpoints considering node sizes."""
     renderer = EdgeRenderer(mock_widget, graph_with_nodes)
@@ -326,3 +479,351 @@ def test_edge_renderer_calculate_edge_endpoints(mock_widget, graph_with_nodes):
     # For horizontal alignment (node1 and node2 have the same y)
     assert abs(start_point.y() - node1.y) < 0.001
     assert abs(end_point.y() - node2.y) < 0.001
+
+
+def test_base_renderer_visible_world_rect(mock_widget, graph_with_nodes):
+    """Test mapping the visible widget area to world coordinates."""
+    renderer = ConcreteRenderer(mock_widget, graph_with_nodes)
+    mock_widget.zoom = 2.0
+    mock_widget.pan_offset = QPointF(100, 50)
+
+    rect = renderer.get_visible_world_rect()
+    assert rect.left() == pytest.approx(-50)
+    assert rect.top() == pytest.approx(-25)
+    assert rect.width() == pytest.approx(400)
+    assert rect.height() == pytest.approx(300)
+
+
+def test_edge_renderer_calculate_edge_line(mock_widget, graph_with_nodes):
+    """Test that integer edge lines truncate the edge endpoints."""
+    renderer = EdgeRenderer(mock_widget, graph_with_nodes)
+    node1, _, node3 = graph_with_nodes.nodes
+
+    start_point, end_point = renderer.calculate_edge_endpoints(node1, node3)
+    line = renderer.calculate_edge_line(node1, node3)
+
+    assert line == (
+        int(start_point.x()),
+        int(start_point.y()),
+        int(end_point.x()),
+        int(end_point.y()),
+    )
+    assert all(isinstance(value, int) for value in line)
+
+
+def test_edge_renderer_caches_edge_lines(mock_widget, graph_with_nodes, mocker):
+    """Test that edge lines are reused until a node changes."""
+    renderer = EdgeRenderer(mock_widget, graph_with_nodes)
+    calculate = mocker.spy(renderer, "calculate_edge_line")
+    node1, node2, _ = graph_with_nodes.nodes
+
+    line = renderer._get_edge_line(node1, node2)
+    assert renderer._get_edge_line(node1, node2) == line
+    assert calculate.call_count == 1
+
+    node2.move(0, 50)
+    assert renderer._get_edge_line(node1, node2) != line
+    assert calculate.call_count == 2
+
+
+def test_node_renderer_culls_offscreen_nodes(mock_widget, mock_painter):
+    """Test that off-screen standalone nodes are skipped on large graphs."""
+    graph = Graph()
+    graph.nodes.extend(
+        RectNode(x=100 + (i % 10) * 40, y=100 + (i // 10) * 40, size=30, id=str(i))
+        for i in range(600)
+    )
+    renderer = NodeRenderer(mock_widget, graph)
+
+    renderer.draw(mock_painter)
+
+    drawn = sum(
+        len(call[1]) for call in mock_painter.draw_calls if call[0] == "drawRects"
+    )
+    assert 0 < drawn < len(graph.nodes)
+
+
+def test_edge_renderer_culls_offscreen_edges(mock_widget, mock_painter):
+    """Test that edges outside the visible area are skipped on large graphs."""
+    graph = Graph()
+    graph.nodes.extend(
+        RectNode(x=100 + i * 40, y=100, size=30, id=str(i)) for i in range(600)
+    )
+    graph.create_node_group(list(graph.nodes))
+    graph.edges.extend((str(i), str(i + 1)) for i in range(599))
+    renderer = EdgeRenderer(mock_widget, graph)
+
+    renderer.draw(mock_painter)
+
+    assert 0 < len(drawn_lines(mock_painter)) < len(graph.edges)
+
+
+def test_parse_rgba_uses_color_cache():
+    """Test that parsed colors are cached but parse_rgba returns copies."""
+    shared = cached_color("rgba(10, 20, 30, 0.5)")
+    assert shared is cached_color("rgba(10, 20, 30, 0.5)")
+    assert (shared.red(), shared.green(), shared.blue(), shared.alpha()) == (
+        10,
+        20,
+        30,
+        127,
+    )
+
+    copy = parse_rgba("rgba(10, 20, 30, 0.5)")
+    assert copy == shared
+    copy.setAlpha(255)
+    assert shared.alpha() == 127
+
+
+def test_node_renderer_selected_node_style(mock_widget, graph_with_nodes, mock_painter):
+    """Test that selected nodes are filled with the selected color."""
+    renderer = NodeRenderer(mock_widget, graph_with_nodes)
+    selected = graph_with_nodes.nodes[0]
+    graph_with_nodes.selected_nodes.append(selected)
+
+    renderer.draw(mock_painter, test_mode=True)
+
+    fills = [call[1] for call in mock_painter.draw_calls if call[0] == "setBrush"]
+    selected_fill = cached_color(config.get_color("node.fill.selected", "#ADD8E6"))
+    normal_fill = cached_color(config.get_color("node.fill.normal", "skyblue"))
+    assert fills == [selected_fill, normal_fill, Qt.NoBrush]
+
+
+def test_node_renderer_node_state_precedence(
+    mock_widget, graph_with_nodes, mock_painter
+):
+    """Test that parallel selection takes precedence over other node states."""
+    renderer = NodeRenderer(mock_widget, graph_with_nodes)
+    node1, node2, _ = graph_with_nodes.nodes
+    graph_with_nodes.selected_nodes.extend([node1, node2])
+    mock_widget.parallel_selected_nodes = [node1]
+
+    renderer.draw(mock_painter, all_for_one_selected_nodes=[node1], test_mode=True)
+
+    fills = [call[1] for call in mock_painter.draw_calls if call[0] == "setBrush"]
+    parallel_fill = cached_color(
+        config.get_color("node.fill.parallel_selected", "#90EE90")
+    )
+    selected_fill = cached_color(config.get_color("node.fill.selected", "#ADD8E6"))
+    normal_fill = cached_color(config.get_color("node.fill.normal", "skyblue"))
+    assert fills == [parallel_fill, selected_fill, normal_fill, Qt.NoBrush]
+
+
+def test_node_renderer_rebuilds_styles_on_theme_change(
+    mock_widget, graph_with_nodes, mock_painter, monkeypatch
+):
+    """Test that cached styles are reused until the theme changes."""
+    renderer = NodeRenderer(mock_widget, graph_with_nodes)
+
+    renderer.draw(mock_painter, test_mode=True)
+    node_style = renderer._node_style
+    renderer.draw(mock_painter, test_mode=True)
+    assert renderer._node_style is node_style
+
+    monkeypatch.setattr(config, "_theme_mode", "dark")
+    renderer.draw(mock_painter, test_mode=True)
+    assert renderer._node_style is not node_style
+
+
+def test_edge_renderer_reuses_pens_until_theme_change(
+    mock_widget, graph_with_nodes, mock_painter, monkeypatch
+):
+    """Test that edge pens are built once and rebuilt after a theme change."""
+    renderer = EdgeRenderer(mock_widget, graph_with_nodes)
+
+    renderer.draw(mock_painter)
+    pens = renderer._pens
+    renderer.draw(mock_painter)
+    assert renderer._pens is pens
+    assert pens.virtual.style() == Qt.DashLine
+    assert pens.virtual.color() == pens.normal.color()
+
+    monkeypatch.setattr(config, "_theme_mode", "dark")
+    renderer.draw(mock_painter)
+    assert renderer._pens is not pens
+
+
+def test_border_renderer_caches_pens_per_mode(
+    mock_widget, graph_with_nodes, mock_painter, monkeypatch
+):
+    """Test that border pens are built once per mode until the theme changes."""
+    renderer = BorderRenderer(mock_widget, graph_with_nodes)
+
+    normal_pen = renderer._get_pen("normal")
+    assert renderer._get_pen("normal") is normal_pen
+    assert renderer._get_pen("edit") is not normal_pen
+    assert renderer._get_pen("edit").color() != normal_pen.color()
+
+    monkeypatch.setattr(config, "_theme_mode", "dark")
+    assert renderer._get_pen("normal") is not normal_pen
+
+
+def test_node_renderer_disables_antialiasing(
+    mock_widget, graph_with_nodes, mock_painter
+):
+    """Test that node drawing runs without antialiasing and restores it."""
+    renderer = NodeRenderer(mock_widget, graph_with_nodes)
+    mock_painter.setRenderHint(QPainter.Antialiasing, True)
+    mock_painter.draw_calls = []
+
+    renderer.draw(mock_painter)
+
+    hint_calls = [
+        call[1] for call in mock_painter.draw_calls if call[0] == "setRenderHint"
+    ]
+    assert hint_calls == [(QPainter.Antialiasing, False), (QPainter.Antialiasing, True)]
+
+
+def test_node_renderer_reuses_static_text(mock_widget, graph_with_nodes, mock_painter):
+    """Test that node labels are laid out once and reused across frames."""
+    renderer = NodeRenderer(mock_widget, graph_with_nodes)
+
+    renderer.draw(mock_painter, test_mode=True)
+    cached = dict(renderer._static_text)
+    renderer.draw(mock_painter, test_mode=True)
+
+    labels = [
+        call[1][1] for call in mock_painter.draw_calls if call[0] == "drawStaticText"
+    ]
+    assert labels == ["node1", "node2", "node3"] * 2
+    assert len(cached) == 3
+    assert all(renderer._static_text[key] is value for key, value in cached.items())
+    assert all(value[0].textFormat() == Qt.PlainText for value in cached.values())
+
+
+def test_node_renderer_caches_label_metrics(mock_widget, graph_with_nodes, mocker):
+    """Test that group label widths and elided texts are measured once."""
+    renderer = NodeRenderer(mock_widget, graph_with_nodes)
+    painter = mocker.Mock()
+    painter.font.return_value = QFont()
+    metrics = painter.fontMetrics.return_value
+    metrics.width.return_value = 500
+    metrics.elidedText.return_value = "Gro..."
+    group = graph_with_nodes.node_groups[0]
+    group.label_position = group.POSITION_RIGHT
+    renderer._refresh_style_cache()
+
+    for _ in range(2):
+        _, text = renderer._layout_group_label(painter, group, False, 0, 0, 10, 10)
+
+    assert text == "Gro..."
+    assert metrics.width.call_count == 1
+    assert metrics.elidedText.call_count == 1
+
+
+def test_node_renderer_batches_group_borders(mock_widget, mock_painter):
+    """Test that nodes and borders of non-overlapping groups are drawn in one call."""
+    graph = Graph()
+    graph.add_node_group(2, 2, base_x=0, base_y=0)
+    graph.add_node_group(2, 2, base_x=300, base_y=0)
+    renderer = NodeRenderer(mock_widget, graph)
+
+    renderer.draw(mock_painter, draw_only_nodes=True)
+
+    rects_calls = [
+        call[1] for call in mock_painter.draw_calls if call[0] == "drawRects"
+    ]
+    # One call for both groups' nodes, then one for both borders and label boxes
+    assert [len(rects) for rects in rects_calls] == [8, 2, 2]
+
+
+def test_node_renderer_replays_recorded_scene(
+    mock_widget, graph_with_nodes, mock_painter, mocker
+):
+    """Test that the scene is laid out again only after the graph changes."""
+    renderer = NodeRenderer(mock_widget, graph_with_nodes)
+    draw_scene = mocker.spy(renderer, "_draw_scene")
+
+    renderer.draw(mock_painter)
+    first_frame = list(mock_painter.draw_calls)
+    mock_painter.draw_calls = []
+    renderer.draw(mock_painter)
+
+    assert draw_scene.call_count == 1
+    assert mock_painter.draw_calls == first_frame
+
+    graph_with_nodes.nodes[2].move(10, 0)
+    renderer.draw(mock_painter)
+    assert draw_scene.call_count == 2
+
+    graph_with_nodes.selected_groups.append(graph_with_nodes.node_groups[0])
+    renderer.draw(mock_painter)
+    assert draw_scene.call_count == 3
+
+
+def test_node_renderer_skips_labels_when_zoomed_out(
+    mock_widget, graph_with_nodes, mock_painter
+):
+    """Test that labels are not drawn once they are unreadably small."""
+    renderer = NodeRenderer(mock_widget, graph_with_nodes)
+    mock_widget.zoom = 0.1
+
+    renderer.draw(mock_painter)
+
+    assert not any(call[0] == "drawStaticText" for call in mock_painter.draw_calls)
+    assert any(call[0] == "drawRects" for call in mock_painter.draw_calls)
+
+
+def test_node_renderer_group_layout(mock_widget, graph_with_nodes):
+    """Test that group members, bounds and standalone nodes come from one pass."""
+    renderer = NodeRenderer(mock_widget, graph_with_nodes)
+    node1, node2, node3 = graph_with_nodes.nodes
+
+    group_layout, standalone_nodes = renderer._get_group_layout()
+
+    margin = config.get_dimension("group.border_margin", 5)
+    [(group, group_nodes, bounds, rect)] = group_layout
+    assert group is graph_with_nodes.node_groups[0]
+    assert group_nodes == [node1, node2]
+    assert bounds == (80 - margin, 80 - margin, 220 + margin, 120 + margin)
+    assert rect == QRect(80 - margin, 80 - margin, 140 + 2 * margin, 40 + 2 * margin)
+    assert standalone_nodes == [node3]
+    assert renderer._get_group_layout() is renderer._get_group_layout()
+
+
+def test_node_renderer_bakes_backgrounds_into_picture(
+    qapp, mock_widget, graph_with_nodes
+):
+    """Test that the background layer is baked into a QPicture and an image layer."""
+    renderer = NodeRenderer(mock_widget, graph_with_nodes)
+    image = QImage(400, 300, QImage.Format_ARGB32)
+    image.fill(QColor("white"))
+    painter = QPainter(image)
+    renderer.draw(painter, draw_only_backgrounds=True)
+    painter.end()
+
+    _, picture = renderer._render_tree[(True, False)]
+    assert isinstance(picture, QPicture)
+    assert image.pixelColor(150, 100) != QColor("white")
+    assert image.pixelColor(350, 250) == QColor("white")
+
+    # Panning by a few pixels reuses the rasterized layer
+    layer = renderer._layers[(True, False)][1]
+    assert layer.format() == QImage.Format_ARGB32_Premultiplied
+    painter = QPainter(image)
+    painter.translate(3, 2)
+    renderer.draw(painter, draw_only_backgrounds=True)
+    painter.end()
+    assert renderer._layers[(True, False)][1] is layer
+
+
+def test_node_renderer_rebuilds_only_changed_layers(
+    qapp, mock_widget, graph_with_nodes
+):
+    """Test that selecting a node only rebuilds the node layer."""
+    renderer = NodeRenderer(mock_widget, graph_with_nodes)
+    image = QImage(400, 300, QImage.Format_ARGB32)
+
+    def draw_frame():
+        painter = QPainter(image)
+        renderer.draw(painter, draw_only_backgrounds=True)
+        renderer.draw(painter, draw_only_nodes=True)
+        painter.end()
+        return renderer._layers[(True, False)][1], renderer._layers[(False, True)][1]
+
+    backgrounds, nodes = draw_frame()
+    graph_with_nodes.selected_nodes.append(graph_with_nodes.nodes[0])
+    new_backgrounds, new_nodes = draw_frame()
+
+    assert new_backgrounds is backgrounds
+    assert new_nodes is not nodes
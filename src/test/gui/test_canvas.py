@@ -20,6 +20,7 @@ def test_canvas_initialization(canvas):
     assert canvas.zoom == 1.0
     assert canvas.grid_visible is False
     assert canvas.snap_to_grid is False
+    assert canvas.hasMouseTracking() is False
 
 
 def test_set_mode(canvas):
@@ -83,6 +84,17 @@ def test_find_node_at_position(canvas):
     assert found_node is None
 
 
+def test_find_edge_at_position(canvas):
+    """Test finding an edge near a point, skipping edges to missing nodes."""
+    node1 = RectNode(x=100, y=100, size=40, id="node1")
+    node2 = RectNode(x=300, y=100, size=40, id="node2")
+    canvas.graph.nodes.extend([node1, node2])
+    canvas.graph.edges.extend([("node1", "missing"), ("node1", "node2")])
+
+    assert canvas.find_edge_at_position(QPointF(200, 102)) == (node1, node2)
+    assert canvas.find_edge_at_position(QPointF(200, 150)) is None
+
+
 def test_snap_to_grid(canvas):
     """Test snapping coordinates to the grid."""
     # Test snapping a point to the grid
@@ -105,8 +117,13 @@ def test_snap_to_grid(canvas):
     # Snap all nodes
     canvas._snap_all_nodes_to_grid()
 
-    # Check that the node position has changed
-    assert node.x != 42 or node.y != 37
+    # Check that the node moved to the same grid point as the single point
+    assert (node.x, node.y) == (snapped_x, snapped_y)
+
+    # Snapping again leaves nodes already on the grid untouched
+    version = RectNode.version
+    canvas._snap_all_nodes_to_grid()
+    assert RectNode.version == version
 
 
 def test_key_press_escape(canvas):
@@ -168,3 +185,130 @@ def test_mouse_press_on_node(canvas, qtbot):
     # Check that the node's group is selected
     assert group in canvas.graph.selected_groups
     assert node in canvas.graph.selected_nodes
+
+
+def test_edit_target_node_ids(canvas):
+    """Test that only nodes of the edit target groups are reported."""
+    group1 = canvas.graph.add_node_group(1, 2, base_x=0, base_y=0)
+    group2 = canvas.graph.add_node_group(1, 2, base_x=0, base_y=200)
+    canvas.edit_target_groups = [group2]
+
+    assert canvas._get_edit_target_node_ids() == set(group2.node_ids)
+
+    canvas.edit_target_groups = [group1, group2]
+    assert canvas._get_edit_target_node_ids() == set(group1.node_ids + group2.node_ids)
+
+
+def test_complete_parallel_connection(canvas):
+    """Test that parallel edges are only created from edit target nodes."""
+    group1 = canvas.graph.add_node_group(2, 1, base_x=0, base_y=0)
+    group2 = canvas.graph.add_node_group(2, 1, base_x=400, base_y=0)
+    sources = group1.get_nodes(canvas.graph.nodes)
+    targets = group2.get_nodes(canvas.graph.nodes)
+    outsider = canvas.graph.add_node_group(1, 1, base_x=0, base_y=400)
+    outsider_node = outsider.get_nodes(canvas.graph.nodes)[0]
+
+    canvas.edit_target_groups = [group1]
+    canvas.parallel_selected_nodes = sources + [outsider_node]
+    canvas.current_edge_start = sources[0]
+    offset = QPointF(targets[0].x - sources[0].x, targets[0].y - sources[0].y)
+    canvas._complete_parallel_connection(QPointF(sources[0].x, sources[0].y) + offset)
+
+    assert sorted(canvas.graph.edges) == sorted(
+        (source.id, target.id) for source, target in zip(sources, targets)
+    )
+    assert canvas.current_edge_start is None
+
+
+def test_delete_selected_edges(canvas):
+    """Test that the Delete key removes exactly the selected edges in edit mode."""
+    group = canvas.graph.add_node_group(1, 3, base_x=0, base_y=0)
+    node1, node2, node3 = group.get_nodes(canvas.graph.nodes)
+    canvas.graph.add_edge(node1, node2)
+    canvas.graph.add_edge(node2, node3)
+    canvas.graph.add_edge(node1, node3)
+
+    canvas.set_mode(canvas.EDIT_MODE)
+    canvas.selected_edges = [(node1, node2), (node1, node3)]
+    QTest.keyClick(canvas, Qt.Key_Delete)
+
+    assert canvas.graph.edges == [(node2.id, node3.id)]
+    assert canvas.selected_edges == []
+
+
+def test_knife_cut_coalesces_highlight_updates(canvas):
+    """Test that knife moves defer the intersection test until the timer or release."""
+    from PyQt5.QtGui import QMouseEvent
+
+    group = canvas.graph.add_node_group(1, 2, base_x=0, base_y=0, spacing=200)
+    node1, node2 = group.get_nodes(canvas.graph.nodes)
+    canvas.graph.add_edge(node1, node2)
+    canvas.toggle_edit_mode(group)
+    canvas.set_edit_submode(canvas.EDIT_SUBMODE_KNIFE)
+
+    def send(event_type, x, y, buttons):
+        widget_point = QPointF(x, y) * canvas.zoom + canvas.pan_offset
+        event = QMouseEvent(
+            event_type, widget_point, Qt.LeftButton, buttons, Qt.NoModifier
+        )
+        {
+            QMouseEvent.MouseButtonPress: canvas.mousePressEvent,
+            QMouseEvent.MouseMove: canvas.mouseMoveEvent,
+            QMouseEvent.MouseButtonRelease: canvas.mouseReleaseEvent,
+        }[event_type](event)
+
+    send(QMouseEvent.MouseButtonPress, 100, -50, Qt.LeftButton)
+    send(QMouseEvent.MouseMove, 100, 0, Qt.LeftButton)
+    send(QMouseEvent.MouseMove, 100, 50, Qt.LeftButton)
+    # The intersection test is pending until the timer fires
+    assert canvas.highlighted_edges == []
+
+    send(QMouseEvent.MouseButtonRelease, 100, 50, Qt.NoButton)
+    assert canvas.graph.edges == []
+    assert canvas.knife_path == []
+
+
+def test_rect_selects_matches_qrectf():
+    """Test that the float rectangle selection test agrees with QRectF."""
+    import random
+
+    from PyQt5.QtCore import QRectF
+
+    rng = random.Random(0)
+    for _ in range(500):
+        x, y, w, h, ix, iy, iw, ih = (rng.randint(0, 10) for _ in range(8))
+        w, h, iw, ih = w + 1, h + 1, iw + 1, ih + 1
+        rect = QRectF(x, y, w, h)
+        item = QRectF(ix, iy, iw, ih)
+        bounds = (x, y, x + w, y + h, ix, iy, ix + iw, iy + ih)
+        assert Canvas._rect_selects(*bounds, True) == rect.contains(item)
+        assert Canvas._rect_selects(*bounds, False) == rect.intersects(item)
+
+
+def test_edge_click_selects_only_target_group_edges(canvas):
+    """Test that clicking an edge in edit mode selects it only for target groups."""
+    from PyQt5.QtGui import QMouseEvent
+
+    group1 = canvas.graph.add_node_group(1, 2, base_x=0, base_y=0, spacing=200)
+    group2 = canvas.graph.add_node_group(1, 2, base_x=0, base_y=300, spacing=200)
+    for group in (group1, group2):
+        canvas.graph.add_edge(*group.get_nodes(canvas.graph.nodes))
+    canvas.toggle_edit_mode(group1)
+
+    def click(x, y):
+        widget_point = QPointF(x, y) * canvas.zoom + canvas.pan_offset
+        canvas.mousePressEvent(
+            QMouseEvent(
+                QMouseEvent.MouseButtonPress,
+                widget_point,
+                Qt.LeftButton,
+                Qt.LeftButton,
+                Qt.NoModifier,
+            )
+        )
+
+    click(100, 300)
+    assert canvas.selected_edges == []
+
+    click(100, 0)
+    assert canvas.selected_edges == [tuple(group1.get_nodes(canvas.graph.nodes))]
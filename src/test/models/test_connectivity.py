@@ -6,8 +6,15 @@ import pytest
 from PyQt5.QtCore import QPointF
 
 from rect_graph_connector.models.connectivity import (
+    build_edge_index,
+    connect_all_for_one_edge_selection,
+    connect_nodes_in_4_directions,
+    connect_nodes_in_8_directions,
     delete_edge_at_position,
     find_intersecting_edges,
+    get_edge_segments,
+    point_to_line_distance,
+    point_to_line_distance_sq,
 )
 from rect_graph_connector.models.graph import Graph
 from rect_graph_connector.models.rect_node import RectNode
@@ -148,6 +155,41 @@ def test_find_intersecting_edges_with_complex_path(graph_with_edges):
         assert edge[0] == "node1" or edge[1] == "node1"
 
 
+def test_find_intersecting_edges_with_edge_segments(graph_with_edges):
+    """Test that precomputed edge segments give the same result and are reusable."""
+    edge_segments = get_edge_segments(graph_with_edges)
+    assert len(edge_segments) == len(graph_with_edges.edges)
+
+    for path in ([(50, 200), (350, 200)], [(200, 50), (200, 350)]):
+        assert find_intersecting_edges(
+            graph_with_edges, path, edge_segments=edge_segments
+        ) == find_intersecting_edges(graph_with_edges, path)
+
+    # Only the segments passed in are tested
+    assert (
+        find_intersecting_edges(
+            graph_with_edges, [(50, 200), (350, 200)], edge_segments=[]
+        )
+        == []
+    )
+
+
+def test_get_edge_segments_with_target_groups(graph_with_edges):
+    """Test that target groups keep edges with at least one endpoint in them."""
+    node1, node2, node3, _ = graph_with_edges.nodes
+    top_group_id = graph_with_edges.create_node_group([node1, node2])
+    graph_with_edges.create_node_group([node3])
+    top_group = graph_with_edges.group_map[top_group_id]
+
+    edges = [edge for edge, _ in get_edge_segments(graph_with_edges, [top_group])]
+    assert edges == [
+        ("node1", "node2"),
+        ("node1", "node3"),
+        ("node2", "node4"),
+        ("node1", "node4"),
+    ]
+
+
 def test_find_intersecting_edges_with_empty_path(graph_with_edges):
     """Test finding edges with an empty path."""
     # Empty path
@@ -196,3 +238,139 @@ def test_delete_edge_at_position_with_tolerance(graph_with_edges):
     # Edge should be deleted with larger tolerance
     assert deleted
     assert len(graph_with_edges.edges) == initial_edge_count - 2
+
+
+def test_connect_all_for_one_edge_selection(graph_with_edges):
+    """Test connecting several sources to one target without self-loops or duplicates."""
+    node1, node2, node3, node4 = graph_with_edges.nodes
+    initial_edge_count = len(graph_with_edges.edges)
+
+    # Every source is already connected to node4, which is also the target itself
+    connect_all_for_one_edge_selection(
+        graph_with_edges, [node1, node2, node3, node4], node4
+    )
+    assert len(graph_with_edges.edges) == initial_edge_count
+
+    node5 = RectNode(x=500, y=100, size=40, id="node5")
+    graph_with_edges.nodes.append(node5)
+    connect_all_for_one_edge_selection(graph_with_edges, [node1, node2], node5)
+    assert len(graph_with_edges.edges) == initial_edge_count + 2
+    assert graph_with_edges.edges[-2:] == [("node1", "node5"), ("node2", "node5")]
+
+
+@pytest.mark.parametrize(
+    "connect, expected_edge_count",
+    [(connect_nodes_in_4_directions, 4), (connect_nodes_in_8_directions, 6)],
+)
+def test_connect_nodes_in_directions(connect, expected_edge_count):
+    """Test grid connections stay inside a group and are not duplicated."""
+    graph = Graph()
+    graph.add_node_group(2, 2, 0, 0)
+    graph.add_node_group(1, 1, 200, 0)
+    group, other = graph.node_groups
+    # Place the single node of the other group next to the first grid
+    other.get_nodes(graph.nodes)[0].col = 2
+
+    connect(graph, graph.nodes)
+    assert len(graph.edges) == expected_edge_count
+    other_id = other.node_ids[0]
+    assert all(other_id not in edge for edge in graph.edges)
+
+    # Connecting again does not add duplicates
+    connect(graph, graph.nodes)
+    assert len(graph.edges) == expected_edge_count
+
+
+def test_edges_with_missing_nodes_are_skipped(graph_with_edges):
+    """Test that edges referencing unknown node IDs are ignored."""
+    graph_with_edges.edges.append(("node1", "missing"))
+
+    assert ("node1", "missing") not in [
+        edge for edge, _ in get_edge_segments(graph_with_edges)
+    ]
+    assert delete_edge_at_position(graph_with_edges, (200, 100))
+    assert ("node1", "missing") in graph_with_edges.edges
+
+
+def test_connect_nodes_in_directions_with_overlapping_grid_positions():
+    """Test that groups sharing row and column indices are each fully connected."""
+    graph = Graph()
+    graph.add_node_group(2, 3, 0, 0)
+    graph.add_node_group(2, 2, 0, 200)
+
+    connect_nodes_in_8_directions(graph, graph.nodes)
+    # 2x3 grid: 3 + 4 straight and 4 diagonal, 2x2 grid: 4 straight and 2 diagonal
+    assert len(graph.edges) == 11 + 6
+    for source_id, target_id in graph.edges:
+        assert graph.get_group_for_node(
+            next(n for n in graph.nodes if n.id == source_id)
+        ) is graph.get_group_for_node(next(n for n in graph.nodes if n.id == target_id))
+
+
+def test_delete_edge_at_position_matches_full_search():
+    """Test that the bounding box prefilter deletes the same edge as a full search."""
+    import random
+
+    rng = random.Random(0)
+    for _ in range(50):
+        graph = Graph()
+        graph.nodes.extend(
+            RectNode(x=rng.uniform(0, 500), y=rng.uniform(0, 500), size=20, id=i)
+            for i in range(8)
+        )
+        for _ in range(10):
+            graph.add_edge(*rng.sample(graph.nodes, 2))
+        px, py = rng.uniform(0, 500), rng.uniform(0, 500)
+
+        distances = [
+            (point_to_line_distance(px, py, *segment), edge)
+            for edge, segment in get_edge_segments(graph)
+        ]
+        min_distance, closest_edge = min(distances, key=lambda item: item[0])
+        expected_edges = list(graph.edges)
+        if min_distance <= 30:
+            expected_edges.remove(closest_edge)
+
+        assert delete_edge_at_position(graph, (px, py), threshold=30) == (
+            min_distance <= 30
+        )
+        assert graph.edges == expected_edges
+
+
+def test_find_intersecting_edges_with_edge_index_matches_full_search():
+    """Test that the edge index finds the same edges, in the same order, as a full search."""
+    import random
+
+    rng = random.Random(0)
+    for _ in range(50):
+        graph = Graph()
+        graph.nodes.extend(
+            RectNode(x=rng.uniform(0, 500), y=rng.uniform(0, 500), size=20, id=i)
+            for i in range(8)
+        )
+        for _ in range(10):
+            graph.add_edge(*rng.sample(graph.nodes, 2))
+        path = [(rng.uniform(0, 500), rng.uniform(0, 500)) for _ in range(5)]
+
+        edge_segments = get_edge_segments(graph)
+        assert find_intersecting_edges(
+            graph,
+            path,
+            edge_segments=edge_segments,
+            edge_index=build_edge_index(edge_segments),
+        ) == find_intersecting_edges(graph, path, edge_segments=edge_segments)
+
+
+@pytest.mark.parametrize(
+    "point, segment, expected",
+    [
+        ((5, 3), (0, 0, 10, 0), 9),  # Projects onto the segment
+        ((-3, 4), (0, 0, 10, 0), 25),  # Clamped to the start point
+        ((13, -4), (0, 0, 10, 0), 25),  # Clamped to the end point
+        ((3, 4), (0, 0, 0, 0), 25),  # Degenerate segment
+    ],
+)
+def test_point_to_line_distance_sq(point, segment, expected):
+    """Test the squared point to segment distance and its square root."""
+    assert point_to_line_distance_sq(*point, *segment) == pytest.approx(expected)
+    assert point_to_line_distance(*point, *segment) == pytest.approx(expected**0.5)
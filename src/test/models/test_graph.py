@@ -53,6 +53,113 @@ def test_add_edge():
     assert len(graph.edges) == 1  # Still just one edge
 
 
+def test_add_edges():
+    """Test adding several edges at once with the same rules as add_edge."""
+    graph = Graph()
+    nodes = [RectNode(x=100 * i, y=100, size=40, id=f"node{i}") for i in range(4)]
+    graph.nodes.extend(nodes)
+    graph.add_edge(nodes[0], nodes[1])
+
+    graph.add_edges(
+        [
+            (nodes[1], nodes[0]),  # Reverse of an existing edge
+            (nodes[2], nodes[2]),  # Self-connection
+            (nodes[1], nodes[2]),
+            (nodes[2], nodes[1]),  # Reverse of an edge added in this batch
+            (nodes[2], nodes[3]),
+        ]
+    )
+    assert graph.edges == [
+        ("node0", "node1"),
+        ("node1", "node2"),
+        ("node2", "node3"),
+    ]
+
+
+def test_has_edge_follows_edge_list_changes():
+    """Test that the cached edge set follows in-place and reassigned edge lists."""
+    graph = Graph()
+    nodes = [RectNode(x=100 * i, y=100, size=40, id=i) for i in range(4)]
+    graph.nodes.extend(nodes)
+    graph.add_edge(nodes[0], nodes[1])
+    graph.add_edge(nodes[1], nodes[2])
+
+    assert graph.has_edge(nodes[1], nodes[0])
+    assert not graph.has_edge(nodes[0], nodes[2])
+
+    # Remove one edge and append another directly, keeping the same length
+    graph.edges.remove((0, 1))
+    graph.edges.append((2, 3))
+    assert not graph.has_edge(nodes[0], nodes[1])
+    assert graph.has_edge(nodes[3], nodes[2])
+
+    # Edges loaded from files may be lists
+    graph.edges = [[0, 3]]
+    assert graph.has_edge(nodes[3], nodes[0])
+    assert not graph.has_edge(nodes[1], nodes[2])
+
+    graph.add_edge(nodes[0], nodes[3])
+    assert graph.edges == [[0, 3]]
+
+
+def test_has_edge_follows_reset_and_id_reassignment():
+    """Test that the edge set is rebuilt after reset and node ID reassignment."""
+    graph = Graph()
+    nodes = [RectNode(x=100 * i, y=100, size=40, id=i) for i in range(4)]
+    graph.nodes.extend(nodes)
+    graph.add_edge(nodes[0], nodes[1])
+    graph.add_edge(nodes[1], nodes[2])
+    assert not graph.has_edge(nodes[0], nodes[3])
+
+    # reset() clears the same list, which is then refilled to the same length
+    # and last entry
+    graph.reset()
+    graph.nodes.extend(nodes)
+    graph.edges.extend([(0, 3), (1, 2)])
+    assert graph.has_edge(nodes[0], nodes[3])
+    assert not graph.has_edge(nodes[0], nodes[1])
+
+    # Reassigning IDs rebinds the edge list to new lists of the same length
+    graph.create_node_group(nodes)
+    for start_index in (3, 9, 4):
+        graph.set_node_id_start(start_index)
+    assert graph.edge_set == {(4, 7), (5, 6)}
+    assert graph.has_edge(nodes[3], nodes[0])
+
+
+def test_edge_segments_follow_graph_changes():
+    """Test that cached edge segments follow edge and node changes."""
+    graph = Graph()
+    node1 = RectNode(x=0, y=0, size=20, id="node1")
+    node2 = RectNode(x=100, y=0, size=20, id="node2")
+    graph.nodes.extend([node1, node2])
+    assert graph.edge_segments == []
+
+    graph.add_edge(node1, node2)
+    assert graph.edge_segments == [(("node1", "node2"), (10, 0, 90, 0))]
+
+    node2.move(-100, 100)
+    assert graph.edge_segments == [(("node1", "node2"), (0, 10, 0, 90))]
+
+    # Edges to missing nodes are skipped
+    graph.nodes.remove(node2)
+    assert graph.edge_segments == []
+
+
+def test_remove_edges():
+    """Test removing several edges at once, including edges stored as lists."""
+    graph = Graph()
+    graph.edges = [(0, 1), [1, 2], (2, 3), (3, 0)]
+
+    graph.remove_edges([(1, 2), (3, 0), (5, 6)])
+    assert graph.edges == [(0, 1), (2, 3)]
+
+    # Removing nothing keeps the edge list as it is
+    edges = graph.edges
+    graph.remove_edges([])
+    assert graph.edges is edges
+
+
 def test_create_node_group():
     """Test creating a node group."""
     graph = Graph()
@@ -72,6 +179,26 @@ def test_create_node_group():
     assert set(group.node_ids) == {node1.id, node2.id}
 
 
+def test_group_get_nodes_follows_changes():
+    """Test that memoized group node lookups follow node and membership changes."""
+    graph = Graph()
+    nodes = [RectNode(x=100 * i, y=100, size=40, id=f"node{i}") for i in range(3)]
+    graph.nodes.extend(nodes)
+    group = graph.group_map[graph.create_node_group(nodes[:2])]
+
+    first = group.get_nodes(graph.nodes)
+    assert first == nodes[:2]
+    # Callers get their own list, so modifying it does not affect later calls
+    first.clear()
+    assert group.get_nodes(graph.nodes) == nodes[:2]
+
+    group.node_ids = [nodes[2].id]
+    assert group.get_nodes(graph.nodes) == [nodes[2]]
+
+    nodes[2].id = "renamed"
+    assert group.get_nodes(graph.nodes) == []
+
+
 def test_delete_group():
     """Test deleting a node group."""
     graph = Graph()
@@ -121,6 +248,62 @@ def test_find_node_at_position():
     assert found_node is None
 
 
+def test_find_node_at_position_follows_moves_and_z_order():
+    """Test that hit testing tracks node moves and prefers the frontmost group."""
+    graph = Graph()
+    node1 = RectNode(x=100, y=100, size=40, id="node1")
+    node2 = RectNode(x=110, y=100, size=40, id="node2")
+    node3 = RectNode(x=500, y=500, size=40, id="node3")
+    graph.nodes.extend([node1, node2, node3])
+    group1 = graph.group_map[graph.create_node_group([node1])]
+    graph.create_node_group([node2])
+
+    # The overlapping node from the later (frontmost) group wins
+    assert graph.find_node_at_position(QPointF(105, 100)) is node2
+    graph.bring_group_to_front(group1)
+    assert graph.find_node_at_position(QPointF(105, 100)) is node1
+
+    # Moving a node is picked up without any explicit invalidation
+    node3.move(-300, -300)
+    assert graph.find_node_at_position(QPointF(500, 500)) is None
+    assert graph.find_node_at_position(QPointF(200, 200)) is node3
+
+
+def test_find_nodes_in_area():
+    """Test that area queries return overlapping nodes in graph order."""
+    graph = Graph()
+    node1 = RectNode(x=300, y=100, size=40, id="node1")
+    node2 = RectNode(x=100, y=100, size=40, id="node2")
+    node3 = RectNode(x=100, y=300, size=40, id="node3")
+    graph.nodes.extend([node1, node2, node3])
+
+    assert graph.find_nodes_in_area(0, 0, 400, 150) == [node1, node2]
+    # Touching an edge counts as overlapping
+    assert graph.find_nodes_in_area(120, 120, 200, 200) == [node2]
+    assert graph.find_nodes_in_area(150, 150, 250, 250) == []
+
+    node3.move(200, -200)
+    assert graph.find_nodes_in_area(250, 50, 350, 150) == [node1, node3]
+
+
+def test_nodes_by_id_follows_node_changes():
+    """Test that the cached node map is rebuilt when nodes or their IDs change."""
+    graph = Graph()
+    node1 = RectNode(x=100, y=100, size=40, id="node1")
+    node2 = RectNode(x=200, y=100, size=40, id="node2")
+    graph.nodes.extend([node1, node2])
+    assert graph.nodes_by_id == {"node1": node1, "node2": node2}
+
+    node2.id = "renamed"
+    assert graph.nodes_by_id == {"node1": node1, "renamed": node2}
+
+    graph.nodes.remove(node1)
+    assert graph.nodes_by_id == {"renamed": node2}
+
+    graph.nodes = [node1]
+    assert graph.nodes_by_id == {"node1": node1}
+
+
 def test_get_group_for_node():
     """Test getting the group that a node belongs to."""
     graph = Graph()
@@ -148,6 +331,45 @@ def test_get_group_for_node():
     assert found_group is None
 
 
+def test_get_group_for_node_follows_membership_changes():
+    """Test that cached group lookups follow group and membership changes."""
+    graph = Graph()
+    node1 = RectNode(x=100, y=100, size=40, id="node1")
+    node2 = RectNode(x=200, y=100, size=40, id="node2")
+    graph.nodes.extend([node1, node2])
+
+    group_id = graph.create_node_group([node1])
+    group = next(g for g in graph.node_groups if g.id == group_id)
+    assert graph.get_group_for_node(node2) is None
+
+    group.node_ids.append("node2")
+    assert graph.get_group_for_node(node2) is group
+
+    group.node_ids = ["node2"]
+    assert graph.get_group_for_node(node1) is None
+
+    graph.delete_group(group)
+    assert graph.get_group_for_node(node2) is None
+
+
+def test_get_group_for_node_follows_node_id_reassignment():
+    """Test that group lookups follow node IDs reassigned by set_node_id_start."""
+    graph = Graph()
+    first = graph.add_node_group(2, 2, 0, 0)
+    second = graph.add_node_group(1, 2, 300, 0)
+    assert graph.groups_by_node_id
+
+    # Reassigning IDs can leave group node ID lists at reused addresses with
+    # unchanged lengths, so the map must not be keyed on those alone
+    for start_index in (3, 9, 4):
+        graph.set_node_id_start(start_index)
+
+    assert set(graph.groups_by_node_id) == {node.id for node in graph.nodes}
+    for group in (first, second):
+        for node in group.get_nodes(graph.nodes):
+            assert graph.get_group_for_node(node) is group
+
+
 def test_bring_group_to_front():
     """Test bringing a group to the front (updating z-index)."""
     graph = Graph()
@@ -176,6 +398,27 @@ def test_bring_group_to_front():
     assert group1.z_index > group2.z_index
 
 
+def test_groups_by_z():
+    """Test that the cached z-ordering follows z-index and membership changes."""
+    graph = Graph()
+    nodes = [RectNode(x=100 * i, y=100, size=40, id=f"node{i}") for i in range(3)]
+    graph.nodes.extend(nodes)
+    group1 = graph.group_map[graph.create_node_group([nodes[0]])]
+    group2 = graph.group_map[graph.create_node_group([nodes[1]])]
+
+    assert graph.groups_by_z == [group1, group2]
+    assert graph.groups_by_z is graph.groups_by_z
+
+    graph.bring_group_to_front(group1)
+    assert graph.groups_by_z == [group2, group1]
+
+    group3 = graph.group_map[graph.create_node_group([nodes[2]])]
+    assert graph.groups_by_z == [group2, group1, group3]
+
+    graph.delete_group(group1)
+    assert graph.groups_by_z == [group2, group3]
+
+
 def test_rotate_node_groups():
     """Test rotating node groups."""
     graph = Graph()
@@ -250,3 +493,77 @@ def test_import_graph():
     assert group.id == "group1"
     assert set(group.node_ids) == {"node1", "node2"}
     assert group.name == "Test Group"
+
+
+def test_selected_group_ids():
+    """Test that selected group IDs follow in-place and reassigned selections."""
+    graph = Graph()
+    nodes = [RectNode(x=100 * i, y=100, size=40, id=f"node{i}") for i in range(2)]
+    graph.nodes.extend(nodes)
+    group1 = graph.group_map[graph.create_node_group([nodes[0]])]
+    group2 = graph.group_map[graph.create_node_group([nodes[1]])]
+
+    assert graph.selected_group_ids == frozenset()
+
+    graph.selected_groups.append(group1)
+    assert graph.selected_group_ids == {group1.id}
+
+    graph.selected_groups = [group2]
+    assert graph.selected_group_ids == {group2.id}
+
+    # A group created after deleting the selected one may reuse its address
+    for i in range(20):
+        graph.delete_group(graph.selected_groups[0])
+        node = RectNode(x=300, y=100, size=40, id=f"node_new{i}")
+        graph.nodes.append(node)
+        group_id = graph.create_node_group([node])
+        graph.selected_groups = [graph.group_map[group_id]]
+        assert graph.selected_group_ids == {group_id}
+
+
+def test_group_bounds():
+    """Test that cached group bounds follow node moves and membership changes."""
+    graph = Graph()
+    nodes = [RectNode(x=100 * i, y=100, size=40, id=f"node{i}") for i in range(3)]
+    graph.nodes.extend(nodes)
+    group = graph.group_map[graph.create_node_group(nodes[:2])]
+
+    assert graph.group_bounds == {group.id: (-20, 80, 120, 120)}
+    assert graph.group_bounds is graph.group_bounds
+
+    nodes[1].move(0, 50)
+    assert graph.group_bounds[group.id] == (-20, 80, 120, 170)
+
+    other = graph.group_map[graph.create_node_group([nodes[2]])]
+    assert graph.group_bounds[other.id] == (180, 80, 220, 120)
+
+
+def test_import_graph_insert_after_keeps_group_order():
+    """Test that inserted groups keep their file order after the existing ones."""
+    graph = Graph()
+    data = {
+        "nodes": [{"id": 0, "x": 0, "y": 0, "size": 40}],
+        "edges": [],
+        "groups": [{"id": "group1", "node_ids": [0], "name": "Group"}],
+    }
+    graph.import_graph(data, "force")
+
+    graph.import_graph(
+        {
+            "nodes": [
+                {"id": 0, "x": 100, "y": 0, "size": 40},
+                {"id": 1, "x": 200, "y": 0, "size": 40},
+            ],
+            "edges": [],
+            "groups": [
+                {"id": "g2", "node_ids": [0], "name": "Other"},
+                {"id": "g3", "node_ids": [1], "name": "Group"},
+            ],
+        },
+        "insert_after",
+    )
+
+    names = [g.name for g in graph.node_groups]
+    assert names[:2] == ["Group", "Other"]
+    assert len(names) == 3 and names[2].startswith("Group")
+    assert len(graph.node_groups[2].get_nodes(graph.nodes)) == 1
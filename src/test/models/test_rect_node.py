@@ -5,6 +5,7 @@ Tests for the RectNode model class.
 import uuid
 
 import pytest
+from PyQt5.QtCore import QRect, QRectF
 
 from rect_graph_connector.models.rect_node import RectNode
 
@@ -45,6 +46,11 @@ def test_rect_node_move():
     assert node.x == 120
     assert node.y == 110
 
+    # A move counts as a single change for cache invalidation
+    version = RectNode.version
+    node.move(1, 1)
+    assert RectNode.version == version + 1
+
 
 def test_rect_node_contains_point():
     """Test checking if a RectNode contains a point."""
@@ -91,6 +97,11 @@ def test_rect_node_hash():
     # Since node1 and node2 have the same ID, they should be considered the same in a set
     assert len(node_set) == 1
 
+    # The cached hash follows ID changes
+    node2.id = "node2"
+    assert hash(node2) == hash("node2")
+    assert hash(RectNode(x=0, y=0)) != hash(None)
+
 
 def test_rect_node_str_representation():
     """Test the string representation of a RectNode."""
@@ -159,3 +170,37 @@ def test_rect_node_copy():
     copy.x = 200
     assert node.x == 100
     assert copy.x == 200
+
+
+def test_rect_node_get_rect_cache():
+    """Test that the cached node rectangle follows moves and resizes."""
+    node = RectNode(x=100, y=100, size=25)
+    rect = node.get_rect()
+    assert isinstance(rect, QRectF)
+    assert node.get_rect() is rect
+    assert (rect.x(), rect.y(), rect.width()) == (87.5, 87.5, 25.0)
+
+    node.size = 40
+    rect = node.get_rect()
+    assert isinstance(rect, QRect)
+    assert (rect.x(), rect.y(), rect.width(), rect.height()) == (80, 80, 40, 40)
+
+    node.move(5, 0)
+    assert node.get_rect().x() == 85
+
+
+def test_rect_node_uses_slots():
+    """Test that nodes store their attributes in slots instead of a __dict__."""
+    node = RectNode(x=100, y=200, size=40, id="test_node")
+    assert not hasattr(node, "__dict__")
+    with pytest.raises(AttributeError):
+        node.unknown_attribute = 1
+
+
+def test_rect_node_default_size_from_config(monkeypatch):
+    """Test that nodes without a size use the configured default size."""
+    from rect_graph_connector.config import config
+
+    monkeypatch.setattr(config, "get_dimension", lambda key, default=None: 55.0)
+    assert RectNode(x=0, y=0).size == 55.0
+    assert RectNode(x=0, y=0, size=20).size == 20
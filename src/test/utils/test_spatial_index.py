@@ -0,0 +1,30 @@
+"""
+Tests for the quadtree spatial index.
+"""
+
+from rect_graph_connector.utils.spatial_index import SpatialIndex
+
+
+def test_spatial_index_query():
+    """Test that queries return exactly the overlapping items."""
+    index = SpatialIndex((0, 0, 1000, 1000), max_items=4)
+    for i in range(100):
+        x = (i % 10) * 100
+        y = (i // 10) * 100
+        index.insert(i, (x, y, x + 10, y + 10))
+
+    assert len(index) == 100
+    assert sorted(index.query((0, 0, 150, 150))) == [0, 1, 10, 11]
+    assert index.query((2000, 2000, 3000, 3000)) == []
+
+
+def test_spatial_index_keeps_items_outside_bounds():
+    """Test that items outside the root bounds are still found."""
+    index = SpatialIndex((0, 0, 100, 100))
+    index.insert("a", (10, 10, 20, 20))
+    index.insert("b", (500, 500, 510, 510))
+
+    assert index.query((0, 0, 50, 50)) == ["a"]
+    assert index.query((495, 495, 505, 505)) == ["b"]
+    # Touching counts as overlapping
+    assert sorted(index.query((20, 20, 500, 500))) == ["a", "b"]